@@ -0,0 +1,93 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Runs the benchmarks outside Sublime Text, against the headless stand-in
+# for the Sublime Text API, from the root of the repository:
+#
+#   $ python -m bench
+#   $ python -m bench motions --sizes 10000 --cursors 1,100 --output bench_output.txt
+#
+# The timings are written as JSON to stdout, or the --output file, and a
+# summary of each case is printed to stderr as it completes.
+
+import argparse
+import importlib
+import re
+import sys
+
+from bench import headless
+from bench import runner
+
+
+SUITES = ('motions', 'text_objects', 'search', 'ex', 'macros')
+
+
+def _ints(value):
+    return [int(x) for x in value.split(',') if x]
+
+
+def _strings(value):
+    return [x for x in value.split(',') if x]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description='Run the NeoVintageous benchmarks.')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help='suites to run: %s (default: all)' % ', '.join(SUITES))
+    parser.add_argument('--kinds', type=_strings, default=['code', 'prose', 'json'],
+                        help='comma separated buffer kinds (default: code,prose,json)')
+    parser.add_argument('--sizes', type=_ints, default=[10000, 100000, 1000000],
+                        help='comma separated buffer sizes in lines (default: 10000,100000,1000000)')
+    parser.add_argument('--cursors', type=_ints, default=[1, 100, 1000],
+                        help='comma separated numbers of cursors (default: 1,100,1000)')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='count used with a single cursor (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='iterations per case (default: 5)')
+    parser.add_argument('--filter', default=None,
+                        help='only run cases whose name matches the regular expression')
+    parser.add_argument('--output', default=None,
+                        help='file to write the JSON results to (default: stdout)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='do not print a summary of each case')
+    args = parser.parse_args(argv)
+
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error('unknown suite: %s' % suite)
+
+    headless.install()
+    headless.load_plugin()
+
+    results = []
+    for suite in (args.suites or SUITES):
+        module = importlib.import_module('bench.bench_' + suite)
+        cases = module.cases(args.kinds, args.sizes, args.cursors, args.count)
+        if args.filter:
+            cases = (c for c in cases if re.search(args.filter, c.name))
+
+        results.extend(runner.run_cases(cases, args.repeat, progress=None if args.quiet else sys.stderr))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            runner.write_results(results, f)
+    else:
+        runner.write_results(results, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
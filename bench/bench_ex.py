@@ -0,0 +1,126 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks for scanning and parsing ex command lines, comparing the route
+# table with the sequential route matching it replaced, and the cached parser
+# with the uncached one.
+
+import re
+
+from NeoVintageous.nv.ex import scanner
+from NeoVintageous.nv.ex.parser import parse_command_line
+from NeoVintageous.nv.ex_routes import ex_routes
+
+from bench.runner import case
+
+
+# Command lines like the ones typed, and found in mappings.
+COMMAND_LINES = (
+    'w',
+    'write',
+    'wq',
+    'q!',
+    'qall',
+    'e ~/.vimrc',
+    'vsplit',
+    'tabnext',
+    'bnext',
+    'ls',
+    'noh',
+    'nohlsearch',
+    'set hlsearch',
+    'setlocal nowrap',
+    'nnoremap <leader>w :w<CR>',
+    'vnoremap < <gv',
+    'registers',
+    'help neovintageous',
+    's/foo/bar/g',
+    '%s/\\s\\+$//e',
+    "'<,'>substitute/a/b/gi",
+    '1,$delete',
+    '.,+3yank a',
+    '10',
+    'global/^$/delete',
+    'v/x/d',
+    '5,10move 0',
+    '3copy $',
+    'sort',
+    'unmap <C-p>',
+    'pwd',
+    'cd ..',
+    'only',
+    'close',
+    'xit',
+)
+
+
+def _scan_command_sequentially(state):
+    # The route matching replaced by the route table: each route is tried in
+    # turn, compiling its pattern every time.
+    for route, command in ex_routes.items():
+        m = re.compile(route).match(state.source, state.position)
+        if m:
+            state.position += m.end() - m.start()
+            state.ignore()
+
+            return command(state)
+
+    state.expect_eof(lambda: Exception("E492: Not an editor command"))
+
+    return None, []
+
+
+def _scan(lines):
+    for line in lines:
+        try:
+            list(scanner.Scanner(line).scan())
+        except Exception:
+            pass
+
+
+def _scan_sequentially(lines):
+    scan_command, compile_ = scanner._scan_command, scanner._compile
+    scanner._scan_command, scanner._compile = _scan_command_sequentially, re.compile
+    try:
+        _scan(lines)
+    finally:
+        scanner._scan_command, scanner._compile = scan_command, compile_
+
+
+def _parse(parse, lines):
+    for line in lines:
+        try:
+            parse(line)
+        except Exception:
+            pass
+
+
+# The scanners and parsers benchmarked.
+ENGINES = (
+    ('scan', 'table', _scan),
+    ('scan', 'sequential', _scan_sequentially),
+    ('parse', 'cached', lambda lines: _parse(parse_command_line, lines)),
+    ('parse', 'uncached', lambda lines: _parse(parse_command_line.__wrapped__, lines)),
+)
+
+
+def cases(kinds, sizes, cursor_counts, count):
+    # Command lines don't depend on buffers or selections, so the count is the
+    # number of command lines scanned or parsed.
+    lines = [COMMAND_LINES[i % len(COMMAND_LINES)] for i in range(count)]
+    for name, engine, run in ENGINES:
+        yield case('ex/' + name, lambda run=run: run(lines), count=count, engine=engine)
@@ -0,0 +1,108 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks for running macros, comparing the batched replay of the compacted
+# steps of a macro with the step by step replay of the steps as they were
+# recorded before they were compacted.
+
+from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vim import INSERT
+from NeoVintageous.nv.vim import INTERNAL_NORMAL
+from NeoVintageous.nv.vim import NORMAL
+
+from bench import buffers
+from bench import headless
+from bench.runner import case
+
+
+# The steps recorded for "0xIabc<Esc>wwwj", a step per command evaluated, and
+# an insert per character typed.
+MACRO = (
+    ('_vi_zero', {'mode': NORMAL, 'count': 1}),
+    ('_vi_x', {'mode': INTERNAL_NORMAL, 'count': 1, 'register': '"'}),
+    ('_vi_big_i', {'mode': INTERNAL_NORMAL, 'count': 1}),
+    ('insert', {'characters': 'a'}),
+    ('insert', {'characters': 'b'}),
+    ('insert', {'characters': 'c'}),
+    ('_enter_normal_mode', {'mode': INSERT, 'from_init': False}),
+    ('_vi_w', {'mode': NORMAL, 'count': 1}),
+    ('_vi_w', {'mode': NORMAL, 'count': 1}),
+    ('_vi_w', {'mode': NORMAL, 'count': 1}),
+    ('_vi_j', {'mode': NORMAL, 'count': 1, 'xpos': 0}),
+)
+
+
+def _record(view, steps):
+    state = State(view)
+    state.start_recording()
+    try:
+        for cmd, args in steps:
+            state.add_macro_step(cmd, dict(args))
+    finally:
+        state.stop_recording()
+
+    return list(State.macro_steps)
+
+
+def _run_batched(view, steps, count):
+    State.macro_steps = steps
+    view.run_command('_vi_at', {'name': '@', 'count': count})
+
+
+def _run_per_step(view, steps, count):
+    # The replay replaced by the batched replay: each step is run on its own,
+    # with a new state for each step with an xpos.
+    state = State(view)
+    for i in range(count):
+        for cmd, args in steps:
+            args = dict(args)
+            if 'xpos' in args:
+                state.update_xpos(force=True)
+                args['xpos'] = State(view).xpos
+
+            view.run_command(cmd, args)
+
+
+def _case(name, run, steps, kind, count):
+    # The macro edits the buffer, so every run is on a new view.
+    text = buffers.generate(kind, count)
+    views = []
+
+    def setup():
+        if views:
+            views.pop().close()
+
+        views.append(headless.new_view(text))
+
+    return case('macro/' + name, lambda: run(views[-1], steps, count), setup,
+                buffer=kind, lines=count, count=count, steps=len(steps))
+
+
+def cases(kinds, sizes, cursor_counts, count):
+    # A macro is run on a single cursor, count times, over a buffer of as many
+    # lines as the count.
+    view = headless.new_view('')
+    compacted = _record(view, MACRO)
+    recorded = list(MACRO)
+    view.close()
+    for kind in kinds:
+        if kind == 'json':
+            # Minified JSON is a single line.
+            continue
+
+        yield _case('batched', _run_batched, compacted, kind, count)
+        yield _case('per-step', _run_per_step, recorded, kind, count)
@@ -0,0 +1,74 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks for the motions.
+
+from NeoVintageous.nv.vim import NORMAL
+
+from bench import buffers
+from bench.runner import case
+
+
+# The motions benchmarked: (command, args).
+MOTIONS = (
+    ('_vi_w', {}),
+    ('_vi_big_w', {}),
+    ('_vi_b', {}),
+    ('_vi_big_b', {}),
+    ('_vi_e', {}),
+    ('_vi_big_e', {}),
+    ('_vi_ge', {}),
+    ('_vi_j', {'xpos': 4}),
+    ('_vi_k', {'xpos': 4}),
+    ('_vi_dollar', {}),
+    ('_vi_find_in_line', {'char': 'a', 'inclusive': True}),
+    ('_vi_left_brace', {}),
+    ('_vi_right_brace', {}),
+    ('_vi_left_paren', {}),
+    ('_vi_right_paren', {}),
+    ('_vi_percent', {}),
+    ('_vi_star', {}),
+    ('_vi_octothorp', {}),
+)
+
+# Motions that don't take a count.
+_NO_COUNT = ('_vi_percent',)
+
+
+def _case(command, args, kind, lines, n, count):
+    view = buffers.view(kind, lines)
+    regions = buffers.cursors(view, n)
+    args = dict(args, mode=NORMAL)
+    if command not in _NO_COUNT:
+        args['count'] = count
+
+    def setup():
+        buffers.select(view, regions)
+
+    def run():
+        view.run_command(command, args)
+
+    return case('motion/' + command, run, setup, buffer=kind, lines=lines, cursors=n, count=count)
+
+
+def cases(kinds, sizes, cursor_counts, count):
+    for kind, lines, n, c in buffers.matrix(kinds, sizes, cursor_counts, count):
+        for command, args in MOTIONS:
+            if command in _NO_COUNT and c != 1:
+                continue
+
+            yield _case(command, args, kind, lines, n, c)
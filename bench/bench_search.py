@@ -0,0 +1,73 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks for the reverse search, comparing the chunked reverse search
+# engine with the line-based search it replaced.
+
+from sublime import LITERAL
+from sublime import Region
+
+from NeoVintageous.nv.vi.search import _reverse_search_by_pt_by_lines
+from NeoVintageous.nv.vi.search import reverse_search_by_pt
+
+from bench import buffers
+from bench.runner import case
+
+
+# The reverse search implementations benchmarked.
+ENGINES = (
+    ('chunked', reverse_search_by_pt),
+    ('lines', _reverse_search_by_pt_by_lines),
+)
+
+
+def _terms(view):
+    # The terms searched for: (name, term, flags). The near term is taken from
+    # three quarters of the way down the buffer and the far term from the top
+    # of it, so they are found after scanning a little and a lot of it.
+    def literal_at(pt):
+        line = view.line(pt)
+        return view.substr(Region(line.a, min(line.b, line.a + 12))).strip() or 'x'
+
+    return (
+        ('near', literal_at(view.size() * 3 // 4), LITERAL),
+        ('far', literal_at(0), LITERAL),
+        ('absent', 'qzxqzxq', LITERAL),
+        ('regex', '\\w+[.;,]$', 0),
+    )
+
+
+def _case(engine, search, term_name, term, flags, kind, lines, count):
+    view = buffers.view(kind, lines)
+
+    def run():
+        end = view.size()
+        for i in range(count):
+            match = search(view, term, 0, end, flags)
+            end = match.a if match else view.size()
+
+    return case('search/reverse/' + term_name, run, buffer=kind, lines=lines, count=count, engine=engine)
+
+
+def cases(kinds, sizes, cursor_counts, count):
+    # Reverse searches don't depend on the selection, so the matrix is only
+    # run with a single cursor.
+    for kind, lines, n, c in buffers.matrix(kinds, sizes, [1], count):
+        view = buffers.view(kind, lines)
+        for term_name, term, flags in _terms(view):
+            for engine, search in ENGINES:
+                yield _case(engine, search, term_name, term, flags, kind, lines, c)
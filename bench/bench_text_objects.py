@@ -0,0 +1,50 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks for the text objects.
+
+from NeoVintageous.nv.vim import VISUAL
+
+from bench import buffers
+from bench.runner import case
+
+
+# The text objects benchmarked, each as an inner and an "a" object.
+TEXT_OBJECTS = ('w', 'W', 's', 'p', 'i', '(', '[', '{', '<', '"', "'", 't')
+
+
+def _case(text_object, inclusive, kind, lines, n, count):
+    view = buffers.view(kind, lines)
+    regions = buffers.cursors(view, n, size=1)
+    args = {'mode': VISUAL, 'text_object': text_object, 'inclusive': inclusive, 'count': count}
+
+    def setup():
+        buffers.select(view, regions)
+
+    def run():
+        view.run_command('_vi_select_text_object', args)
+
+    name = 'text_object/' + ('a' if inclusive else 'i') + text_object
+
+    return case(name, run, setup, buffer=kind, lines=lines, cursors=n, count=count)
+
+
+def cases(kinds, sizes, cursor_counts, count):
+    for kind, lines, n, c in buffers.matrix(kinds, sizes, cursor_counts, count):
+        for text_object in TEXT_OBJECTS:
+            for inclusive in (False, True):
+                yield _case(text_object, inclusive, kind, lines, n, c)
@@ -0,0 +1,184 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Synthetic buffers for the benchmarks.
+#
+# The buffers are generated deterministically, so timings are comparable
+# between runs, and cached, because generating the largest ones takes a
+# while.
+#
+# code
+#   C-like source: functions with nested brackets, quoted strings,
+#   comments, and blank lines between the functions.
+#
+# prose
+#   Paragraphs of sentences separated by blank lines.
+#
+# json
+#   Minified JSON, all on one line, about as long as the code buffer with
+#   the same number of lines would be.
+
+import json
+import random
+
+
+KINDS = ('code', 'prose', 'json')
+
+_WORDS = (
+    'alpha', 'beta', 'gamma', 'delta', 'buffer', 'cursor', 'motion', 'window', 'view', 'region',
+    'count', 'index', 'value', 'result', 'item', 'list', 'node', 'tree', 'key', 'mode',
+    'a', 'an', 'the', 'of', 'to', 'in', 'is', 'it', 'and', 'or',
+)
+
+_cache = {}
+
+
+def _code(lines, rnd):
+    out = []
+    while len(out) < lines:
+        name = rnd.choice(_WORDS) + '_' + rnd.choice(_WORDS)
+        args = ', '.join(rnd.choice(_WORDS) for _ in range(rnd.randint(0, 3)))
+        function = ['int %s(%s) {' % (name, args)]
+        for _ in range(rnd.randint(2, 10)):
+            indent = '    ' * rnd.randint(1, 3)
+            choice = rnd.randint(0, 4)
+            if choice == 0:
+                function.append('%sif ((%s[%d] > %s) && !%s(%s)) {' % (
+                    indent, rnd.choice(_WORDS), rnd.randint(0, 99), rnd.choice(_WORDS),
+                    rnd.choice(_WORDS), rnd.choice(_WORDS)))
+                function.append('%s    return "%s %s";' % (indent, rnd.choice(_WORDS), rnd.choice(_WORDS)))
+                function.append('%s}' % indent)
+            elif choice == 1:
+                function.append('%s// %s %s %s.' % (
+                    indent, rnd.choice(_WORDS), rnd.choice(_WORDS), rnd.choice(_WORDS)))
+            else:
+                function.append('%s%s = %s(%s, {%d, %d}) + %s;' % (
+                    indent, rnd.choice(_WORDS), rnd.choice(_WORDS), rnd.choice(_WORDS),
+                    rnd.randint(0, 9), rnd.randint(0, 9), rnd.choice(_WORDS)))
+        function.append('}')
+        function.append('')
+
+        # Brackets are kept balanced by padding the end of the buffer with
+        # comments rather than truncating a function.
+        if len(out) + len(function) > lines:
+            function = ['// %s' % rnd.choice(_WORDS) for _ in range(lines - len(out))]
+
+        out.extend(function)
+
+    return '\n'.join(out) + '\n'
+
+
+def _prose(lines, rnd):
+    out = []
+    while len(out) < lines:
+        for _ in range(rnd.randint(2, 8)):
+            sentences = []
+            for _ in range(rnd.randint(1, 3)):
+                words = [rnd.choice(_WORDS) for _ in range(rnd.randint(4, 12))]
+                sentences.append(words[0].capitalize() + ' ' + ' '.join(words[1:]) + rnd.choice('..?!'))
+            out.append(' '.join(sentences))
+        out.append('')
+
+    return '\n'.join(out[:lines]) + '\n'
+
+
+def _json(lines, rnd):
+    size = len(_code(min(lines, 1000), random.Random(lines))) * max(lines // 1000, 1)
+    records = []
+    length = 0
+    while length < size:
+        record = {
+            'id': len(records),
+            'name': rnd.choice(_WORDS),
+            'tags': [rnd.choice(_WORDS) for _ in range(rnd.randint(0, 4))],
+            'meta': {'count': rnd.randint(0, 1000), 'nested': {'value': rnd.choice(_WORDS)}},
+        }
+        records.append(record)
+        length += len(json.dumps(record, separators=(',', ':'))) + 1
+
+    return json.dumps(records, separators=(',', ':')) + '\n'
+
+
+def generate(kind, lines):
+    # type: (str, int) -> str
+    try:
+        return _cache[(kind, lines)]
+    except KeyError:
+        pass
+
+    generator = {'code': _code, 'prose': _prose, 'json': _json}[kind]
+    text = _cache[(kind, lines)] = generator(lines, random.Random(lines))
+
+    return text
+
+
+_views = {}
+
+
+def view(kind, lines):
+    # type: (str, int) -> ...
+    # Returns a headless view of the buffer, in normal mode. Views are
+    # cached, benchmarks that modify the buffer should use a new view.
+    try:
+        return _views[(kind, lines)]
+    except KeyError:
+        pass
+
+    from bench import headless
+
+    v = _views[(kind, lines)] = headless.new_view(generate(kind, lines))
+
+    return v
+
+
+def cursors(view, n, size=0):
+    # type: (...) -> list
+    # Returns n regions of the given size spread evenly over the lines of the
+    # view, a single cursor is in the middle of the buffer. On buffers with
+    # fewer lines than cursors, the cursors are spread over the characters.
+    import sublime
+
+    rows = view.rowcol(view.size())[0] + 1
+    if rows >= n:
+        points = [view.text_point(int((i + 0.5) * rows / n), 0) for i in range(n)]
+        points = [view.line(pt).a + min(4, view.line(pt).size()) for pt in points]
+    else:
+        points = [int((i + 0.5) * view.size() / n) for i in range(n)]
+
+    return [sublime.Region(pt, min(pt + size, view.size())) for pt in points]
+
+
+def select(view, regions):
+    # type: (...) -> None
+    sel = view.sel()
+    sel.clear()
+    sel.add_all(regions)
+
+
+def matrix(kinds, sizes, cursor_counts, count):
+    # type: (...) -> list
+    # Each buffer is benchmarked with a single cursor and a large count, and
+    # with each number of cursors and a count of one.
+    combinations = []
+    for lines in sizes:
+        for kind in kinds:
+            combinations.append((kind, lines, 1, count))
+            for n in cursor_counts:
+                if (n, 1) != (1, count):
+                    combinations.append((kind, lines, n, 1))
+
+    return combinations
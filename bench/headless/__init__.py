@@ -0,0 +1,152 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless stand-in for the Sublime Text plugin API.
+#
+# Usage:
+#
+#   from bench import headless
+#
+#   headless.install()
+#   headless.load_plugin()
+#   view = headless.new_view('fizz buzz\n')
+#   view.run_command('_vi_w', {'mode': 'mode_normal', 'count': 1})
+#
+# install() must be called before any NeoVintageous module is imported. It
+# registers the "sublime" and "sublime_plugin" stand-in modules and makes
+# the repository importable as the "NeoVintageous" package, which is how
+# Sublime Text loads it.
+
+import os
+import sys
+import types
+
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _JumpHistory():
+
+    def __init__(self):
+        self.history = []
+
+    def push_selection(self, view):
+        self.history.append([r.to_tuple() for r in view.sel()])
+
+    def jump_back(self, active_view):
+        return (active_view, [])
+
+    def jump_forward(self, active_view):
+        return (active_view, [])
+
+    def remove_view(self, view_id):
+        pass
+
+
+_jump_histories = {}
+
+
+def _get_jump_history(window_id):
+    return _jump_histories.setdefault(window_id, _JumpHistory())
+
+
+def _get_jump_history_for_view(view):
+    return _get_jump_history(view.window().id())
+
+
+def install():
+    # type: () -> None
+    if getattr(sys.modules.get('sublime'), '_HEADLESS', False):
+        return
+
+    from bench.headless import sublime
+    sublime._HEADLESS = True
+    sys.modules['sublime'] = sublime
+
+    from bench.headless import sublime_plugin
+    sys.modules['sublime_plugin'] = sublime_plugin
+
+    default = types.ModuleType('Default')
+    default.__path__ = []
+    history_list = types.ModuleType('Default.history_list')
+    history_list.get_jump_history = _get_jump_history
+    history_list.get_jump_history_for_view = _get_jump_history_for_view
+    default.history_list = history_list
+    sys.modules['Default'] = default
+    sys.modules['Default.history_list'] = history_list
+
+    if 'NeoVintageous' not in sys.modules:
+        package = types.ModuleType('NeoVintageous')
+        package.__path__ = [_ROOT]
+        sys.modules['NeoVintageous'] = package
+
+    # Resources, e.g. "Packages/NeoVintageous/res/...", resolve to the
+    # repository.
+    link = os.path.join(sublime.packages_path(), 'NeoVintageous')
+    if not os.path.exists(link):
+        os.symlink(_ROOT, link)
+
+
+def load_plugin():
+    # type: () -> None
+    # Loads the plugin the way Sublime Text does.
+    install()
+
+    import sublime
+    from NeoVintageous import plugin
+
+    plugin.plugin_loaded()
+    sublime._run_timeouts()
+
+
+def new_view(text='', sel=None, window=None):
+    # Returns a new view, with the text and cursors given, in the active
+    # window. The cursors default to the start of the buffer.
+    import sublime
+
+    if window is None:
+        window = sublime.active_window()
+
+    view = window.new_file()
+    view._buffer.modify(0, 0, text)
+    view.sel().clear()
+    for region in (sel or [0]):
+        if isinstance(region, int):
+            region = sublime.Region(region)
+        elif isinstance(region, tuple):
+            region = sublime.Region(*region)
+        view.sel().add(region)
+
+    sublime._run_timeouts()
+
+    return view
+
+
+def run_timeouts():
+    # type: () -> None
+    import sublime
+
+    sublime._run_timeouts()
+
+
+def unknown_commands():
+    # type: () -> list
+    # Returns the names of the commands that were run but are not emulated
+    # nor defined by any loaded plugin.
+    import sublime_plugin
+
+    return list(sublime_plugin._state['unknown_commands'])
@@ -0,0 +1,1541 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless, pure-Python stand-in for the Sublime Text "sublime" API module.
+#
+# It implements enough of the API, with the same semantics, for the motion,
+# text object, search and ex command layers to run outside of Sublime Text
+# e.g. to be benchmarked in CI. Buffers are line-indexed so that row/column
+# conversions and line lookups are O(log n) on multi-megabyte inputs.
+#
+# See bench/headless/__init__.py for how to install it.
+
+from bisect import bisect_right
+import copy
+import json
+import os
+import re
+import sys
+import tempfile
+
+
+LITERAL = 1
+IGNORECASE = 2
+
+ENCODED_POSITION = 1
+TRANSIENT = 4
+FORCE_GROUP = 8
+SEMI_TRANSIENT = 16
+ADD_TO_SELECTION = 32
+
+MONOSPACE_FONT = 1
+KEEP_OPEN_ON_FOCUS_LOST = 2
+
+HTML = 1
+COOPERATE_WITH_AUTO_COMPLETE = 2
+HIDE_ON_MOUSE_MOVE = 4
+HIDE_ON_MOUSE_MOVE_AWAY = 8
+
+DRAW_EMPTY = 1
+HIDE_ON_MINIMAP = 2
+DRAW_EMPTY_AS_OVERWRITE = 4
+PERSISTENT = 16
+DRAW_OUTLINED = 32
+DRAW_NO_FILL = 32
+HIDDEN = 128
+DRAW_NO_OUTLINE = 256
+DRAW_SOLID_UNDERLINE = 512
+DRAW_STIPPLED_UNDERLINE = 1024
+DRAW_SQUIGGLY_UNDERLINE = 2048
+
+OP_EQUAL = 0
+OP_NOT_EQUAL = 1
+OP_REGEX_MATCH = 2
+OP_NOT_REGEX_MATCH = 3
+OP_REGEX_CONTAINS = 4
+OP_NOT_REGEX_CONTAINS = 5
+
+CLASS_WORD_START = 1
+CLASS_WORD_END = 2
+CLASS_PUNCTUATION_START = 4
+CLASS_PUNCTUATION_END = 8
+CLASS_SUB_WORD_START = 16
+CLASS_SUB_WORD_END = 32
+CLASS_LINE_START = 64
+CLASS_LINE_END = 128
+CLASS_EMPTY_LINE = 256
+
+INHIBIT_WORD_COMPLETIONS = 8
+INHIBIT_EXPLICIT_COMPLETIONS = 16
+
+DIALOG_CANCEL = 0
+DIALOG_YES = 1
+DIALOG_NO = 2
+
+LAYOUT_INLINE = 0
+LAYOUT_BELOW = 1
+LAYOUT_BLOCK = 2
+
+_DEFAULT_WORD_SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+
+# Nominal metrics used by the layout functions.
+_LINE_HEIGHT = 20.0
+_EM_WIDTH = 8.0
+_VIEWPORT_ROWS = 50
+_VIEWPORT_COLUMNS = 120
+
+
+_state = {
+    'clipboard': '',
+    'next_id': 1,
+    'windows': [],
+    'active_window': None,
+    'settings': {},
+    'timeouts': [],
+    'command_depth': 0,
+    'packages_path': None,
+}
+
+
+def _next_id():
+    # type: () -> int
+    _id = _state['next_id']
+    _state['next_id'] += 1
+
+    return _id
+
+
+class Region():
+
+    __slots__ = ['a', 'b', 'xpos']
+
+    def __init__(self, a, b=None, xpos=-1):
+        if b is None:
+            b = a
+
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __str__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __repr__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __lt__(self, rhs):
+        lhs_begin = self.begin()
+        rhs_begin = rhs.begin()
+
+        if lhs_begin == rhs_begin:
+            return self.end() < rhs.end()
+
+        return lhs_begin < rhs_begin
+
+    # Regions are mutable and compare by value, so like Sublime Text's they
+    # are not hashable.
+    __hash__ = None
+
+    def empty(self):
+        return self.a == self.b
+
+    def begin(self):
+        return self.a if self.a < self.b else self.b
+
+    def end(self):
+        return self.b if self.a < self.b else self.a
+
+    def size(self):
+        return abs(self.a - self.b)
+
+    def contains(self, x):
+        if isinstance(x, Region):
+            return self.contains(x.a) and self.contains(x.b)
+
+        return x >= self.begin() and x <= self.end()
+
+    def cover(self, rhs):
+        a = min(self.begin(), rhs.begin())
+        b = max(self.end(), rhs.end())
+
+        if self.a < self.b:
+            return Region(a, b)
+
+        return Region(b, a)
+
+    def intersection(self, rhs):
+        if self.end() <= rhs.begin():
+            return Region(0)
+
+        if self.begin() >= rhs.end():
+            return Region(0)
+
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def intersects(self, rhs):
+        lb = self.begin()
+        le = self.end()
+        rb = rhs.begin()
+        re_ = rhs.end()
+
+        if lb == rb and le == re_:
+            return True
+
+        return lb < rb < le or lb < re_ < le or rb < lb < re_ or rb < le < re_
+
+    def to_tuple(self):
+        return (self.a, self.b)
+
+
+class Selection():
+
+    # Selections are kept sorted and overlapping regions are merged, as they
+    # are in Sublime Text.
+
+    def __init__(self, view):
+        self._view = view
+        self._regions = []
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __getitem__(self, index):
+        r = self._regions[index]
+
+        return Region(r.a, r.b, r.xpos)
+
+    def __iter__(self):
+        return iter([Region(r.a, r.b, r.xpos) for r in self._regions])
+
+    def __eq__(self, rhs):
+        return rhs is not None and list(self) == list(rhs)
+
+    def __str__(self):
+        return '[' + ', '.join(str(r) for r in self._regions) + ']'
+
+    __repr__ = __str__
+
+    def is_valid(self):
+        return self._view.is_valid()
+
+    def clear(self):
+        self._regions = []
+
+    def add(self, x):
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        size = self._view.size()
+        x = Region(min(max(x.a, 0), size), min(max(x.b, 0), size), x.xpos)
+        self._regions.append(x)
+        self._normalise()
+
+    def add_all(self, regions):
+        for region in regions:
+            self.add(region)
+
+    def subtract(self, region):
+        remaining = []
+        for r in self._regions:
+            if r == region or (not r.empty() and region.contains(r)):
+                continue
+
+            if r.intersects(region) and not r.empty():
+                if r.begin() < region.begin():
+                    remaining.append(Region(r.begin(), region.begin()))
+                if r.end() > region.end():
+                    remaining.append(Region(region.end(), r.end()))
+            else:
+                remaining.append(r)
+
+        self._regions = remaining
+
+    def contains(self, region):
+        return any(r.contains(region) for r in self._regions)
+
+    def _normalise(self):
+        regions = sorted(self._regions)
+        merged = []
+        for r in regions:
+            if merged:
+                prev = merged[-1]
+                if prev == r or (prev.empty() and r.empty() and prev.a == r.a):
+                    continue
+
+                overlaps = r.begin() < prev.end()
+                touches_cursor = (r.empty() or prev.empty()) and prev.contains(r.begin())
+                if overlaps or touches_cursor:
+                    merged[-1] = r.cover(prev) if r.size() > prev.size() else prev.cover(r)
+                    continue
+
+            merged.append(r)
+
+        self._regions = merged
+
+    def _adjust(self, adjust):
+        self._regions = [Region(adjust(r.a), adjust(r.b), r.xpos) for r in self._regions]
+        self._normalise()
+
+
+class Settings():
+
+    # Values are stored JSON encoded, so like Sublime Text's settings, the
+    # values returned are copies and tuples come back as lists.
+
+    def __init__(self, parent=None):
+        self._data = {}
+        self._parent = parent
+        self._on_change = {}
+
+    def get(self, key, default=None):
+        try:
+            return json.loads(self._data[key])
+        except KeyError:
+            pass
+
+        if self._parent is not None:
+            return self._parent.get(key, default)
+
+        return default
+
+    def has(self, key):
+        return key in self._data
+
+    def set(self, key, value):
+        self._data[key] = json.dumps(value)
+        for callback in list(self._on_change.values()):
+            callback()
+
+    def erase(self, key):
+        self._data.pop(key, None)
+
+    def add_on_change(self, tag, callback):
+        self._on_change[tag] = callback
+
+    def clear_on_change(self, tag):
+        self._on_change.pop(tag, None)
+
+
+class Edit():
+
+    def __init__(self, token, view):
+        self.edit_token = token
+        self._view = view
+        self._valid = True
+
+    def __repr__(self):
+        return 'Edit(%r)' % self.edit_token
+
+
+class _Buffer():
+
+    # The text of a buffer together with an index of line start offsets.
+    # Modifications only invalidate the index after the modification point,
+    # the rest of it is recomputed on demand.
+
+    def __init__(self):
+        self.id = _next_id()
+        self.text = ''
+        self.change_count = 0
+        self._line_starts = [0]
+        self._line_starts_valid = True
+
+    def modify(self, begin, end, text):
+        starts = self._line_starts
+        del starts[bisect_right(starts, begin):]
+        self._line_starts_valid = False
+        self.text = self.text[:begin] + text + self.text[end:]
+        self.change_count += 1
+
+    def line_starts(self):
+        if not self._line_starts_valid:
+            starts = self._line_starts
+            offset = starts[-1]
+            for line in self.text[offset:].split('\n')[:-1]:
+                offset += len(line) + 1
+                starts.append(offset)
+
+            self._line_starts_valid = True
+
+        return self._line_starts
+
+
+def _compile(pattern, flags):
+    if flags & LITERAL:
+        pattern = re.escape(pattern)
+
+    re_flags = re.MULTILINE
+    if flags & IGNORECASE:
+        re_flags |= re.IGNORECASE
+
+    try:
+        return re.compile(pattern, re_flags)
+    except re.error:
+        return None
+
+
+def _expand_format(fmt):
+    # Sublime Text format strings reference groups as $N.
+    return re.sub('\\$(\\d+)', '\\\\g<\\1>', fmt)
+
+
+class View():
+
+    def __init__(self, window=None):
+        self.view_id = _next_id()
+        self._buffer = _Buffer()
+        self._window = window
+        self._sel = Selection(self)
+        self._sel.add(Region(0))
+        self._settings = Settings(parent=load_settings('Preferences.sublime-settings'))
+        self._regions = {}
+        self._status = {}
+        self._name = ''
+        self._file_name = None
+        self._scratch = False
+        self._read_only = False
+        self._overwrite_status = False
+        self._valid = True
+        self._saved_change_count = 0
+        self._syntax = 'Packages/Text/Plain text.tmLanguage'
+        self._viewport_row = 0
+        self._commands = {}
+        self._edit_tokens = {}
+        self._edit_depth = 0
+        self._undo_group = None
+        self._undo_stack = []
+        self._redo_stack = []
+        self._undo_mark = None
+        self._command_history = []
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, other):
+        return isinstance(other, View) and other.view_id == self.view_id
+
+    def __hash__(self):
+        return self.view_id
+
+    def __repr__(self):
+        return 'View(%r)' % self.view_id
+
+    def id(self):
+        return self.view_id
+
+    def buffer_id(self):
+        return self._buffer.id
+
+    def is_valid(self):
+        return self._valid
+
+    def is_primary(self):
+        return True
+
+    def window(self):
+        return self._window
+
+    def file_name(self):
+        return self._file_name
+
+    def name(self):
+        return self._name
+
+    def set_name(self, name):
+        self._name = name
+
+    def is_loading(self):
+        return False
+
+    def is_dirty(self):
+        return self._buffer.change_count != self._saved_change_count
+
+    def is_read_only(self):
+        return self._read_only
+
+    def set_read_only(self, read_only):
+        self._read_only = read_only
+
+    def is_scratch(self):
+        return self._scratch
+
+    def set_scratch(self, scratch):
+        self._scratch = scratch
+
+    def encoding(self):
+        return 'UTF-8'
+
+    def set_encoding(self, encoding):
+        pass
+
+    def line_endings(self):
+        return 'Unix'
+
+    def set_line_endings(self, line_ending):
+        pass
+
+    def retarget(self, new_fname):
+        self._file_name = new_fname
+
+    def close(self):
+        if self._window is not None:
+            self._window._close_view(self)
+
+        self._valid = False
+
+        return True
+
+    def settings(self):
+        return self._settings
+
+    def meta_info(self, key, pt):
+        return None
+
+    def set_syntax_file(self, syntax_file):
+        self._syntax = syntax_file
+        self._settings.set('syntax', syntax_file)
+
+    def assign_syntax(self, syntax_file):
+        self.set_syntax_file(syntax_file)
+
+    def syntax(self):
+        return self._syntax
+
+    # Buffers are not tokenized, every point has the base scope of the
+    # syntax, which is read from the syntax definition.
+
+    def _base_scope(self):
+        try:
+            match = re.search('^scope: *(\\S+)', load_resource(self._syntax), re.MULTILINE)
+            if match:
+                return match.group(1)
+        except IOError:
+            pass
+
+        return 'text.plain'
+
+    def scope_name(self, pt):
+        return self._base_scope() + ' '
+
+    def match_selector(self, pt, selector):
+        return self.score_selector(pt, selector) > 0
+
+    def score_selector(self, pt, selector):
+        return score_selector(self._base_scope(), selector)
+
+    def extract_scope(self, pt):
+        return self.full_line(pt)
+
+    def find_by_selector(self, selector):
+        return []
+
+    def indented_region(self, pt):
+        return Region(pt)
+
+    def indentation_level(self, pt):
+        line = self.substr(self.line(pt))
+        tab_size = self._settings.get('tab_size', 4) or 4
+        indent = len(line.expandtabs(tab_size)) - len(line.expandtabs(tab_size).lstrip())
+
+        return indent // tab_size
+
+    # Text.
+
+    def size(self):
+        return len(self._buffer.text)
+
+    def change_count(self):
+        return self._buffer.change_count
+
+    def substr(self, x):
+        text = self._buffer.text
+        if isinstance(x, Region):
+            return text[max(x.begin(), 0):max(x.end(), 0)]
+
+        if x < 0 or x >= len(text):
+            return '\x00'
+
+        return text[x]
+
+    def begin_edit(self, edit_token, cmd, args=None):
+        self._edit_tokens[edit_token] = True
+        self._edit_depth += 1
+        if self._undo_group is None:
+            self._undo_group = {'ops': [], 'sel': [r.to_tuple() for r in self._sel._regions], 'name': cmd}
+
+        return Edit(edit_token, self)
+
+    def end_edit(self, edit):
+        self._edit_tokens.pop(edit.edit_token, None)
+        edit._valid = False
+        self._edit_depth -= 1
+        if self._edit_depth == 0:
+            group = self._undo_group
+            self._undo_group = None
+            if group and group['ops']:
+                self._undo_stack.append(group)
+                self._redo_stack = []
+
+    def is_in_edit(self):
+        return self._edit_depth > 0
+
+    def _check_edit(self, edit):
+        if not isinstance(edit, Edit) or not edit._valid or edit.edit_token not in self._edit_tokens:
+            raise ValueError('Edit objects may not be used after the TextCommand\'s run method has returned')
+
+    def insert(self, edit, pt, text):
+        self._check_edit(edit)
+        pt = min(max(pt, 0), self.size())
+        self._modify(pt, pt, text)
+
+        return len(text)
+
+    def erase(self, edit, r):
+        self._check_edit(edit)
+        self._modify(r.begin(), r.end(), '')
+
+    def replace(self, edit, r, text):
+        self._check_edit(edit)
+        self._modify(r.begin(), r.end(), text)
+
+    def _modify(self, begin, end, text, record=True):
+        size = self.size()
+        begin = min(max(begin, 0), size)
+        end = min(max(end, 0), size)
+        if begin == end and not text:
+            return
+
+        removed = self._buffer.text[begin:end]
+        if record and self._undo_group is not None:
+            self._undo_group['ops'].append((begin, removed, text))
+
+        self._buffer.modify(begin, end, text)
+
+        delta = len(text) - (end - begin)
+
+        def adjust(p):
+            # Points at an insertion point move along with the inserted
+            # text, points within a replaced region keep their offset.
+            if p < begin:
+                return p
+
+            if begin == end or p > end:
+                return p + delta
+
+            return min(p, begin + len(text))
+
+        self._sel._adjust(adjust)
+        for key, item in self._regions.items():
+            item['regions'] = [Region(adjust(r.a), adjust(r.b)) for r in item['regions']]
+
+        _dispatch_event('on_modified', self)
+
+    # Lines.
+
+    def _line_starts(self):
+        return self._buffer.line_starts()
+
+    def rowcol(self, tp):
+        tp = min(max(tp, 0), self.size())
+        starts = self._line_starts()
+        row = bisect_right(starts, tp) - 1
+
+        return (row, tp - starts[row])
+
+    def text_point(self, row, col):
+        starts = self._line_starts()
+        if row < 0:
+            return 0
+
+        if row >= len(starts):
+            return self.size()
+
+        return min(max(starts[row] + col, 0), self.size())
+
+    def _line_bounds(self, pt):
+        starts = self._line_starts()
+        pt = min(max(pt, 0), self.size())
+        row = bisect_right(starts, pt) - 1
+        begin = starts[row]
+        if row + 1 < len(starts):
+            end = starts[row + 1] - 1
+            full_end = starts[row + 1]
+        else:
+            end = full_end = self.size()
+
+        return begin, end, full_end
+
+    def line(self, x):
+        if isinstance(x, Region):
+            a = self._line_bounds(x.begin())[0]
+            b = self._line_bounds(x.end())[1]
+
+            return Region(a, b)
+
+        begin, end, _ = self._line_bounds(x)
+
+        return Region(begin, end)
+
+    def full_line(self, x):
+        if isinstance(x, Region):
+            a = self._line_bounds(x.begin())[0]
+            b = self._line_bounds(x.end())[2]
+
+            return Region(a, b)
+
+        begin, _, full_end = self._line_bounds(x)
+
+        return Region(begin, full_end)
+
+    def lines(self, r):
+        starts = self._line_starts()
+        first = self.rowcol(r.begin())[0]
+        last, col = self.rowcol(r.end())
+        if col == 0 and last > first:
+            # A region ending at the start of a line doesn't include it.
+            last -= 1
+
+        lines = []
+        for row in range(first, last + 1):
+            begin = starts[row]
+            end = starts[row + 1] - 1 if row + 1 < len(starts) else self.size()
+            lines.append(Region(begin, end))
+
+        return lines
+
+    def split_by_newlines(self, r):
+        if r.empty():
+            return [r]
+
+        return [line.intersection(r) if not line.empty() else line for line in self.lines(r)]
+
+    # Classification.
+
+    def _char_class(self, c, separators):
+        # 0 = whitespace or out of bounds, 1 = word, 2 = punctuation
+        if c == '\x00' or c.isspace():
+            return 0
+
+        if c in separators:
+            return 2
+
+        return 1
+
+    def classify(self, pt, separators=None):
+        if separators is None:
+            separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        size = self.size()
+        text = self._buffer.text
+        prev_char = text[pt - 1] if 0 < pt <= size else '\x00'
+        next_char = text[pt] if 0 <= pt < size else '\x00'
+        prev_class = self._char_class(prev_char, separators)
+        next_class = self._char_class(next_char, separators)
+
+        classes = 0
+
+        if next_class == 1 and prev_class != 1:
+            classes |= CLASS_WORD_START
+
+        if prev_class == 1 and next_class != 1:
+            classes |= CLASS_WORD_END
+
+        if next_class == 2 and prev_class != 2:
+            classes |= CLASS_PUNCTUATION_START
+
+        if prev_class == 2 and next_class != 2:
+            classes |= CLASS_PUNCTUATION_END
+
+        if classes & CLASS_WORD_START:
+            classes |= CLASS_SUB_WORD_START
+        elif prev_class == 1 and next_class == 1:
+            if (prev_char.islower() and next_char.isupper()) or (prev_char == '_' and next_char != '_'):
+                classes |= CLASS_SUB_WORD_START
+
+        if classes & CLASS_WORD_END:
+            classes |= CLASS_SUB_WORD_END
+        elif prev_class == 1 and next_class == 1:
+            if (prev_char.islower() and next_char.isupper()) or (prev_char != '_' and next_char == '_'):
+                classes |= CLASS_SUB_WORD_END
+
+        line_start = pt <= 0 or prev_char == '\n'
+        line_end = pt >= size or next_char == '\n'
+
+        if line_start:
+            classes |= CLASS_LINE_START
+
+        if line_end:
+            classes |= CLASS_LINE_END
+
+        if line_start and line_end:
+            classes |= CLASS_EMPTY_LINE
+
+        return classes
+
+    def find_by_class(self, pt, forward, classes, separators=''):
+        if not separators:
+            separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        if forward:
+            size = self.size()
+            pt += 1
+            while pt < size:
+                if self.classify(pt, separators) & classes:
+                    return pt
+                pt += 1
+
+            return size
+
+        pt -= 1
+        while pt > 0:
+            if self.classify(pt, separators) & classes:
+                return pt
+            pt -= 1
+
+        return 0
+
+    def expand_by_class(self, x, classes, separators=''):
+        if not separators:
+            separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        if isinstance(x, Region):
+            a, b = x.begin(), x.end()
+        else:
+            a = b = x
+
+        # Each side moves at least one character, so expanding an expanded
+        # region finds the next locations out.
+        if a > 0:
+            a = self.find_by_class(a, False, classes, separators)
+
+        if b < self.size():
+            b = self.find_by_class(b, True, classes, separators)
+
+        return Region(a, b)
+
+    def word(self, x):
+        separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+        if isinstance(x, Region):
+            a, b = x.begin(), x.end()
+        else:
+            a = b = x
+
+        text = self._buffer.text
+        while a > 0 and self._char_class(text[a - 1], separators) == 1:
+            a -= 1
+
+        while b < len(text) and self._char_class(text[b], separators) == 1:
+            b += 1
+
+        return Region(a, b)
+
+    # Searching.
+
+    def find(self, pattern, start_pt, flags=0):
+        regex = _compile(pattern, flags)
+        if regex is None:
+            return Region(-1, -1)
+
+        match = regex.search(self._buffer.text, max(start_pt, 0))
+        if match is None:
+            return Region(-1, -1)
+
+        return Region(match.start(), match.end())
+
+    def find_all(self, pattern, flags=0, fmt=None, extractions=None):
+        regex = _compile(pattern, flags)
+        if regex is None:
+            return []
+
+        regions = []
+        template = _expand_format(fmt) if fmt is not None else None
+        for match in regex.finditer(self._buffer.text):
+            regions.append(Region(match.start(), match.end()))
+            if extractions is not None and template is not None:
+                extractions.append(match.expand(template))
+
+        return regions
+
+    # Selection and regions.
+
+    def sel(self):
+        return self._sel
+
+    def has_non_empty_selection_region(self):
+        return any(not r.empty() for r in self._sel._regions)
+
+    def add_regions(self, key, regions, scope='', icon='', flags=0):
+        self._regions[key] = {
+            'regions': [Region(r.a, r.b) for r in regions],
+            'scope': scope,
+            'icon': icon,
+            'flags': flags,
+        }
+
+    def get_regions(self, key):
+        try:
+            return [Region(r.a, r.b) for r in self._regions[key]['regions']]
+        except KeyError:
+            return []
+
+    def erase_regions(self, key):
+        self._regions.pop(key, None)
+
+    def folded_regions(self):
+        return []
+
+    def fold(self, x):
+        return False
+
+    def unfold(self, x):
+        return []
+
+    # Layout. Every character is one em wide and the viewport is a fixed
+    # number of rows tall, which is all that scrolling motions rely on.
+
+    def _rows(self):
+        return len(self._line_starts())
+
+    def visible_region(self):
+        top = min(self._viewport_row, max(self._rows() - 1, 0))
+        bottom = top + _VIEWPORT_ROWS - 1
+        a = self.text_point(top, 0)
+        b = self.line(self.text_point(min(bottom, self._rows() - 1), 0)).end()
+
+        return Region(a, b)
+
+    def show(self, x, show_surrounds=True):
+        if isinstance(x, Selection):
+            if not len(x):
+                return
+            x = x[0]
+
+        pt = x.b if isinstance(x, Region) else x
+        row = self.rowcol(pt)[0]
+        if row < self._viewport_row:
+            self._viewport_row = row
+        elif row >= self._viewport_row + _VIEWPORT_ROWS:
+            self._viewport_row = row - _VIEWPORT_ROWS + 1
+
+    def show_at_center(self, x):
+        pt = x.b if isinstance(x, Region) else x
+        row = self.rowcol(pt)[0]
+        self._viewport_row = max(row - _VIEWPORT_ROWS // 2, 0)
+
+    def viewport_position(self):
+        return (0.0, self._viewport_row * _LINE_HEIGHT)
+
+    def set_viewport_position(self, xy, animate=True):
+        self._viewport_row = max(int(xy[1] // _LINE_HEIGHT), 0)
+
+    def viewport_extent(self):
+        return (_VIEWPORT_COLUMNS * _EM_WIDTH, _VIEWPORT_ROWS * _LINE_HEIGHT)
+
+    def layout_extent(self):
+        return (_VIEWPORT_COLUMNS * _EM_WIDTH, self._rows() * _LINE_HEIGHT)
+
+    def text_to_layout(self, tp):
+        row, col = self.rowcol(tp)
+
+        return (col * _EM_WIDTH, row * _LINE_HEIGHT)
+
+    def text_to_window(self, tp):
+        x, y = self.text_to_layout(tp)
+
+        return (x, y - self._viewport_row * _LINE_HEIGHT)
+
+    def layout_to_text(self, vector):
+        return self.text_point(int(vector[1] // _LINE_HEIGHT), int(vector[0] // _EM_WIDTH))
+
+    def window_to_text(self, vector):
+        return self.layout_to_text((vector[0], vector[1] + self._viewport_row * _LINE_HEIGHT))
+
+    def line_height(self):
+        return _LINE_HEIGHT
+
+    def em_width(self):
+        return _EM_WIDTH
+
+    # Status.
+
+    def set_status(self, key, value):
+        self._status[key] = value
+
+    def get_status(self, key):
+        return self._status.get(key, '')
+
+    def erase_status(self, key):
+        self._status.pop(key, None)
+
+    def set_overwrite_status(self, value):
+        self._overwrite_status = value
+
+    def overwrite_status(self):
+        return self._overwrite_status
+
+    def show_popup(self, content, flags=0, location=-1, max_width=320, max_height=240, on_navigate=None, on_hide=None):
+        pass
+
+    def hide_popup(self):
+        pass
+
+    def is_popup_visible(self):
+        return False
+
+    def is_auto_complete_visible(self):
+        return False
+
+    # Commands.
+
+    def run_command(self, cmd, args=None):
+        import sublime_plugin
+
+        return sublime_plugin._run_text_command(self, cmd, args)
+
+    def command_history(self, delta, modifying_only=False):
+        history = self._command_history
+        if modifying_only:
+            history = [item for item in history if item[3]]
+
+        index = len(history) - 1 + delta
+        if delta > 0 or index < 0 or index >= len(history):
+            return ('', None, 0)
+
+        name, args, count, _ = history[index]
+
+        return (name, args, count)
+
+    def _record_command(self, name, args, modifying):
+        history = self._command_history
+        if history and history[-1][0] == name and history[-1][1] == args:
+            last = history[-1]
+            history[-1] = (last[0], last[1], last[2] + 1, last[3] or modifying)
+        else:
+            history.append((name, args, 1, modifying))
+
+        del history[:-100]
+
+    # Undo.
+
+    def _undo(self):
+        if not self._undo_stack:
+            return
+
+        group = self._undo_stack.pop()
+        for begin, removed, inserted in reversed(group['ops']):
+            self._modify(begin, begin + len(inserted), removed, record=False)
+
+        self._sel.clear()
+        for a, b in group['sel']:
+            self._sel.add(Region(a, b))
+
+        self._redo_stack.append(group)
+
+    def _redo(self):
+        if not self._redo_stack:
+            return
+
+        group = self._redo_stack.pop()
+        for begin, removed, inserted in group['ops']:
+            self._modify(begin, begin + len(removed), inserted, record=False)
+
+        self._undo_stack.append(group)
+
+    def _mark_undo_groups_for_gluing(self):
+        self._undo_mark = len(self._undo_stack)
+
+    def _glue_marked_undo_groups(self):
+        if self._undo_mark is None:
+            return
+
+        groups = self._undo_stack[self._undo_mark:]
+        del self._undo_stack[self._undo_mark:]
+        if groups:
+            glued = {'ops': [], 'sel': groups[0]['sel'], 'name': groups[0]['name']}
+            for group in groups:
+                glued['ops'].extend(group['ops'])
+
+            self._undo_stack.append(glued)
+
+        self._undo_mark = None
+
+    def _unmark_undo_groups_for_gluing(self):
+        self._undo_mark = None
+
+
+class Window():
+
+    def __init__(self):
+        self.window_id = _next_id()
+        self._views = []
+        self._active_view = None
+        self._panels = {}
+        self._active_panel = None
+        self._settings = Settings()
+        self._commands = {}
+        self._layout = {'cols': [0.0, 1.0], 'rows': [0.0, 1.0], 'cells': [[0, 0, 1, 1]]}
+        self._status_bar_visible = True
+        self._sidebar_visible = True
+        self._minimap_visible = True
+        self._menu_visible = True
+        self._tabs_visible = True
+        self._valid = True
+
+    def __eq__(self, other):
+        return isinstance(other, Window) and other.window_id == self.window_id
+
+    def __hash__(self):
+        return self.window_id
+
+    def __repr__(self):
+        return 'Window(%r)' % self.window_id
+
+    def id(self):
+        return self.window_id
+
+    def is_valid(self):
+        return self._valid
+
+    def settings(self):
+        return self._settings
+
+    def views(self):
+        return list(self._views)
+
+    def active_view(self):
+        return self._active_view
+
+    def new_file(self, flags=0, syntax=''):
+        view = View(self)
+        self._views.append(view)
+        self._active_view = view
+        _dispatch_event('on_new', view)
+        _dispatch_event('on_activated', view)
+
+        return view
+
+    def open_file(self, fname, flags=0, group=-1):
+        if flags & ENCODED_POSITION:
+            fname = re.sub(':\\d+(:\\d+)?$', '', fname)
+
+        view = self.find_open_file(fname)
+        if view is None:
+            view = View(self)
+            view._file_name = fname
+            if os.path.isfile(fname):
+                with open(fname, encoding='utf-8', errors='replace') as f:
+                    view._buffer.modify(0, 0, f.read())
+                view._saved_change_count = view._buffer.change_count
+
+            self._views.append(view)
+            _dispatch_event('on_load', view)
+
+        self.focus_view(view)
+
+        return view
+
+    def find_open_file(self, fname):
+        for view in self._views:
+            if view.file_name() == fname:
+                return view
+
+        return None
+
+    def _close_view(self, view):
+        if view in self._views:
+            _dispatch_event('on_close', view)
+            self._views.remove(view)
+
+        if self._active_view == view:
+            self._active_view = self._views[-1] if self._views else None
+
+    def focus_view(self, view):
+        if view in self._views and self._active_view != view:
+            self._active_view = view
+            _dispatch_event('on_activated', view)
+
+    # All views live in one group.
+
+    def num_groups(self):
+        return 1
+
+    def active_group(self):
+        return 0
+
+    def focus_group(self, idx):
+        pass
+
+    def active_view_in_group(self, group):
+        return self._active_view if group == 0 else None
+
+    def views_in_group(self, group):
+        return list(self._views) if group == 0 else []
+
+    def get_view_index(self, view):
+        try:
+            return (0, self._views.index(view))
+        except ValueError:
+            return (-1, -1)
+
+    def set_view_index(self, view, group, idx):
+        if view in self._views:
+            self._views.remove(view)
+            self._views.insert(min(idx, len(self._views)), view)
+
+    def get_layout(self):
+        return copy.deepcopy(self._layout)
+
+    def layout(self):
+        return self.get_layout()
+
+    def set_layout(self, layout):
+        self._layout = copy.deepcopy(layout)
+
+    def create_output_panel(self, name, unlisted=False):
+        panel = View(self)
+        panel.settings().set('is_widget', True)
+        self._panels['output.' + name] = panel
+
+        return panel
+
+    def find_output_panel(self, name):
+        return self._panels.get('output.' + name)
+
+    def destroy_output_panel(self, name):
+        self._panels.pop('output.' + name, None)
+
+    def active_panel(self):
+        return self._active_panel
+
+    def panels(self):
+        return list(self._panels)
+
+    def show_input_panel(self, caption, initial_text, on_done, on_change, on_cancel):
+        panel = View(self)
+        panel.settings().set('is_widget', True)
+        panel._buffer.modify(0, 0, initial_text)
+        self._panels['input'] = panel
+
+        return panel
+
+    def show_quick_panel(self, items, on_select, flags=0, selected_index=-1, on_highlight=None):
+        pass
+
+    def is_sidebar_visible(self):
+        return self._sidebar_visible
+
+    def set_sidebar_visible(self, flag):
+        self._sidebar_visible = flag
+
+    def is_minimap_visible(self):
+        return self._minimap_visible
+
+    def set_minimap_visible(self, flag):
+        self._minimap_visible = flag
+
+    def is_status_bar_visible(self):
+        return self._status_bar_visible
+
+    def set_status_bar_visible(self, flag):
+        self._status_bar_visible = flag
+
+    def is_menu_visible(self):
+        return self._menu_visible
+
+    def set_menu_visible(self, flag):
+        self._menu_visible = flag
+
+    def get_tabs_visible(self):
+        return self._tabs_visible
+
+    def set_tabs_visible(self, flag):
+        self._tabs_visible = flag
+
+    def folders(self):
+        return []
+
+    def project_file_name(self):
+        return None
+
+    def project_data(self):
+        return None
+
+    def extract_variables(self):
+        return {'platform': 'Linux', 'packages': packages_path()}
+
+    def lookup_symbol_in_index(self, sym):
+        return []
+
+    def lookup_symbol_in_open_files(self, sym):
+        return []
+
+    def run_command(self, cmd, args=None):
+        import sublime_plugin
+
+        return sublime_plugin._run_window_command(self, cmd, args)
+
+    def close(self):
+        for view in list(self._views):
+            view.close()
+
+        self._valid = False
+        if self in _state['windows']:
+            _state['windows'].remove(self)
+
+        if _state['active_window'] == self:
+            _state['active_window'] = _state['windows'][-1] if _state['windows'] else None
+
+
+def _dispatch_event(name, view):
+    # Events are only dispatched when installed as the "sublime" module.
+    if sys.modules.get('sublime') is sys.modules[__name__]:
+        sys.modules['sublime_plugin']._dispatch_event(name, view)
+
+
+def version():
+    return '3176'
+
+
+def platform():
+    return 'linux'
+
+
+def arch():
+    return 'x64'
+
+
+def channel():
+    return 'stable'
+
+
+def executable_path():
+    return sys.executable
+
+
+def packages_path():
+    if _state['packages_path'] is None:
+        _state['packages_path'] = tempfile.mkdtemp(prefix='nv-headless-packages-')
+
+    return _state['packages_path']
+
+
+def installed_packages_path():
+    return os.path.join(packages_path(), 'Installed Packages')
+
+
+def cache_path():
+    return os.path.join(packages_path(), 'Cache')
+
+
+def _resource_path(name):
+    # Resources named "Packages/<package>/..." resolve to the package
+    # directories registered in the packages path.
+    if not name.startswith('Packages/'):
+        return None
+
+    return os.path.join(packages_path(), *name[len('Packages/'):].split('/'))
+
+
+def load_resource(name):
+    path = _resource_path(name)
+    if path is None or not os.path.isfile(path):
+        raise IOError('resource not found')
+
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def load_binary_resource(name):
+    path = _resource_path(name)
+    if path is None or not os.path.isfile(path):
+        raise IOError('resource not found')
+
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def find_resources(pattern):
+    import fnmatch
+
+    root = packages_path()
+    resources = []
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        for filename in fnmatch.filter(filenames, pattern):
+            relpath = os.path.relpath(os.path.join(dirpath, filename), root)
+            resources.append('Packages/' + relpath.replace(os.sep, '/'))
+
+    return sorted(resources)
+
+
+def _strip_json_comments(text):
+    return re.sub('^\\s*//.*$', '', text, flags=re.MULTILINE)
+
+
+def load_settings(base_name):
+    try:
+        return _state['settings'][base_name]
+    except KeyError:
+        pass
+
+    settings = Settings()
+    if base_name == 'Preferences.sublime-settings':
+        settings.set('word_separators', _DEFAULT_WORD_SEPARATORS)
+        settings.set('tab_size', 4)
+        settings.set('translate_tabs_to_spaces', False)
+
+    # Defaults shipped by packages, e.g. the plugin's own preferences.
+    for resource in find_resources(base_name):
+        try:
+            values = json.loads(_strip_json_comments(load_resource(resource)))
+        except ValueError:
+            continue
+
+        for key, value in values.items():
+            settings.set(key, value)
+
+    _state['settings'][base_name] = settings
+
+    return settings
+
+
+def save_settings(base_name):
+    pass
+
+
+def encode_value(val, pretty=False):
+    return json.dumps(val, indent=4 if pretty else None)
+
+
+def decode_value(data):
+    return json.loads(data)
+
+
+def expand_variables(val, variables):
+    if isinstance(val, str):
+        return re.sub('\\$\\{?(\\w+)\\}?', lambda m: variables.get(m.group(1), m.group(0)), val)
+
+    return val
+
+
+def set_clipboard(text):
+    _state['clipboard'] = text
+
+
+def get_clipboard(size_limit=16777216):
+    return _state['clipboard'][:size_limit]
+
+
+def status_message(msg):
+    pass
+
+
+def error_message(msg):
+    pass
+
+
+def message_dialog(msg):
+    pass
+
+
+def ok_cancel_dialog(msg, ok_title=''):
+    return True
+
+
+def yes_no_cancel_dialog(msg, yes_title='', no_title=''):
+    return DIALOG_YES
+
+
+def log_commands(flag):
+    pass
+
+
+def log_input(flag):
+    pass
+
+
+def log_result_regex(flag):
+    pass
+
+
+def log_indexing(flag):
+    pass
+
+
+def log_build_systems(flag):
+    pass
+
+
+def score_selector(scope_name, selector):
+    if not selector.strip():
+        return 1
+
+    scope = scope_name.strip().split(' ')[0]
+    for part in selector.split(','):
+        first = part.strip().split(' ')[0]
+        if first and (scope == first or scope.startswith(first + '.')):
+            return 1
+
+    return 0
+
+
+def get_macro():
+    return []
+
+
+def set_timeout(f, timeout_ms=0):
+    # Callbacks run, in order, once the outermost command returns, which is
+    # the earliest Sublime Text would run them too.
+    _state['timeouts'].append(f)
+
+
+def set_timeout_async(f, timeout_ms=0):
+    _state['timeouts'].append(f)
+
+
+def _run_timeouts():
+    timeouts = _state['timeouts']
+    while timeouts:
+        timeouts.pop(0)()
+
+
+def active_window():
+    if _state['active_window'] is None:
+        _state['active_window'] = Window()
+        _state['windows'].append(_state['active_window'])
+
+    return _state['active_window']
+
+
+def windows():
+    return list(_state['windows'])
+
+
+def run_command(cmd, args=None):
+    import sublime_plugin
+
+    return sublime_plugin._run_application_command(cmd, args)
+
+
+# Report the stand-in classes as belonging to the "sublime" module.
+for _cls in (Region, Selection, Settings, Edit, View, Window):
+    _cls.__module__ = 'sublime'
@@ -0,0 +1,541 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless, pure-Python stand-in for the Sublime Text "sublime_plugin"
+# API module. Commands are looked up by name among the loaded subclasses of
+# TextCommand, WindowCommand and ApplicationCommand. A handful of the core
+# Sublime Text commands the plugin relies on are emulated, unknown ones are
+# ignored, as they are by Sublime Text.
+
+import importlib
+import json
+import sys
+
+import sublime
+
+
+_state = {
+    'classes': {},
+    'listeners': None,
+    'application_commands': {},
+    'unknown_commands': [],
+}
+
+
+def reload_plugin(modulename):
+    if modulename in sys.modules:
+        importlib.reload(sys.modules[modulename])
+    else:
+        importlib.import_module(modulename)
+
+    _state['classes'] = {}
+    _state['listeners'] = None
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        for subsubclass in _subclasses(subclass):
+            yield subsubclass
+
+
+def _find_command_class(base, name):
+    classes = _state['classes'].setdefault(base, {})
+    try:
+        return classes[name]
+    except KeyError:
+        pass
+
+    # Commands defined since the last lookup are picked up by rescanning.
+    for cls in _subclasses(base):
+        classes[_command_name(cls.__name__)] = cls
+
+    return classes.get(name)
+
+
+# The command names of the class names, a lookup of a command that isn't found
+# rescans every command class.
+_command_names = {}
+
+
+def _command_name(clsname):
+    try:
+        return _command_names[clsname]
+    except KeyError:
+        pass
+
+    name = clsname[0].lower()
+    last_upper = False
+    for c in clsname[1:]:
+        if c.isupper() and not last_upper:
+            name += '_'
+            name += c.lower()
+        else:
+            name += c
+        last_upper = c.isupper()
+
+    if name.endswith('_command'):
+        name = name[0:-8]
+
+    _command_names[clsname] = name
+
+    return name
+
+
+def _copy_args(args):
+    # Sublime Text passes command arguments through JSON.
+    if args is None:
+        return None
+
+    return json.loads(json.dumps(args))
+
+
+class _CommandBoundary():
+
+    # Pending timeouts run when the outermost command returns.
+
+    depth = 0
+
+    def __enter__(self):
+        _CommandBoundary.depth += 1
+
+    def __exit__(self, *exc_info):
+        _CommandBoundary.depth -= 1
+        if _CommandBoundary.depth == 0:
+            sublime._run_timeouts()
+
+
+def _run_text_command(view, name, args):
+    args = _copy_args(args)
+
+    with _CommandBoundary():
+        rewritten = _dispatch_query('on_text_command', view, name, args)
+        if rewritten:
+            name, args = rewritten
+
+        cls = _find_command_class(TextCommand, name)
+        if cls is None:
+            builtin = _BUILTIN_TEXT_COMMANDS.get(name)
+            if builtin is None:
+                window = view.window()
+                if window is not None and _find_command_class(WindowCommand, name):
+                    return _run_window_command(window, name, args)
+
+                _state['unknown_commands'].append(name)
+
+                return
+
+            change_count = view.change_count()
+            edit = view.begin_edit(object(), name, args)
+            try:
+                builtin(view, edit, **(args or {}))
+            finally:
+                view.end_edit(edit)
+
+            view._record_command(name, args, view.change_count() != change_count)
+            _dispatch_event('on_post_text_command', view, name, args)
+
+            return
+
+        try:
+            command = view._commands[name]
+        except KeyError:
+            command = view._commands[name] = cls(view)
+
+        if not command.is_enabled_(args):
+            return
+
+        change_count = view.change_count()
+        command.run_(object(), args)
+        view._record_command(name, args, view.change_count() != change_count)
+        _dispatch_event('on_post_text_command', view, name, args)
+
+
+def _run_window_command(window, name, args):
+    args = _copy_args(args)
+
+    with _CommandBoundary():
+        cls = _find_command_class(WindowCommand, name)
+        if cls is None:
+            builtin = _BUILTIN_WINDOW_COMMANDS.get(name)
+            if builtin is not None:
+                return builtin(window, **(args or {}))
+
+            view = window.active_view()
+            if view is not None and (_find_command_class(TextCommand, name) or name in _BUILTIN_TEXT_COMMANDS):
+                return _run_text_command(view, name, args)
+
+            _state['unknown_commands'].append(name)
+
+            return
+
+        try:
+            command = window._commands[name]
+        except KeyError:
+            command = window._commands[name] = cls(window)
+
+        if command.is_enabled_(args):
+            command.run_(object(), args)
+
+
+def _run_application_command(name, args):
+    args = _copy_args(args)
+
+    with _CommandBoundary():
+        cls = _find_command_class(ApplicationCommand, name)
+        if cls is None:
+            _state['unknown_commands'].append(name)
+
+            return
+
+        try:
+            command = _state['application_commands'][name]
+        except KeyError:
+            command = _state['application_commands'][name] = cls()
+
+        if command.is_enabled_(args):
+            command.run_(object(), args)
+
+
+def _listeners():
+    if _state['listeners'] is None:
+        _state['listeners'] = [cls() for cls in _subclasses(EventListener)]
+
+    return _state['listeners']
+
+
+def _dispatch_event(name, view, *args):
+    for listener in _listeners():
+        callback = getattr(listener, name, None)
+        if callback:
+            callback(view, *args)
+
+
+def _dispatch_query(name, view, *args):
+    for listener in _listeners():
+        callback = getattr(listener, name, None)
+        if callback:
+            result = callback(view, *args)
+            if result:
+                return result
+
+    return None
+
+
+class Command():
+
+    def name(self):
+        return _command_name(self.__class__.__name__)
+
+    def is_enabled_(self, args):
+        try:
+            args = self.filter_args(args)
+            if args:
+                return self.is_enabled(**args)
+
+            return self.is_enabled()
+        except TypeError:
+            return self.is_enabled()
+
+    def is_enabled(self):
+        return True
+
+    def is_visible(self):
+        return True
+
+    def is_checked(self):
+        return False
+
+    def description(self):
+        return ''
+
+    def filter_args(self, args):
+        if args:
+            if 'event' in args and not self.want_event():
+                args = dict(args)
+                del args['event']
+
+        return args
+
+    def want_event(self):
+        return False
+
+
+class ApplicationCommand(Command):
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+
+        return self.run()
+
+    def run(self):
+        pass
+
+
+class WindowCommand(Command):
+
+    def __init__(self, window):
+        self.window = window
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+
+        return self.run()
+
+    def run(self):
+        pass
+
+
+class TextCommand(Command):
+
+    def __init__(self, view):
+        self.view = view
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            edit = self.view.begin_edit(edit_token, self.name(), args)
+            try:
+                return self.run(edit, **args)
+            finally:
+                self.view.end_edit(edit)
+        else:
+            edit = self.view.begin_edit(edit_token, self.name())
+            try:
+                return self.run(edit)
+            finally:
+                self.view.end_edit(edit)
+
+    def run(self, edit):
+        pass
+
+
+class EventListener():
+    pass
+
+
+class ViewEventListener():
+
+    @classmethod
+    def is_applicable(cls, settings):
+        return True
+
+    @classmethod
+    def applies_to_primary_view_only(cls):
+        return True
+
+    def __init__(self, view):
+        self.view = view
+
+
+def _insert(view, edit, characters=''):
+    for region in reversed(list(view.sel())):
+        if region.empty():
+            view.insert(edit, region.b, characters)
+        else:
+            view.replace(edit, region, characters)
+
+    cursors = [sublime.Region(region.end()) for region in view.sel()]
+    view.sel().clear()
+    view.sel().add_all(cursors)
+
+
+def _append(view, edit, characters='', force=False, scroll_to_end=False):
+    view._modify(view.size(), view.size(), characters)
+
+
+def _left_delete(view, edit):
+    for region in reversed(list(view.sel())):
+        if region.empty():
+            if region.b > 0:
+                view.erase(edit, sublime.Region(region.b - 1, region.b))
+        else:
+            view.erase(edit, region)
+
+
+def _right_delete(view, edit):
+    for region in reversed(list(view.sel())):
+        if region.empty():
+            view.erase(edit, sublime.Region(region.b, region.b + 1))
+        else:
+            view.erase(edit, region)
+
+
+def _move(view, edit, by='characters', forward=True, extend=False, **kwargs):
+    regions = list(view.sel())
+    view.sel().clear()
+    for region in regions:
+        if by == 'characters':
+            pt = min(region.b + 1, view.size()) if forward else max(region.b - 1, 0)
+        elif by in ('lines', 'pages'):
+            amount = 1 if by == 'lines' else sublime._VIEWPORT_ROWS
+            row, col = view.rowcol(region.b)
+            if region.xpos >= 0:
+                col = int(region.xpos // view.em_width())
+            row = row + amount if forward else max(row - amount, 0)
+            if row >= view.rowcol(view.size())[0] + 1:
+                pt = view.size()
+            else:
+                line = view.line(view.text_point(row, 0))
+                pt = min(line.a + col, line.b)
+            if by == 'pages':
+                view.show(pt)
+        else:
+            pt = region.b
+
+        if extend:
+            view.sel().add(sublime.Region(region.a, pt))
+        else:
+            view.sel().add(sublime.Region(pt))
+
+
+def _move_to(view, edit, to='bol', extend=False):
+    regions = list(view.sel())
+    view.sel().clear()
+    for region in regions:
+        if to == 'bof':
+            pt = 0
+        elif to == 'eof':
+            pt = view.size()
+        elif to == 'eol':
+            pt = view.line(region.b).b
+        else:
+            pt = view.line(region.b).a
+
+        view.sel().add(sublime.Region(region.a, pt) if extend else sublime.Region(pt))
+
+
+def _select_all(view, edit):
+    view.sel().clear()
+    view.sel().add(sublime.Region(0, view.size()))
+
+
+def _single_selection(view, edit):
+    first = view.sel()[0]
+    view.sel().clear()
+    view.sel().add(first)
+
+
+def _scroll_lines(view, edit, amount=0, **kwargs):
+    view._viewport_row = max(view._viewport_row - int(amount), 0)
+
+
+def _swap_case(view, edit):
+    for region in view.sel():
+        if not region.empty():
+            view.replace(edit, region, view.substr(region).swapcase())
+
+
+def _indent(view, edit):
+    for region in view.sel():
+        for line in reversed(view.lines(region)):
+            if not line.empty():
+                view.insert(edit, line.a, '\t')
+
+
+def _unindent(view, edit):
+    tab_size = view.settings().get('tab_size', 4) or 4
+    for region in view.sel():
+        for line in reversed(view.lines(region)):
+            text = view.substr(line)
+            if text.startswith('\t'):
+                view.erase(edit, sublime.Region(line.a, line.a + 1))
+            else:
+                spaces = len(text) - len(text.lstrip(' '))
+                view.erase(edit, sublime.Region(line.a, line.a + min(spaces, tab_size)))
+
+
+def _undo(view, edit):
+    view._undo()
+
+
+def _redo(view, edit):
+    view._redo()
+
+
+def _mark_undo_groups_for_gluing(view, edit):
+    view._mark_undo_groups_for_gluing()
+
+
+def _glue_marked_undo_groups(view, edit):
+    view._glue_marked_undo_groups()
+
+
+def _unmark_undo_groups_for_gluing(view, edit):
+    view._unmark_undo_groups_for_gluing()
+
+
+def _noop(view, edit, **kwargs):
+    pass
+
+
+_BUILTIN_TEXT_COMMANDS = {
+    'append': _append,
+    'glue_marked_undo_groups': _glue_marked_undo_groups,
+    'hide_auto_complete': _noop,
+    'indent': _indent,
+    'insert': _insert,
+    'left_delete': _left_delete,
+    'mark_undo_groups_for_gluing': _mark_undo_groups_for_gluing,
+    'move': _move,
+    'move_to': _move_to,
+    'redo': _redo,
+    'reindent': _noop,
+    'right_delete': _right_delete,
+    'scroll_lines': _scroll_lines,
+    'select_all': _select_all,
+    'single_selection': _single_selection,
+    'soft_redo': _redo,
+    'soft_undo': _undo,
+    'swap_case': _swap_case,
+    'toggle_comment': _noop,
+    'undo': _undo,
+    'unindent': _unindent,
+    'unmark_undo_groups_for_gluing': _unmark_undo_groups_for_gluing,
+}
+
+
+def _new_file(window, **kwargs):
+    window.new_file()
+
+
+def _close(window, **kwargs):
+    view = window.active_view()
+    if view is not None:
+        view.close()
+
+
+def _hide_panel(window, **kwargs):
+    window._active_panel = None
+
+
+_BUILTIN_WINDOW_COMMANDS = {
+    'close': _close,
+    'close_file': _close,
+    'hide_overlay': lambda window, **kwargs: None,
+    'hide_panel': _hide_panel,
+    'new_file': _new_file,
+}
+
+
+# Report the stand-in classes as belonging to the "sublime_plugin" module.
+for _cls in (Command, ApplicationCommand, WindowCommand, TextCommand, EventListener, ViewEventListener):
+    _cls.__module__ = 'sublime_plugin'
@@ -0,0 +1,136 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Runs benchmark cases and reports the timings.
+#
+# A case is a name, the parameters it was run with, and a function that
+# runs one iteration of it. An optional setup function runs, untimed, before
+# every iteration e.g. to reset the selection.
+#
+# Results are written as a JSON document:
+#
+#   {
+#     "meta": {"python": "3.3.6", "platform": "linux", ...},
+#     "results": [
+#       {
+#         "name": "motion/_vi_w",
+#         "params": {"buffer": "code", "lines": 10000, "cursors": 1, "count": 1000},
+#         "repeat": 5,
+#         "min": 0.0012, "median": 0.0013, "mean": 0.0013, "max": 0.0015,
+#         "timings": [0.0012, ...]
+#       },
+#       ...
+#     ]
+#   }
+#
+# Timings are in seconds. Cases that fail have an "error" instead of timings.
+
+from collections import namedtuple
+import json
+import platform
+import sys
+import time
+
+
+Case = namedtuple('Case', 'name params run setup')
+
+
+def case(name, run, setup=None, **params):
+    # type: (...) -> Case
+    return Case(name, params, run, setup)
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def run_case(c, repeat=5):
+    # type: (Case, int) -> dict
+    # A case that raises an exception is reported with the error, instead of
+    # timings, so that one broken case doesn't abort the whole run.
+    timings = []
+    try:
+        for i in range(repeat):
+            if c.setup:
+                c.setup()
+
+            start = time.perf_counter()
+            c.run()
+            timings.append(time.perf_counter() - start)
+    except Exception as e:
+        return {
+            'name': c.name,
+            'params': c.params,
+            'repeat': repeat,
+            'error': '%s: %s' % (e.__class__.__name__, e),
+        }
+
+    return {
+        'name': c.name,
+        'params': c.params,
+        'repeat': repeat,
+        'min': min(timings),
+        'median': _median(timings),
+        'mean': sum(timings) / len(timings),
+        'max': max(timings),
+        'timings': timings,
+    }
+
+
+def meta():
+    # type: () -> dict
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': sys.platform,
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def run_cases(cases, repeat=5, progress=None):
+    # type: (...) -> list
+    results = []
+    for c in cases:
+        result = run_case(c, repeat)
+        results.append(result)
+        if progress:
+            progress.write(format_result(result) + '\n')
+            progress.flush()
+
+    return results
+
+
+def format_result(result):
+    # type: (dict) -> str
+    params = ' '.join('%s=%s' % (k, result['params'][k]) for k in sorted(result['params']))
+    if 'error' in result:
+        return '%-40s %-60s %s' % (result['name'], params, result['error'][:80])
+
+    return '%-40s %-60s median %10.3fms  min %10.3fms' % (
+        result['name'], params, result['median'] * 1000, result['min'] * 1000)
+
+
+def write_results(results, fp):
+    # type: (list, ...) -> None
+    json.dump({'meta': meta(), 'results': results}, fp, indent=2, sort_keys=True)
+    fp.write('\n')
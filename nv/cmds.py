@@ -31,6 +31,7 @@ from NeoVintageous.nv.ex.completions import parse_for_fs
 from NeoVintageous.nv.ex.completions import parse_for_setting
 from NeoVintageous.nv.ex_cmds import do_ex_cmd_edit_wrap
 from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+from NeoVintageous.nv.ex_cmds import do_ex_substitute_confirm_replace
 from NeoVintageous.nv.ex_cmds import do_ex_command
 from NeoVintageous.nv.ex_cmds import do_ex_user_cmdline
 from NeoVintageous.nv.history import history_get
@@ -40,6 +41,12 @@ from NeoVintageous.nv.history import history_update
 from NeoVintageous.nv.mappings import Mapping
 from NeoVintageous.nv.mappings import mappings_is_incomplete
 from NeoVintageous.nv.mappings import mappings_resolve
+from NeoVintageous.nv.profiler import PHASE_EVAL
+from NeoVintageous.nv.profiler import PHASE_KEY
+from NeoVintageous.nv.profiler import PHASE_MAPPING
+from NeoVintageous.nv.profiler import PHASE_MODE
+from NeoVintageous.nv.profiler import profiler_report
+from NeoVintageous.nv.profiler import profiler_timer
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
 from NeoVintageous.nv.ui import ui_bell
@@ -50,6 +57,7 @@ from NeoVintageous.nv.vi.cmd_defs import ViOpenNameSpace
 from NeoVintageous.nv.vi.cmd_defs import ViOpenRegister
 from NeoVintageous.nv.vi.cmd_defs import ViOperatorDef
 from NeoVintageous.nv.vi.core import ViWindowCommandBase
+from NeoVintageous.nv.vi.keys import is_command_prefix
 from NeoVintageous.nv.vi.keys import key_names
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
 from NeoVintageous.nv.vi.keys import to_bare_command_name
@@ -75,6 +83,7 @@ __all__ = [
     '_nv_cmdline',
     '_nv_cmdline_feed_key',
     '_nv_ex_cmd_edit_wrap',
+    '_nv_ex_substitute_confirm_replace',
     '_nv_feed_key',
     '_nv_fix_st_eol_caret',
     '_nv_fs_completion',
@@ -87,6 +96,7 @@ __all__ = [
     'NeovintageousOpenMyRcFileCommand',
     'NeovintageousReloadMyRcFileCommand',
     'NeovintageousToggleSideBarCommand',
+    'NvProfileCommand',
     'SequenceCommand'
 ]
 
@@ -277,6 +287,10 @@ class _nv_feed_key(ViWindowCommandBase):
         #       state's evaluation. For example, this is what the _nv_feed_key
         #       command does.
         #   check_user_mappings (bool):
+        with profiler_timer('_nv_feed_key', PHASE_KEY):
+            self._feed_key(key, repeat_count, do_eval, check_user_mappings)
+
+    def _feed_key(self, key, repeat_count, do_eval, check_user_mappings):
         start_time = time.time()
         _log.info('key evt: %s repeat_count=%s do_eval=%s check_user_mappings=%s', key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
         state = self.state
@@ -291,7 +305,9 @@ class _nv_feed_key(ViWindowCommandBase):
                 init_state(state.view)
 
         if key.lower() == '<esc>':
-            self.window.run_command('_enter_normal_mode', {'mode': state.mode})
+            with profiler_timer('_enter_normal_mode', PHASE_MODE):
+                state.add_repeat_step('_enter_normal_mode', {'mode': state.mode})
+                self.window.run_command('_enter_normal_mode', {'mode': state.mode})
             state.reset_command_data()
             _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
 
@@ -315,7 +331,8 @@ class _nv_feed_key(ViWindowCommandBase):
                 _log.debug('state is runnable')
                 if do_eval:
                     _log.debug('evaluating state...')
-                    state.eval()
+                    with profiler_timer((state.motion or state.action).__class__.__name__, PHASE_EVAL):
+                        state.eval()
                     state.reset_command_data()
 
             _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
@@ -333,14 +350,18 @@ class _nv_feed_key(ViWindowCommandBase):
 
         state.partial_sequence += key
 
-        if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
+        with profiler_timer('_nv_feed_key', PHASE_MAPPING):
+            if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
+                command = None
+            else:
+                command = mappings_resolve(state, check_user_mappings=check_user_mappings)
+
+        if command is None:
             _log.debug('found incomplete mapping')
             _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
 
             return
 
-        command = mappings_resolve(state, check_user_mappings=check_user_mappings)
-
         if isinstance(command, ViOpenRegister):
             _log.debug('opening register...')
             state.must_capture_register_name = True
@@ -370,6 +391,7 @@ class _nv_feed_key(ViWindowCommandBase):
                 _log.info('user mapping %s -> %s', command.sequence, new_keys)
 
                 if ':' in new_keys:
+                    state.cancel_repeat_steps()
                     do_ex_user_cmdline(self.window, new_keys)
                     _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
 
@@ -406,6 +428,15 @@ class _nv_feed_key(ViWindowCommandBase):
                 command = mappings_resolve(state, sequence=bare_seq)
 
             if isinstance(command, ViMissingCommandDef):
+                if is_command_prefix(state.mode, to_bare_command_name(state.partial_sequence)):
+                    # Keep collecting input to complete the sequence. For
+                    # example, we may have typed the start of a longer plugin
+                    # sequence that has no namespace command.
+                    _log.info('found command prefix')
+                    _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
+
+                    return
+
                 _log.debug('unmapped sequence %s', state.sequence)
                 state.mode = NORMAL
                 state.reset_command_data()
@@ -440,7 +471,8 @@ class _nv_feed_key(ViWindowCommandBase):
 
         if do_eval:
             _log.info('evaluating state...')
-            state.eval()
+            with profiler_timer(command.__class__.__name__, PHASE_EVAL):
+                state.eval()
 
         _log.debug('key evt took {:.4f}s'.format(time.time() - start_time))
 
@@ -468,6 +500,17 @@ class _nv_process_notation(ViWindowCommandBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def _feed_key(self, key, **kwargs):
+        # The keys are fed to the key processing in-process, rather than
+        # through Sublime Text with one _nv_feed_key command per key. Only the
+        # motions and actions the keys resolve to are run as commands.
+        _nv_feed_key(self.window).run(key, **kwargs)
+
+    def _insert(self, characters):
+        if characters:
+            self.window.run_command('insert', {'characters': characters})
+            self.state.add_repeat_step('insert', {'characters': characters})
+
     def run(self, keys, repeat_count=None, check_user_mappings=True):
         # Args:
         #   keys (str): Key sequence to be run.
@@ -490,12 +533,7 @@ class _nv_process_notation(ViWindowCommandBase):
         # undo history, but store the full sequence for '.' to use.
         leading_motions = ''
         for key in KeySequenceTokenizer(keys).iter_tokenize():
-            self.window.run_command('_nv_feed_key', {
-                'key': key,
-                'do_eval': False,
-                'repeat_count': repeat_count,
-                'check_user_mappings': check_user_mappings
-            })
+            self._feed_key(key, do_eval=False, repeat_count=repeat_count, check_user_mappings=check_user_mappings)
             if state.action:
                 # The last key press has caused an action to be primed. That
                 # means there are no more leading motions. Break out of here.
@@ -519,11 +557,16 @@ class _nv_process_notation(ViWindowCommandBase):
         if state.must_collect_input:
             # State is requesting more input, so this is the last command in
             # the sequence and it needs more input.
+            state.cancel_repeat_steps()
             self.collect_input()
             return
 
         # Strip the already run commands
         if leading_motions:
+            # The leading motions are kept out of the undo history, so a
+            # repeat can't run them together with the rest of the commands.
+            state.cancel_repeat_steps()
+
             if ((len(leading_motions) == len(keys)) and (not state.must_collect_input)):
                 state.non_interactive = False
                 return
@@ -535,22 +578,33 @@ class _nv_process_notation(ViWindowCommandBase):
         if not (state.motion and not state.action):
             with gluing_undo_groups(self.window.active_view(), state):
                 try:
+                    # Consecutive characters typed in insert mode are inserted
+                    # together, rather than one insert command per character.
+                    characters = ''
                     for key in KeySequenceTokenizer(keys).iter_tokenize():
                         if key.lower() == key_names.ESC:
+                            self._insert(characters)
+                            characters = ''
                             # XXX: We should pass a mode here?
                             self.window.run_command('_enter_normal_mode')
+                            state.add_repeat_step('_enter_normal_mode', {})
                             continue
 
-                        elif state.mode not in (INSERT, REPLACE):
-                            self.window.run_command('_nv_feed_key', {
-                                'key': key,
-                                'repeat_count': repeat_count,
-                                'check_user_mappings': check_user_mappings
-                            })
+                        elif not characters and state.mode not in (INSERT, REPLACE):
+                            self._feed_key(key, repeat_count=repeat_count, check_user_mappings=check_user_mappings)
                         else:
-                            self.window.run_command('insert', {
-                                'characters': translate_char(key)
-                            })
+                            character = translate_char(key)
+                            if character in ('\n', '\t'):
+                                # Newlines and tabs are inserted on their own
+                                # so that they're indented and expanded as if
+                                # they were typed.
+                                self._insert(characters)
+                                self._insert(character)
+                                characters = ''
+                            else:
+                                characters += character
+
+                    self._insert(characters)
 
                     if not state.must_collect_input:
                         return
@@ -568,6 +622,8 @@ class _nv_process_notation(ViWindowCommandBase):
 
         _log.debug('unsatisfied parser action = %s, motion=%s', state.action, state.motion)
 
+        state.cancel_repeat_steps()
+
         if (state.action and state.motion):
             # We have a parser an a motion that can collect data. Collect data
             # interactively.
@@ -630,6 +686,12 @@ class _nv_ex_cmd_edit_wrap(TextCommand):
         do_ex_cmd_edit_wrap(self, edit, **kwargs)
 
 
+class _nv_ex_substitute_confirm_replace(TextCommand):
+
+    def run(self, edit, index, all=False):
+        do_ex_substitute_confirm_replace(self.view, edit, index, all)
+
+
 class _nv_cmdline(WindowCommand):
 
     interactive_call = True
@@ -877,6 +939,19 @@ class NeovintageousToggleSideBarCommand(WindowCommand):
             self.window.focus_group(self.window.active_group())
 
 
+class NvProfileCommand(WindowCommand):
+
+    # Show the key processing timings recorded by the profiler in a scratch
+    # view. Run from the cmdline as :NvProfile.
+
+    def run(self):
+        view = self.window.new_file()
+        view.set_scratch(True)
+        view.set_name('NeoVintageous Profile')
+        view.run_command('append', {'characters': profiler_report()})
+        view.set_read_only(True)
+
+
 # DEPRECATED Use _nv_run_cmds instead
 class SequenceCommand(TextCommand):
 
@@ -34,6 +34,7 @@ from NeoVintageous.nv.vi.core import ViTextCommandBase
 from NeoVintageous.nv.vi.core import ViWindowCommandBase
 from NeoVintageous.nv.vi.registers import REG_EXPRESSION
 from NeoVintageous.nv.vi.utils import first_sel
+from NeoVintageous.nv.vi.utils import gluing_undo_groups
 from NeoVintageous.nv.vi.utils import IrreversibleTextCommand
 from NeoVintageous.nv.vi.utils import is_view
 from NeoVintageous.nv.vi.utils import regions_transformer
@@ -609,8 +610,7 @@ class _enter_normal_mode_impl(ViTextCommandBase):
             self.view.sel().clear()
             self.view.sel().add(Region(sel.b))
 
-        self.view.erase_regions('vi_search')
-        self.view.erase_regions('vi_search_current')
+        search.clear_hilite(self.view)
         self.view.run_command('_nv_fix_st_eol_caret', {'mode': mode})
 
 
@@ -774,6 +774,14 @@ class _enter_replace_mode(ViTextCommandBase):
 
 # https://vimhelp.appspot.com/repeat.txt.html#%2e
 class _vi_dot(ViWindowCommandBase):
+
+    # The commands run by the last command repeated, and the key of the repeat:
+    # the keys of the command, the mode the command was run in, the mode and
+    # the count of the repeat. The next repeat of the command runs the commands
+    # again, rather than processing the keys of the command. Commands with a
+    # motion that uses the last search are not kept, see ViMotionDef.
+    _compiled = (None, None)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -804,7 +812,14 @@ class _vi_dot(ViWindowCommandBase):
             return ui_blink()
 
         if type_ == 'vi':
-            self.window.run_command('_nv_process_notation', {'keys': seq_or_cmd, 'repeat_count': count})
+            if visual_data or State.repeat_steps is not None:
+                # Repeats of visual mode commands, and repeats run while
+                # collecting the commands of another repeat, always process
+                # the keys of the command.
+                state.cancel_repeat_steps()
+                self.window.run_command('_nv_process_notation', {'keys': seq_or_cmd, 'repeat_count': count})
+            else:
+                self._repeat(seq_or_cmd, (seq_or_cmd, old_mode, mode, count), count)
         elif type_ == 'native':
             sels = list(self.window.active_view().sel())
             # FIXME: We're not repeating as we should. It's the motion that
@@ -821,6 +836,39 @@ class _vi_dot(ViWindowCommandBase):
         state.repeat_data = repeat_data
         state.update_xpos()
 
+    def _repeat(self, keys, key, count):
+        compiled_key, steps = _vi_dot._compiled
+        if compiled_key == key:
+            return self._run_steps(steps)
+
+        State.repeat_steps = []
+        try:
+            self.window.run_command('_nv_process_notation', {'keys': keys, 'repeat_count': count})
+            steps = State.repeat_steps
+        finally:
+            State.repeat_steps = None
+
+        _vi_dot._compiled = (key, steps) if steps else (None, None)
+
+    def _run_steps(self, steps):
+        state = self.state
+        state.non_interactive = True
+        try:
+            with gluing_undo_groups(self.window.active_view(), state):
+                for cmd, args in steps:
+                    args = dict(args)
+                    if 'xpos' in args:
+                        state.update_xpos(force=True)
+                        args['xpos'] = state.xpos
+                    elif args.get('motion') and 'xpos' in args['motion']['motion_args']:
+                        state.update_xpos(force=True)
+                        args['motion'] = dict(args['motion'], motion_args=dict(args['motion']['motion_args']))
+                        args['motion']['motion_args']['xpos'] = state.xpos
+
+                    self.window.run_command(cmd, args)
+        finally:
+            state.non_interactive = False
+
 
 # https://vimhelp.appspot.com/change.txt.html#dd
 class _vi_dd(ViTextCommandBase):
@@ -2521,7 +2569,6 @@ class _vi_at(IrreversibleTextCommand):
         # TODO [refactor] State.macro_steps
         # TODO [refactor] State.macro_registers
 
-        # TODO Do we need to glue all these edits?
         cmds = State.macro_steps
         if name != '@':
             try:
@@ -2533,21 +2580,26 @@ class _vi_at(IrreversibleTextCommand):
             except ValueError as e:
                 return console_message('error: %s' % e)
 
+        # The steps of all the runs of the macro are run as one undo step, with
+        # the state of the view reused by all the steps.
         state = State(self.view)
-
-        for i in range(count):
-            for cmd, args in cmds:
-                # TODO Is this robust enough?
-                if 'xpos' in args:
-                    state.update_xpos(force=True)
-                    args['xpos'] = State(self.view).xpos
-                elif args.get('motion') and 'xpos' in args.get('motion'):
-                    state.update_xpos(force=True)
-                    motion = args.get('motion')
-                    motion['motion_args']['xpos'] = State(self.view).xpos
-                    args['motion'] = motion
-
-                self.view.run_command(cmd, args)
+        state.non_interactive = True
+        try:
+            with gluing_undo_groups(self.view, state):
+                for i in range(count):
+                    for cmd, args in cmds:
+                        args = dict(args or {})
+                        if 'xpos' in args:
+                            state.update_xpos(force=True)
+                            args['xpos'] = state.xpos
+                        elif args.get('motion') and 'xpos' in args['motion']['motion_args']:
+                            state.update_xpos(force=True)
+                            args['motion'] = dict(args['motion'], motion_args=dict(args['motion']['motion_args']))
+                            args['motion']['motion_args']['xpos'] = state.xpos
+
+                        self.view.run_command(cmd, args)
+        finally:
+            state.non_interactive = False
 
 
 class _enter_visual_block_mode(ViTextCommandBase):
@@ -36,19 +36,20 @@ from NeoVintageous.nv.ui import ui_cmdline_prompt
 from NeoVintageous.nv.vi import cmd_defs
 from NeoVintageous.nv.vi import units
 from NeoVintageous.nv.vi import utils
+from NeoVintageous.nv.vi.brackets import find_bracket_partner
 from NeoVintageous.nv.vi.cmd_defs import ViSearchBackwardImpl
 from NeoVintageous.nv.vi.cmd_defs import ViSearchForwardImpl
 from NeoVintageous.nv.vi.core import ViMotionCommand
 from NeoVintageous.nv.vi.search import BufferSearchBase
 from NeoVintageous.nv.vi.search import ExactWordBufferSearchBase
+from NeoVintageous.nv.vi.search import cancel_incsearch
 from NeoVintageous.nv.vi.search import find_in_range
-from NeoVintageous.nv.vi.search import find_wrapping
-from NeoVintageous.nv.vi.search import reverse_find_wrapping
-from NeoVintageous.nv.vi.search import reverse_search_by_pt
-from NeoVintageous.nv.vi.text_objects import find_containing_tag
+from NeoVintageous.nv.vi.search import find_next_match
+from NeoVintageous.nv.vi.search import find_previous_match
+from NeoVintageous.nv.vi.search import incsearch
+from NeoVintageous.nv.vi.tags import find_containing_element
 from NeoVintageous.nv.vi.text_objects import find_next_lone_bracket
 from NeoVintageous.nv.vi.text_objects import find_prev_lone_bracket
-from NeoVintageous.nv.vi.text_objects import get_closest_tag
 from NeoVintageous.nv.vi.text_objects import get_text_object_region
 from NeoVintageous.nv.vi.text_objects import word_end_reverse
 from NeoVintageous.nv.vi.text_objects import word_reverse
@@ -267,6 +268,7 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
 
         state = self.state
         state.sequence += s + '<CR>'
+        cancel_incsearch(self.view)
         self.view.erase_regions('vi_inc_search')
         state.last_buffer_search_command = 'vi_slash'
         state.motion = cmd_defs.ViSearchForwardImpl(term=s)
@@ -287,17 +289,12 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
 
         s = s[1:]
 
-        state = self.state
-        flags = self.calculate_flags()
+        incsearch(self.view, s, self.calculate_flags(), True, self.state.count, self._on_incsearch_done)
+
+    def _on_incsearch_done(self, next_hit):
         self.view.erase_regions('vi_inc_search')
-        next_hit = find_wrapping(self.view,
-                                 term=s,
-                                 start=self.view.sel()[0].b + 1,
-                                 end=self.view.size(),
-                                 flags=flags,
-                                 times=state.count)
         if next_hit:
-            if state.mode == VISUAL:
+            if self.state.mode == VISUAL:
                 next_hit = Region(self.view.sel()[0].a, next_hit.a + 1)
 
             # The scopes are prefixed with common color scopes so that color
@@ -319,6 +316,7 @@ class _vi_slash(ViMotionCommand, BufferSearchBase):
 
     def on_cancel(self):
         state = self.state
+        cancel_incsearch(self.view)
         self.view.erase_regions('vi_inc_search')
         state.reset_command_data()
         _nv_cmdline_feed_key.reset_last_history_index()
@@ -351,17 +349,17 @@ class _vi_slash_impl(ViMotionCommand, BufferSearchBase):
         # We want to start searching right after the current selection.
         current_sel = self.view.sel()[0]
         start = current_sel.b if not current_sel.empty() else current_sel.b + 1
-        wrapped_end = self.view.size()
 
         # TODO: What should we do here? Case-sensitive or case-insensitive search? Configurable?
         # Search wrapping around the end of the buffer.
         flags = self.calculate_flags()
-        match = find_wrapping(self.view, search_string, start, wrapped_end, flags=flags, times=count)
+        match = find_next_match(self.view, search_string, start, flags=flags, times=count)
         if not match:
             return
 
         regions_transformer(self.view, f)
         self.hilite(search_string)
+        self.show_match_count(search_string)
 
 
 class _vi_slash_on_parser_done(WindowCommand):
@@ -1082,14 +1080,13 @@ class _vi_percent(ViMotionCommand):
         if any([self.view.substr(pt) in p for p in self.pairs]):
             return None
 
-        _, closest_tag = get_closest_tag(self.view, pt)
-        if not closest_tag:
-            return None
+        begin_tag, end_tag, _ = find_containing_element(self.view, pt)
+        if begin_tag:
+            if begin_tag.a <= pt < begin_tag.b:
+                return end_tag
 
-        if closest_tag.contains(pt):
-            begin_tag, end_tag, _ = find_containing_tag(self.view, pt)
-            if begin_tag:
-                return begin_tag if end_tag.contains(pt) else end_tag
+            if end_tag.a <= pt < end_tag.b:
+                return begin_tag
 
         return None
 
@@ -1233,78 +1230,21 @@ class _vi_percent(ViMotionCommand):
         return (found_brackets[1], (bracket_a, bracket_b),
                 self.view.text_point(caret_row, caret_col + found_brackets[0]))
 
-    def find_balanced_closing_bracket(self, start, brackets, unbalanced=0):
+    def find_balanced_closing_bracket(self, start, brackets):
+        # Args:
+        #   start (int): The point after the opening bracket.
+        #
         # Returns:
-        #   Region|None
-        new_start = start
-        for i in range(unbalanced or 1):
-            next_closing_bracket = find_in_range(
-                self.view,
-                brackets[1],
-                start=new_start,
-                end=self.view.size(),
-                flags=LITERAL
-            )
-
-            if next_closing_bracket is None:  # Unbalanced brackets; nothing we can do.
-                return
-
-            new_start = next_closing_bracket.end()
-
-        nested = 0
-        while True:
-            next_opening_bracket = find_in_range(
-                self.view,
-                brackets[0],
-                start=start,
-                end=next_closing_bracket.end(),
-                flags=LITERAL
-            )
-
-            if not next_opening_bracket:
-                break
-
-            nested += 1
-            start = next_opening_bracket.end()
+        #   int|None
+        return find_bracket_partner(self.view, start - 1, brackets, escape=False)
 
-        if nested > 0:
-            return self.find_balanced_closing_bracket(
-                next_closing_bracket.end(),
-                brackets,
-                nested
-            )
-        else:
-            return next_closing_bracket.begin()
-
-    def find_balanced_opening_bracket(self, start, brackets, unbalanced=0):
-        new_start = start
-        for i in range(unbalanced or 1):
-            prev_opening_bracket = reverse_search_by_pt(self.view, brackets[0],
-                                                        start=0,
-                                                        end=new_start,
-                                                        flags=LITERAL)
-            if prev_opening_bracket is None:
-                # Unbalanced brackets; nothing we can do.
-                return
-            new_start = prev_opening_bracket.begin()
-
-        nested = 0
-        while True:
-            next_closing_bracket = reverse_search_by_pt(self.view, brackets[1],
-                                                        start=prev_opening_bracket.a,
-                                                        end=start,
-                                                        flags=LITERAL)
-            if not next_closing_bracket:
-                break
-            nested += 1
-            start = next_closing_bracket.begin()
-
-        if nested > 0:
-            return self.find_balanced_opening_bracket(prev_opening_bracket.begin(),
-                                                      brackets,
-                                                      nested)
-        else:
-            return prev_opening_bracket.begin()
+    def find_balanced_opening_bracket(self, start, brackets):
+        # Args:
+        #   start (int): The point of the closing bracket.
+        #
+        # Returns:
+        #   int|None
+        return find_bracket_partner(self.view, start, brackets, escape=False)
 
 
 class _vi_big_h(ViMotionCommand):
@@ -1397,20 +1337,7 @@ class _vi_star(ViMotionCommand, ExactWordBufferSearchBase):
             pattern = self.build_pattern(query)
             flags = self.calculate_flags()
 
-            if mode == INTERNAL_NORMAL:
-                match = find_wrapping(view,
-                                      term=pattern,
-                                      start=view.word(s.end()).end(),
-                                      end=view.size(),
-                                      flags=flags,
-                                      times=1)
-            else:
-                match = find_wrapping(view,
-                                      term=pattern,
-                                      start=view.word(s.end()).end(),
-                                      end=view.size(),
-                                      flags=flags,
-                                      times=1)
+            match = find_next_match(view, pattern, view.word(s.end()).end(), flags=flags)
 
             if match:
                 if mode == INTERNAL_NORMAL:
@@ -1435,6 +1362,7 @@ class _vi_star(ViMotionCommand, ExactWordBufferSearchBase):
 
         if query:
             self.hilite(query)
+            self.show_match_count(query)
             # Ensure n and N can repeat this search later.
             state.last_buffer_search = query
 
@@ -1450,20 +1378,7 @@ class _vi_octothorp(ViMotionCommand, ExactWordBufferSearchBase):
             pattern = self.build_pattern(query)
             flags = self.calculate_flags()
 
-            if mode == INTERNAL_NORMAL:
-                match = reverse_find_wrapping(view,
-                                              term=pattern,
-                                              start=0,
-                                              end=start_sel.a,
-                                              flags=flags,
-                                              times=1)
-            else:
-                match = reverse_find_wrapping(view,
-                                              term=pattern,
-                                              start=0,
-                                              end=start_sel.a,
-                                              flags=flags,
-                                              times=1)
+            match = find_previous_match(view, pattern, start_sel.a, flags=flags)
 
             if match:
                 if mode == INTERNAL_NORMAL:
@@ -1490,6 +1405,7 @@ class _vi_octothorp(ViMotionCommand, ExactWordBufferSearchBase):
 
         if query:
             self.hilite(query)
+            self.show_match_count(query)
             # Ensure n and N can repeat this search later.
             state.last_buffer_search = query
 
@@ -1928,18 +1844,14 @@ class _vi_question_mark_impl(ViMotionCommand, BufferSearchBase):
 
         flags = self.calculate_flags()
         # FIXME: What should we do here? Case-sensitive or case-insensitive search? Configurable?
-        found = reverse_find_wrapping(self.view,
-                                      term=search_string,
-                                      start=0,
-                                      end=self.view.sel()[0].b,
-                                      flags=flags,
-                                      times=count)
+        found = find_previous_match(self.view, search_string, self.view.sel()[0].b, flags=flags, times=count)
 
         if not found:
             return console_message('Pattern not found')
 
         regions_transformer(self.view, f)
         self.hilite(search_string)
+        self.show_match_count(search_string)
 
 
 class _vi_question_mark(ViMotionCommand, BufferSearchBase):
@@ -1969,6 +1881,7 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
 
         state = self.state
         state.sequence += s + '<CR>'
+        cancel_incsearch(self.view)
         self.view.erase_regions('vi_inc_search')
         state.last_buffer_search_command = 'vi_question_mark'
         state.motion = cmd_defs.ViSearchBackwardImpl(term=s)
@@ -1989,17 +1902,12 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
 
         s = s[1:]
 
-        flags = self.calculate_flags()
+        incsearch(self.view, s, self.calculate_flags(), False, self.state.count, self._on_incsearch_done)
+
+    def _on_incsearch_done(self, occurrence):
         self.view.erase_regions('vi_inc_search')
-        state = self.state
-        occurrence = reverse_find_wrapping(self.view,
-                                           term=s,
-                                           start=0,
-                                           end=self.view.sel()[0].b,
-                                           flags=flags,
-                                           times=state.count)
         if occurrence:
-            if state.mode == VISUAL:
+            if self.state.mode == VISUAL:
                 occurrence = Region(self.view.sel()[0].a, occurrence.a)
 
             # The scopes are prefixed with common color scopes so that color
@@ -2020,6 +1928,7 @@ class _vi_question_mark(ViMotionCommand, BufferSearchBase):
         self.view.window().run_command('hide_panel', {'cancel': True})
 
     def on_cancel(self):
+        cancel_incsearch(self.view)
         self.view.erase_regions('vi_inc_search')
         state = self.state
         state.reset_command_data()
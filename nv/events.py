@@ -24,7 +24,11 @@ from NeoVintageous.nv.ex.completions import wants_setting_completions
 from NeoVintageous.nv.modeline import do_modeline
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vi import brackets
+from NeoVintageous.nv.vi import marks
+from NeoVintageous.nv.vi import search
 from NeoVintageous.nv.vi import settings
+from NeoVintageous.nv.vi import tags
 from NeoVintageous.nv.vi.utils import is_view
 from NeoVintageous.nv.vim import NORMAL
 from NeoVintageous.nv.vim import VISUAL
@@ -219,8 +223,16 @@ class NeoVintageousEvents(EventListener):
         # concern when 'trim_trailing_white_space_on_save' is set to true.
         view.run_command('_nv_fix_st_eol_caret', {'mode': State(view).mode})
 
+    def on_pre_close(self, view):
+        # The marks are dropped before the view is closed, while the positions
+        # of the file marks can still be read from the view.
+        marks.destroy(view)
+
     def on_close(self, view):
         settings.destroy(view)
+        brackets.destroy(view)
+        search.destroy(view)
+        tags.destroy(view)
 
     def on_activated(self, view):
 
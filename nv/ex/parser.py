@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from functools import lru_cache
 import logging
 
 from NeoVintageous.nv.ex.nodes import CommandLineNode
@@ -54,6 +55,10 @@ class _ParserState:
         return next(self.tokens)
 
 
+# The results are cached, because the same command lines are parsed over and
+# over again e.g. by mappings. The command lines returned are shared, so they
+# MUST not be modified.
+@lru_cache(maxsize=128)
 def parse_command_line(source):
     # type: (str) -> CommandLineNode
 
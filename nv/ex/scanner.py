@@ -31,6 +31,39 @@ from NeoVintageous.nv.ex.tokens import TokenSemicolon
 from NeoVintageous.nv.ex_routes import ex_routes
 
 
+# The compiled patterns, keyed by pattern. The routes match the same few
+# patterns over and over again.
+_patterns = {}  # type: dict
+
+
+def _compile(pattern):
+    try:
+        return _patterns[pattern]
+    except KeyError:
+        compiled = _patterns[pattern] = re.compile(pattern)
+
+        return compiled
+
+
+# The ex routes compiled into a single pattern: an alternation of the route
+# patterns, in order, each in a group named after its index, so that the
+# first route that matches is found in one step. The tuple is the number of
+# routes compiled, the pattern, and the commands of the routes.
+_routes = (0, None, ())  # type: tuple
+
+
+def _get_routes():
+    # type: () -> tuple
+    global _routes
+
+    # The routes are compiled again if routes have been added.
+    if _routes[0] != len(ex_routes):
+        pattern = '|'.join('(?P<r{}>{})'.format(i, route) for i, route in enumerate(ex_routes))
+        _routes = (len(ex_routes), re.compile(pattern), tuple(ex_routes.values()))
+
+    return _routes
+
+
 class _ScannerState:
 
     EOF = '__EOF__'
@@ -138,7 +171,7 @@ class _ScannerState:
         # Raises:
         #   ValueError: If item does not match.
         #   on_error (callable): If item does not match.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = _compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -160,7 +193,7 @@ class _ScannerState:
         #
         # Args:
         #     pattern (str): A regular expression.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = _compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -334,11 +367,20 @@ def _scan_command(state):
     #
     # Returns:
     #   Tuple[None, list(TokenEof)]
-    for route, command in ex_routes.items():
-        if state.match(route):
-            state.ignore()
+    _, pattern, commands = _get_routes()
+    m = pattern.match(state.source, state.position)
+    if m:
+        state.position = m.end()
+        state.ignore()
+
+        result = commands[int(m.lastgroup[1:])](state)
+
+        # A route that matched only the start of a longer name, for example
+        # "no" (:noremap) in "nosuchcmd", leaves the rest of the name behind.
+        if result[0] is None and state.source[state.position:state.position + 1].isalpha():
+            raise Exception("E492: Not an editor command")
 
-            return command(state)
+        return result
 
     state.expect_eof(lambda: Exception("E492: Not an editor command"))
 
@@ -15,22 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import namedtuple
 from functools import wraps
 import inspect
+import itertools
 import logging
 import os
 import re
 import stat
 import subprocess
-import sys
 
 from sublime import ENCODED_POSITION
 from sublime import find_resources
 from sublime import FORCE_GROUP
+from sublime import HIDDEN
 from sublime import LITERAL
 from sublime import load_resource
 from sublime import MONOSPACE_FONT
-from sublime import ok_cancel_dialog
 from sublime import platform
 from sublime import Region
 from sublime import set_timeout
@@ -47,10 +48,8 @@ from NeoVintageous.nv.state import State
 from NeoVintageous.nv.ui import ui_blink
 from NeoVintageous.nv.vi import abbrev
 from NeoVintageous.nv.vi import utils
-from NeoVintageous.nv.vi.search import find_all_in_range
 from NeoVintageous.nv.vi.settings import set_global
 from NeoVintageous.nv.vi.settings import set_local
-from NeoVintageous.nv.vi.utils import adding_regions
 from NeoVintageous.nv.vi.utils import first_sel
 from NeoVintageous.nv.vi.utils import has_dirty_buffers
 from NeoVintageous.nv.vi.utils import resolve_insertion_point_at_b
@@ -140,6 +139,36 @@ def _serialize_deserialize(f, *args, **kwargs):
     return inner
 
 
+# Ranges are read this many characters at a time (rounded up to whole lines),
+# so memory is bounded by what's done with the lines, not the size of the
+# range.
+_LINES_CHUNK_SIZE = 65536
+
+
+def _iter_lines(view, region):
+    # Generate the lines in the region, without their newlines.
+    #
+    # Yields:
+    #   tuple[int, str]: The start point and the text of the line.
+    start = region.begin()
+    end = region.end()
+    while start < end:
+        chunk_end = min(end, start + _LINES_CHUNK_SIZE)
+        if chunk_end < end:
+            chunk_end = min(end, view.full_line(chunk_end - 1).end())
+
+        lines = view.substr(Region(start, chunk_end)).split('\n')
+        if lines[-1] == '':
+            lines.pop()
+
+        pt = start
+        for line in lines:
+            yield pt, line
+            pt += len(line) + 1
+
+        start = chunk_end
+
+
 # TODO [review] Looks broken or not implemented properly
 def ex_abbreviate(window, short=None, full=None, **kwargs):
     if short is None and full is None:
@@ -332,10 +361,15 @@ def ex_cquit(window, **kwargs):
 
 
 @_serialize_deserialize
-def ex_delete(view, edit, register, line_range, **kwargs):
-    r = line_range.resolve(view)
-    if r == Region(-1, -1):
-        r = view.full_line(0)
+def ex_delete(view, edit, register, line_range, global_lines=None, **kwargs):
+    if global_lines:
+        regions = [Region(a, b) for a, b in global_lines]
+    else:
+        r = line_range.resolve(view)
+        if r == Region(-1, -1):
+            r = view.full_line(0)
+
+        regions = [r]
 
     def _select(view, regions, register):
         view.sel().clear()
@@ -353,9 +387,21 @@ def ex_delete(view, edit, register, line_range, **kwargs):
             state = State(view)
             state.registers[register] = [text]
 
-    _select(view, [r], register)
-    view.erase(edit, r)
-    _set_next_sel(view, [(r.a, r.a)])
+    # Like :global deleting the lines one at a time, the register is left with
+    # the last line deleted.
+    _select(view, regions[-1:], register)
+
+    pt = regions[-1].b - sum(r.size() for r in regions)
+
+    # Adjacent lines are erased together.
+    end = regions[-1].b
+    for i in range(len(regions) - 1, -1, -1):
+        if i == 0 or regions[i - 1].b != regions[i].a:
+            view.erase(edit, Region(regions[i].a, end))
+            if i > 0:
+                end = regions[i - 1].b
+
+    _set_next_sel(view, [(pt, pt)])
 
 
 def ex_double_ampersand(view, edit, flags, count, line_range, **kwargs):
@@ -466,11 +512,23 @@ def ex_file(view, **kwargs):
 
 _ex_global_most_recent_pat = None
 
+# The line-oriented commands that :global can execute. Other commands, e.g.
+# mappings and settings, don't apply to lines.
+_EX_GLOBAL_COMMANDS = ('copy', 'delete', 'double_ampersand', 'move', 'print', 'substitute', 'yank')
+
 
-# At the time of writing, the only command that supports :global is the
-# "print" command e.g. print all lines matching \d+ into new buffer:
-#   :%global/\d+/print
-def ex_global(window, view, pattern, cmd, line_range, **kwargs):
+# Execute a command on each line of the range that matches the pattern, or if
+# forced (:global! and :vglobal), that doesn't match e.g. delete all blank
+# lines:
+#   :global/^$/delete
+#
+# The matching lines are marked first, then the command is executed for each
+# marked line that still exists, with the cursor on the line. The lines are
+# marked with tracked regions, so that they stay in sync with the edits made
+# by the commands. Commands that cooperate with :global (see TokenCommand) and
+# have no range of their own are instead executed once, with the lines as a
+# global_lines argument, which they process in one pass.
+def ex_global(window, view, edit, pattern, cmd, line_range, forceit=False, **kwargs):
     if line_range.is_empty:
         global_range = Region(0, view.size())
     else:
@@ -481,32 +539,73 @@ def ex_global(window, view, pattern, cmd, line_range, **kwargs):
         _ex_global_most_recent_pat = pattern
     else:
         pattern = _ex_global_most_recent_pat
+        if not pattern:
+            return message('E35: No previous regular expression')
 
     if not cmd:
         cmd = 'print'
 
-    cmd = parse_command_line(cmd).command
-
     try:
-        matches = find_all_in_range(view, pattern, global_range.begin(), global_range.end())
+        compiled_pattern = re.compile(pattern, flags=re.MULTILINE)
     except Exception as e:
         return message("(global): %s ... in pattern '%s'" % (str(e), pattern))
 
-    # The cooperates_with_global attribute indicates if the command supports
-    # the :global command. This is special flag, because all ex commands
-    # don't yet support a global_lines argument. See TokenOfCommand. At time
-    # of writing, the only command that supports the global_lines argument
-    # is the "print" command e.g. print all lines matching \d+ into new
-    # buffer: ":%global/\d+/print".
-    if not matches or not cmd.cooperates_with_global:
-        return message("command does not support :global")
+    try:
+        cmdline = parse_command_line(cmd)
+    except Exception as e:
+        return message(str(e))
+
+    if not cmdline.command:
+        return message('E492: Not an editor command: {}'.format(cmd))
+
+    if cmdline.command.target not in _EX_GLOBAL_COMMANDS:
+        return message('command does not support :global')
+
+    size = view.size()
+    lines = [[pt, min(pt + len(line) + 1, size)] for pt, line in _iter_lines(view, global_range)
+             if bool(compiled_pattern.search(line)) != forceit]
+
+    if not lines:
+        if forceit:
+            return message('Pattern found in every line: {}'.format(pattern))
 
-    matches = [view.full_line(r.begin()) for r in matches]
-    matches = [[r.a, r.b] for r in matches]
+        return message('Pattern not found: {}'.format(pattern))
 
-    cmd.params['global_lines'] = matches
+    command = cmdline.command
+    ex_cmd = _get_ex_cmd(command.target)
 
-    do_ex_command(window, cmd.target, cmd.params)
+    def _execute(line_range, **kwargs):
+        args = dict(command.params)
+        if 'forceit' not in args:
+            args['forceit'] = command.forced
+
+        args.update(kwargs)
+        if ex_cmd.needs_edit:
+            args['edit'] = edit
+
+        ex_cmd.function(window=window, view=view, line_range=line_range, **args)
+
+    if command.cooperates_with_global and cmdline.line_range.is_empty:
+        return _execute(RangeNode(), global_lines=lines)
+
+    view.add_regions('vi_global_lines', [Region(a, b) for a, b in lines], flags=HIDDEN)
+    try:
+        marks = view.get_regions('vi_global_lines')
+        change_count = view.change_count()
+        for i in range(len(marks)):
+            # The lines deleted by the commands are empty.
+            if marks[i].empty():
+                continue
+
+            view.sel().clear()
+            view.sel().add(marks[i].begin())
+            _execute(cmdline.line_range)
+
+            if view.change_count() != change_count:
+                marks = view.get_regions('vi_global_lines')
+                change_count = view.change_count()
+    finally:
+        view.erase_regions('vi_global_lines')
 
 
 _ex_help_tags_cache = {}
@@ -988,8 +1087,32 @@ def ex_split(window, file=None, **kwargs):
 _ex_substitute_last_pattern = None
 _ex_substitute_last_replacement = ''
 
+# The substitutes waiting for confirmation (:s///c), keyed by view id. Each
+# entry is a list [texts, index, last_row], where texts are the replacements of
+# the matches, index is the match being confirmed, and last_row is the row of
+# the last replacement.
+_ex_substitute_confirming = {}  # type: dict
+
 
-def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0, count=1, **kwargs):
+def _ex_substitute_changes(view, region, compiled_pattern, replacement, count):
+    # Generate the replacements of a substitute over the lines in the region.
+    #
+    # Yields:
+    #   tuple[Region, str]: The matched region and its replacement, in buffer
+    #       order. Matches that are replaced with the same text are skipped.
+    for pt, line in _iter_lines(view, region):
+        replaced = 0
+        for match in compiled_pattern.finditer(line):
+            text = match.expand(replacement)
+            if text != match.group(0):
+                yield Region(pt + match.start(), pt + match.end()), text
+
+            replaced += 1
+            if replaced == count:
+                break
+
+
+def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0, count=1, global_lines=None, **kwargs):
     global _ex_substitute_last_pattern, _ex_substitute_last_replacement
 
     # Repeat last substitute with same search
@@ -1019,82 +1142,147 @@ def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0,
     except Exception as e:
         return message('[regex error]: {} ... in pattern {}'.format((str(e), pattern)))
 
-    target_region = line_range.resolve(view)
-    if target_region.empty():
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    if global_lines:
+        target_regions = [Region(a, b) for a, b in global_lines]
+    else:
+        target_regions = [line_range.resolve(view)]
+        if target_regions[0].empty():
+            return status_message('E486: Pattern not found: {}'.format(pattern))
 
     replace_count = 0 if (flags and 'g' in flags) else 1
 
+    changes = []
+    for target_region in target_regions:
+        changes.extend(_ex_substitute_changes(view, target_region, compiled_pattern, replacement, replace_count))
+
+    if not changes:
+        return status_message('E486: Pattern not found: {}'.format(pattern))
+
     if 'c' in flags:
+        return _ex_substitute_confirm(view, replacement, changes)
 
-        def _replace_confirming(view, edit, pattern, compiled_pattern,
-                                replacement, replace_count, target_region):
+    # The cursor is put on the last line of the range. Replacements can add
+    # lines (but can't remove any, patterns are matched per line).
+    last_row = row_at(view, target_region.end() - 1) + sum(text.count('\n') for region, text in changes)
 
-            last_row = row_at(view, target_region.b - 1)
-            start = target_region.begin()
+    # Apply the replacements back-to-front so that the regions of the pending
+    # replacements stay valid.
+    for region, text in reversed(changes):
+        view.replace(edit, region, text)
 
-            while True:
-                if start >= view.size():
-                    break
+    _ex_substitute_set_cursor(view, last_row)
 
-                match = view.find(pattern, start)
+    # TODO [review] enter normal mode dependency
+    view.run_command('_enter_normal_mode')
 
-                # no match or match out of range -- stop
-                if (match == Region(-1)) or (row_at(view, match.a) > last_row):
-                    view.show(first_sel(view).begin())
-                    return
 
-                size_before = view.size()
+def _ex_substitute_set_cursor(view, row):
+    # TODO Refactor set position cursor after operation into reusable api.
+    # Put cursor on first non-whitespace char of the line.
+    line = view.line(view.text_point(row, 0))
+    pt = line.begin()
+    if line.size() > 0:
+        pt = view.find('^\\s*', line.begin()).end()
 
-                with adding_regions(view, 's_confirm', [match], 'comment'):
-                    view.show(match.a, True)
-                    if ok_cancel_dialog("Confirm replacement?"):
-                        text = view.substr(match)
-                        substituted = re.sub(compiled_pattern, replacement, text, count=replace_count)
-                        view.replace(edit, match, substituted)
+    view.sel().clear()
+    view.sel().add(pt)
 
-                start = match.b + (view.size() - size_before) + 1
 
-        return _replace_confirming(view, edit, pattern, compiled_pattern, replacement, replace_count, target_region)
+def _ex_substitute_confirm(view, replacement, changes):
+    # The matches are tracked as regions, so Sublime Text keeps them in sync
+    # with the replacements as they are confirmed.
+    view.add_regions('s_confirm_matches', [region for region, text in changes], flags=HIDDEN)
+    _ex_substitute_confirming[view.id()] = [[text for region, text in changes], 0, None]
 
-    lines = view.lines(target_region)
-    if not lines:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    # The replacements are made by separate commands, so they are glued into
+    # one undo group when the confirmation is finished.
+    view.run_command('mark_undo_groups_for_gluing')
+    _ex_substitute_confirm_show(view)
 
-    new_lines = []
-    dirty = False
-    for line in lines:
-        line_str = view.substr(line)
-        new_line_str = re.sub(compiled_pattern, replacement, line_str, count=replace_count)
-        new_lines.append(new_line_str)
-        if new_line_str != line_str:
-            dirty = True
+    window = view.window()
 
-    new_region_text = '\n'.join(new_lines)
-    if view.size() > line.end():
-        new_region_text += '\n'
+    def on_change(s):
+        if s and not do_ex_substitute_confirm(view, s[-1]):
+            window.run_command('hide_panel', {'cancel': True})
 
-    if not dirty:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    def on_done(s):
+        do_ex_substitute_confirm(view, 'q')
 
-    # Reposition cursor before replacing target region so that the cursor
-    # will auto adjust in sync with the replacement.
-    view.sel().clear()
-    view.sel().add(line.begin())
+    window.show_input_panel('replace with {} (y/n/a/q/l)?'.format(replacement), '', on_done, on_change, on_done)
 
-    view.replace(edit, target_region, new_region_text)
 
-    # TODO Refactor set position cursor after operation into reusable api.
-    # Put cursor on first non-whitespace char of current line.
-    line = view.line(view.sel()[0].b)
-    if line.size() > 0:
-        pt = view.find('^\\s*', line.begin()).end()
-        view.sel().clear()
-        view.sel().add(pt)
+def _ex_substitute_confirm_show(view):
+    texts, index, last_row = _ex_substitute_confirming[view.id()]
+    match = view.get_regions('s_confirm_matches')[index]
+    view.add_regions('s_confirm', [match], 'comment')
+    view.show(match.a, True)
+
+
+def do_ex_substitute_confirm(view, key):
+    # type: (...) -> bool
+    # Answer the confirmation of the current match of a :s///c.
+    #
+    # Args:
+    #   key (str): "y" to substitute the match, "n" to skip it, "a" to
+    #       substitute it and all remaining matches, "q" to quit, and "l" to
+    #       substitute it and then quit.
+    #
+    # Returns:
+    #   bool: True if there are matches left to confirm.
+    try:
+        texts, index, last_row = _ex_substitute_confirming[view.id()]
+    except KeyError:
+        return False
+
+    if key in ('y', 'l', 'a'):
+        # The edit token of the ex command has expired by now.
+        view.run_command('_nv_ex_substitute_confirm_replace', {'index': index, 'all': key == 'a'})
+        last_row = _ex_substitute_confirming[view.id()][2]
+
+    if key in ('y', 'n'):
+        index += 1
+    elif key in ('a', 'l', 'q'):
+        index = len(texts)
+    else:
+        return True
+
+    if index < len(texts):
+        _ex_substitute_confirming[view.id()][1] = index
+        _ex_substitute_confirm_show(view)
+
+        return True
+
+    del _ex_substitute_confirming[view.id()]
+    view.erase_regions('s_confirm')
+    view.erase_regions('s_confirm_matches')
+
+    if last_row is not None:
+        _ex_substitute_set_cursor(view, last_row)
+
+    view.run_command('glue_marked_undo_groups')
 
     # TODO [review] enter normal mode dependency
     view.run_command('_enter_normal_mode')
 
+    return False
+
+
+def do_ex_substitute_confirm_replace(view, edit, index, all=False):
+    # Replace the match at the index of a :s///c, or if all is true, all
+    # matches from the index.
+    confirming = _ex_substitute_confirming[view.id()]
+    texts = confirming[0]
+    matches = view.get_regions('s_confirm_matches')
+    if len(matches) != len(texts):
+        # The buffer was edited in a way that merged matches.
+        return
+
+    end = len(texts) if all else index + 1
+    for i in range(end - 1, index - 1, -1):
+        view.replace(edit, matches[i], texts[i])
+
+    confirming[2] = row_at(view, view.get_regions('s_confirm_matches')[end - 1].b)
+
 
 def ex_sunmap(keys, **kwargs):
     try:
@@ -1460,8 +1648,38 @@ def _default_ex_cmd(window, view, line_range, **kwargs):
     view.show(view.sel()[0])
 
 
+# The ex commands, keyed by name. The ex commands are the functions in this
+# module prefixed with "ex_", and the name is the function name without the
+# prefix. The registry is built once, at the end of this module, so that
+# dispatching a command doesn't need to inspect its signature.
+#
+# Attributes:
+#   :function (callable):
+#   :needs_edit (bool): The command needs an edit token, so it has to be run
+#       by the _nv_ex_cmd_edit_wrap text command.
+_ex_cmd_def = namedtuple('ex_cmd_def', 'function needs_edit')
+_ex_cmds = {}  # type: dict
+
+
+def _new_ex_cmd_def(function):
+    return _ex_cmd_def(function=function, needs_edit='edit' in inspect.signature(function).parameters)
+
+
+def _build_ex_cmds():
+    # type: () -> dict
+    return {name[3:]: _new_ex_cmd_def(function) for name, function in globals().items()
+            if name.startswith('ex_') and inspect.isfunction(function)}
+
+
 def _get_ex_cmd(name):
-    ex_cmd = getattr(sys.modules[__name__], 'ex_' + name, None)
+    # type: (str) -> _ex_cmd_def
+    ex_cmd = globals().get('ex_' + name)
+    ex_cmd_def = _ex_cmds.get(name)
+    if ex_cmd_def is not None and ex_cmd_def.function is ex_cmd:
+        return ex_cmd_def
+
+    # The command is not registered, or it has been replaced since the
+    # registry was built.
 
     if not ex_cmd:
         raise RuntimeError("unknown ex cmd '{}'".format(name))
@@ -1470,7 +1688,15 @@ def _get_ex_cmd(name):
     if not inspect.isfunction(ex_cmd):
         raise RuntimeError("unknown ex cmd type '{}'".format(name))
 
-    return ex_cmd
+    ex_cmd_def = _ex_cmds[name] = _new_ex_cmd_def(ex_cmd)
+
+    return ex_cmd_def
+
+
+# The parsed command lines handed off by do_ex_cmdline() to the command
+# **_nv_ex_cmd_edit_wrap**, keyed by id.
+_ex_cmdline_handoffs = {}  # type: dict
+_ex_cmdline_handoff_ids = itertools.count()
 
 
 # This function is used by the command **_nv_ex_cmd_edit_wrap**. The
@@ -1481,11 +1707,11 @@ def _get_ex_cmd(name):
 #
 # Arguments belonging to this function are underscored to avoid collisions with
 # the ex command args in kwargs.
-def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, **kwargs):
-    _log.debug('do ex cmd edit wrap _name=%s _line=%s kwargs=%s', _name, _line, kwargs)
+def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, _id=None, **kwargs):
+    _log.debug('do ex cmd edit wrap _name=%s _line=%s _id=%s kwargs=%s', _name, _line, _id, kwargs)
 
     if _name:
-        ex_cmd = _get_ex_cmd(_name)
+        ex_cmd = _get_ex_cmd(_name).function
         args = kwargs
 
         window = self.view.window()
@@ -1501,10 +1727,16 @@ def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, **kwargs):
         ex_cmd(view=self.view, edit=edit, line_range=RangeNode(), **args)
 
     elif _line:
-        cmdline = parse_command_line(_line[1:])
-        ex_cmd = _get_ex_cmd(cmdline.command.target)
+        # The command line is normally handed off already parsed (see
+        # do_ex_cmdline), but the command can also be run again later e.g. by
+        # the Sublime Text repeat command.
+        cmdline = _ex_cmdline_handoffs.pop(_id, None) if _id else None
+        if cmdline is None:
+            cmdline = parse_command_line(_line[1:])
+
+        ex_cmd = _get_ex_cmd(cmdline.command.target).function
 
-        args = cmdline.command.params
+        args = dict(cmdline.command.params)
         if 'forceit' not in args:
             args['forceit'] = cmdline.command.forced
 
@@ -1560,7 +1792,7 @@ def do_ex_command(window, name, args=None):
 
     ex_cmd = _get_ex_cmd(name)
 
-    if 'edit' in inspect.signature(ex_cmd).parameters:
+    if ex_cmd.needs_edit:
         args['_name'] = name
 
         return window.run_command('_nv_ex_cmd_edit_wrap', args)
@@ -1577,7 +1809,7 @@ def do_ex_command(window, name, args=None):
 
     # TODO [review] Ex commands could probably make the line_range optional.
 
-    ex_cmd(window=window, line_range=RangeNode(), **args)
+    ex_cmd.function(window=window, line_range=RangeNode(), **args)
 
 
 def _parse_user_cmdline(line):
@@ -1691,11 +1923,18 @@ def do_ex_cmdline(window, line):
 
     ex_cmd = _get_ex_cmd(cmdline.command.target)
 
-    # TODO [review] Objects like the RangeNode() can't be passed through Sublime Text  commands, command args only accept simple data types, which is why we send the line which will be parsed again by the wrapper command. Ideally we wouldn't need to parse the line again.  # noqa: E501
-    if 'edit' in inspect.signature(ex_cmd).parameters:
-        return window.run_command('_nv_ex_cmd_edit_wrap', {'_line': line})
+    # Objects like the RangeNode() can't be passed through Sublime Text
+    # commands, command args only accept simple data types, so the parsed
+    # command line is handed off to the wrapper command by id.
+    if ex_cmd.needs_edit:
+        handoff_id = str(next(_ex_cmdline_handoff_ids))
+        _ex_cmdline_handoffs[handoff_id] = cmdline
+        try:
+            return window.run_command('_nv_ex_cmd_edit_wrap', {'_line': line, '_id': handoff_id})
+        finally:
+            _ex_cmdline_handoffs.pop(handoff_id, None)
 
-    args = cmdline.command.params
+    args = dict(cmdline.command.params)
 
     view = window.active_view()
     if view:
@@ -1703,7 +1942,7 @@ def do_ex_cmdline(window, line):
 
     _log.debug('execute ex command: %s %s', cmdline.command.target, args)
 
-    ex_cmd(window=window, line_range=cmdline.line_range, forceit=cmdline.command.forced, **args)
+    ex_cmd.function(window=window, line_range=cmdline.line_range, forceit=cmdline.command.forced, **args)
 
 
 # TODO [refactor] Into do_ex_cmdline() with a param to indicate user cmdline? e.g do_ex_cmdline(window, line, interactive=True).  # noqa: E501
@@ -1738,3 +1977,6 @@ def do_ex_user_cmdline(window, line):
             raise RuntimeError('user cmdline must begin with a colon')
 
         return window.run_command('_nv_cmdline', args={'initial_text': line})
+
+
+_ex_cmds.update(_build_ex_cmds())
@@ -203,6 +203,7 @@ def _ex_route_cquit(state):
 def _ex_route_delete(state):
     command = TokenCommand('delete')
     command.addressable = True
+    command.cooperates_with_global = True
 
     params = {'register': '"', 'count': None}
 
@@ -458,6 +459,14 @@ def _ex_route_global(state):
     return None, [command, TokenEof()]
 
 
+def _ex_route_vglobal(state):
+    # :vglobal is :global!
+    _, tokens = _ex_route_global(state)
+    tokens[0].forced = True
+
+    return None, tokens
+
+
 def _ex_route_help(state):
     command = TokenCommand('help')
     match = state.expect_match(r'(?P<bang>!)?\s*(?P<subject>.+)?$').groupdict()
@@ -864,6 +873,7 @@ def _ex_route_split(state):
 def _ex_route_substitute(state):
     command = TokenCommand('substitute')
     command.addressable = True
+    command.cooperates_with_global = True
 
     delim = state.consume()
 
@@ -1324,13 +1334,14 @@ ex_routes[r'f(?:ile)?'] = _ex_route_file
 ex_routes[r'g(?:lobal)?(?=[^ ])'] = _ex_route_global
 ex_routes[r'h(?:elp)?'] = _ex_route_help
 ex_routes[r'vs(?:plit)?'] = _ex_route_vsplit
+ex_routes[r'v(?:g(?:l(?:o(?:b(?:al?)?)?)?)?)?(?=[^ a-zA-Z0-9])'] = _ex_route_vglobal
 ex_routes[r'x(?:it)?$'] = _ex_route_exit
 ex_routes[r'^cd(?=[^d]|$)'] = _ex_route_cd
 ex_routes[r'^cdd'] = _ex_route_cdd
 ex_routes[r'e(?:dit)?(?= |$)?'] = _ex_route_edit
 ex_routes[r'let\s'] = _ex_route_let
 ex_routes[r'm(?:ove)?(?=[^a]|$)'] = _ex_route_move
-ex_routes[r'no(?:remap)?'] = _ex_route_noremap
+ex_routes[r'no(?:r(?:e(?:m(?:ap?)?)?)?)?(?![a-zA-Z])'] = _ex_route_noremap
 ex_routes[r'new'] = _ex_route_new
 ex_routes[r'nn(?:oremap)?'] = _ex_route_nnoremap
 ex_routes[r'nun(?:map)?'] = _ex_route_nunmap
@@ -16,6 +16,19 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections import deque
+
+import sublime
+
+
+_log = logging.getLogger(__name__)
+
+
 # TODO Implement 'history' option so that the number of history entries
 # remembered can be configured.
 _MAX_ITEMS = 10000
@@ -49,28 +62,199 @@ _NAME2TYPE = {
 }
 
 
-_storage = {
-    _HIST_CMD: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_SEARCH: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_EXPR: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_INPUT: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_DEBUG: {
-        'num': 0,
-        'items': {}
-    }
-}
+# The history file is appended to as items are added and deleted, and is
+# compacted, by rewriting it with just the items in the histories, once it
+# holds this many times more entries than there are items, give or take a
+# hundred entries so that a small file isn't rewritten over and over again.
+_COMPACT_RATIO = 2
+
+
+class _History:
+
+    # A history of unique items, numbered in the order they were added.
+    #
+    # Attributes:
+    #   :num (int): The number of the most recently added item.
+    #   :items (OrderedDict): The items by number, oldest first.
+
+    def __init__(self):
+        # type: () -> None
+        self.num = 0
+        self.items = OrderedDict()  # type: OrderedDict
+        # The numbers by item, for finding an item that is added again.
+        self._numbers = {}  # type: dict
+        # The numbers, oldest first, for indexing from the newest item. None
+        # when an item has been deleted from the middle of the history.
+        self._keys = deque()  # type: deque
+
+    def add(self, item, num=None):
+        # type: (str, int) -> None
+        if item in self._numbers:
+            self.delete(self._numbers[item])
+
+        self.num = self.num + 1 if num is None else num
+        self.items[self.num] = item
+        self._numbers[item] = self.num
+        if self._keys is not None:
+            self._keys.append(self.num)
+
+    def delete(self, num):
+        # type: (int) -> None
+        # Raises:
+        #   KeyError: If there is no item with the number.
+        del self._numbers[self.items.pop(num)]
+        if self._keys is not None:
+            if self._keys[-1] == num:
+                self._keys.pop()
+            elif self._keys[0] == num:
+                self._keys.popleft()
+            else:
+                self._keys = None
+
+    def number(self, index):
+        # type: (int) -> int
+        # A positive int is the number of an item, and a negative int is an
+        # index from the newest item.
+        #
+        # Raises:
+        #   KeyError: If there is no item with the number.
+        #   IndexError: If there is no item at the index.
+        if index >= 0:
+            if index not in self.items:
+                raise KeyError(index)
+
+            return index
+
+        if self._keys is None:
+            self._keys = deque(self.items)
+
+        return self._keys[index]
+
+
+def _new_storage():
+    # type: () -> dict
+    return {history_type: _History() for history_type in _NAME2TYPE.values()}
+
+
+# The histories by type, loaded from the history file on first use.
+_storage = None  # type: dict
+
+# The history file entries not yet written, the number of entries in the
+# history file, and whether the file is to be rewritten with the pending
+# entries, rather than have them appended to it.
+_pending = []  # type: list
+_file_entries = 0
+_file_rewrite = False
+_file_lock = threading.Lock()
+
+
+def _file_name():
+    # type: () -> str
+    return os.path.join(sublime.cache_path(), 'NeoVintageous', 'history')
+
+
+def _apply(storage, entry):
+    # type: (dict, list) -> None
+    # A history file entry is [type, number, item] for an added item,
+    # [type, number] for a deleted item, and [type] for a cleared history.
+    if len(entry) == 3:
+        storage[entry[0]].add(entry[2], entry[1])
+    elif len(entry) == 2:
+        storage[entry[0]].delete(entry[1])
+    else:
+        storage[entry[0]] = _History()
+
+
+def _load():
+    # type: () -> dict
+    global _file_entries
+
+    storage = _new_storage()
+    entries = 0
+
+    try:
+        with open(_file_name(), encoding='utf-8') as f:
+            for line in f:
+                entries += 1
+                try:
+                    _apply(storage, json.loads(line))
+                except (ValueError, KeyError, IndexError, TypeError):
+                    # A truncated write or an entry that no longer applies.
+                    pass
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log.exception('failed to load history')
+
+    for history in storage.values():
+        while len(history.items) > _MAX_ITEMS:
+            history.delete(next(iter(history.items)))
+
+    _file_entries = entries
+
+    return storage
+
+
+def _get_storage():
+    # type: () -> dict
+    global _storage
+
+    # Loaded on first use, rather than at startup.
+    if _storage is None:
+        _storage = _load()
+
+    return _storage
+
+
+def _save(entry):
+    # type: (list) -> None
+    global _pending, _file_entries, _file_rewrite
+
+    with _file_lock:
+        schedule = not _pending
+        _file_entries += 1
+        if _file_entries > _COMPACT_RATIO * (sum(len(h.items) for h in _storage.values()) + 1) + 100:
+            _pending = [
+                [history_type, num, item]
+                for history_type, history in sorted(_storage.items())
+                for num, item in history.items.items()
+            ]
+            _file_entries = len(_pending)
+            _file_rewrite = True
+        else:
+            _pending.append(entry)
+
+    if schedule:
+        sublime.set_timeout_async(_flush, 0)
+
+
+def _flush():
+    # type: () -> None
+    global _pending, _file_rewrite
+
+    with _file_lock:
+        pending, rewrite = _pending, _file_rewrite
+        _pending, _file_rewrite = [], False
+
+    if not pending:
+        return
+
+    file_name = _file_name()
+    lines = ''.join(json.dumps(entry) + '\n' for entry in pending)
+
+    try:
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        if rewrite:
+            # The history file is replaced in one step so that it is never
+            # left half written.
+            with open(file_name + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(lines)
+            os.replace(file_name + '.tmp', file_name)
+        else:
+            with open(file_name, 'a', encoding='utf-8') as f:
+                f.write(lines)
+    except Exception:
+        _log.exception('failed to save history')
 
 
 def _char2type(char):
@@ -143,24 +327,25 @@ def history_add(history, item):
         return 0
 
     history_type = history_get_type(history)
+    history = _get_storage()[history_type]
 
-    pending_deletes = [k for k, v in _storage[history_type]['items'].items() if v == item]
-    for pending_delete in pending_deletes:
-        del _storage[history_type]['items'][pending_delete]
+    history.add(item)
+    _save([history_type, history.num, item])
 
-    _storage[history_type]['num'] += 1
-    _storage[history_type]['items'][_storage[history_type]['num']] = item
-
-    if len(_storage[history_type]['items']) > _MAX_ITEMS:
-        del _storage[history_type]['items'][min(_storage[history_type]['items'].keys())]
+    if len(history.items) > _MAX_ITEMS:
+        num = next(iter(history.items))
+        history.delete(num)
+        _save([history_type, num])
 
     return 1
 
 
 def history_clear():
     # type: () -> None
-    for key in _storage:
-        _storage[key] = {'num': 0, 'items': {}}
+    storage = _get_storage()
+    for key in storage:
+        storage[key] = _History()
+        _save([key])
 
 
 def history_del(history, item=None):
@@ -183,21 +368,19 @@ def history_del(history, item=None):
     if history_type == _HIST_INVALID:
         return 0
 
+    storage = _get_storage()
+
     if item is None:
-        _storage[history_type]['num'] = 0
-        _storage[history_type]['items'] = {}
+        storage[history_type] = _History()
+        _save([history_type])
         ret = 1
     else:
         if isinstance(item, int):
             try:
-                if item >= 0:
-                    del _storage[history_type]['items'][item]
-                    ret = 1
-                else:
-                    keys = sorted(_storage[history_type]['items'].keys())
-                    key_index = keys[item]
-                    del _storage[history_type]['items'][key_index]
-                    ret = 1
+                num = storage[history_type].number(item)
+                storage[history_type].delete(num)
+                _save([history_type, num])
+                ret = 1
             except (KeyError, IndexError):
                 ret = 0
         else:
@@ -226,14 +409,8 @@ def history_get(history, index=-1):
         return ''
 
     try:
-        # A positive int represents the absolute index of an entry.
-        if index >= 0:
-            ret = _storage[history_type]['items'][index]
-        else:
-            keys = sorted(_storage[history_type]['items'].keys())
-            key_index = keys[index]
-            ret = _storage[history_type]['items'][key_index]
-
+        history = _get_storage()[history_type]
+        ret = history.items[history.number(index)]
     except Exception:
         ret = ''
 
@@ -242,7 +419,7 @@ def history_get(history, index=-1):
 
 def history_len(history):
     # type: (str) -> int
-    return len(_storage[history_get_type(history)]['items'])
+    return len(_get_storage()[history_get_type(history)].items)
 
 
 def history_nr(history):
@@ -259,13 +436,10 @@ def history_nr(history):
     if history_type == _HIST_INVALID:
         return -1
 
-    items = _storage[history_type]['items'].keys()
-    if len(items) > 0:
-        num = max(items)
-    else:
-        num = -1
-
-    return num
+    try:
+        return _get_storage()[history_type].number(-1)
+    except IndexError:
+        return -1
 
 
 # TODO :history
@@ -302,12 +476,12 @@ def _history(history):
 
     for history_type in history_types:
         name = type2name[history_type]
-        contents = _storage[history_type]['items']
+        contents = _get_storage()[history_type].items
         count = len(contents)
 
         # TODO initial padding should be size of max history width
         buf.append('%6s  %s history' % ('#', name))
-        for i, number in enumerate(sorted(contents, reverse=False), start=1):
+        for i, number in enumerate(contents, start=1):
             if i == count:
                 buf.append('>%5d  %s' % (number, contents[number]))
             else:
@@ -41,14 +41,144 @@ _STATUS_INCOMPLETE = 1
 _STATUS_COMPLETE = 2
 
 
+def _tokenize(seq):
+    # type: (str) -> list
+    # Tokenize a key sequence into a list of 2-tuples (key, end), where end is
+    # the index in seq after the key. Sequences that are not valid key
+    # notation, e.g. "<bar>", are tokenized per character.
+    tokens = []
+    tokenizer = KeySequenceTokenizer(seq)
+    try:
+        for key in tokenizer.iter_tokenize():
+            tokens.append((key, min(tokenizer.idx + 1, len(seq))))
+    except ValueError:
+        return [(c, i + 1) for i, c in enumerate(seq)]
+
+    return tokens
+
+
+class _MappingsTrie(dict):
+
+    # A dictionary of sequence => mapping that also indexes the sequences in a
+    # prefix tree of keys. Each node of the tree is a dict of key => node, and
+    # the sequence of any mapping that ends at a node is stored in the node
+    # under the None key. Nodes are pruned when mappings are removed, so a node
+    # exists only if at least one mapping ends at or below it.
+
+    def __init__(self):
+        super().__init__()
+        self._root = {}
+
+    def __setitem__(self, seq, value):
+        if seq in self:
+            self._remove_from_tree(seq)
+
+        super().__setitem__(seq, value)
+
+        node = self._root
+        for key, _ in _tokenize(seq):
+            node = node.setdefault(key, {})
+
+        node[None] = seq
+
+    def __delitem__(self, seq):
+        super().__delitem__(seq)
+        self._remove_from_tree(seq)
+
+    def clear(self):
+        super().clear()
+        self._root = {}
+
+    def _remove_from_tree(self, seq):
+        path = [self._root]
+        for key, _ in _tokenize(seq):
+            node = path[-1].get(key)
+            if node is None:
+                return
+
+            path.append(node)
+
+        path[-1].pop(None, None)
+
+        keys = [key for key, _ in _tokenize(seq)]
+        for i in range(len(keys), 0, -1):
+            if path[i]:
+                break
+
+            del path[i - 1][keys[i - 1]]
+
+    def _find_node(self, seq):
+        node = self._root
+        for key, _ in _tokenize(seq):
+            node = node.get(key)
+            if node is None:
+                return None
+
+        return node
+
+    def find_full(self, seq):
+        # type: (str) -> tuple
+        # Returns:
+        #   A 2-tuple (seq, mapping), (None, None) if not found.
+        node = self._find_node(seq) if seq else None
+        if node is not None and None in node:
+            return (node[None], self[node[None]])
+
+        return (None, None)
+
+    def find_first(self, seq):
+        # type: (str) -> tuple
+        # Returns:
+        #   A 2-tuple (end, mapping) if the first key of seq is mapped, where
+        #   end is the index in seq after the key, (None, None) if not found.
+        for key, end in _tokenize(seq):
+            node = self._root.get(key)
+            if node is not None and None in node:
+                return (end, self[node[None]])
+
+            break
+
+        return (None, None)
+
+    def is_prefix(self, seq):
+        # type: (str) -> bool
+        # Returns:
+        #   True if any mapped sequence starts with seq, False otherwise.
+        return bool(self._find_node(seq))
+
+    def is_incomplete(self, seq):
+        # type: (str) -> bool
+        # Returns:
+        #   True if seq is the start of mapped sequences, but isn't mapped
+        #   itself, False otherwise.
+        node = self._find_node(seq)
+
+        return bool(node) and None not in node
+
+    def iter_prefixed(self, seq):
+        # Yield all mapped sequences that start with seq.
+        node = self._find_node(seq)
+        if not node:
+            return
+
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is None:
+                    yield child
+                else:
+                    stack.append(child)
+
+
 _mappings = {
-    INSERT: {},
-    NORMAL: {},
-    OPERATOR_PENDING: {},
-    SELECT: {},
-    VISUAL_BLOCK: {},
-    VISUAL_LINE: {},
-    VISUAL: {}
+    INSERT: _MappingsTrie(),
+    NORMAL: _MappingsTrie(),
+    OPERATOR_PENDING: _MappingsTrie(),
+    SELECT: _MappingsTrie(),
+    VISUAL_BLOCK: _MappingsTrie(),
+    VISUAL_LINE: _MappingsTrie(),
+    VISUAL: _MappingsTrie()
 }
 
 
@@ -74,11 +204,9 @@ def _get_seqs(mode):
 
 
 def _find_partial_match(mode, seq):
-    return [x for x in _get_seqs(mode) if x.startswith(seq)]
+    return sorted(_mappings[mode].iter_prefixed(seq))
 
 
-# TODO [review] Should this really accept empty string i.e. if seq='' then this all sequences for the mode are returned? # noqa
-# TODO [review] Should this raise an IndexError error?
 def _find_full_match(mode, seq):
     # Args:
     #   mode (str):
@@ -86,20 +214,7 @@ def _find_full_match(mode, seq):
     #
     # Returns:
     #   A 2-tuple Tuple[str, str], Tuple[None, None] if not found.
-    #
-    # Raises:
-    #   IndexError: If has partial sequences found, but not a full match.
-
-    # TODO [refactor] There doesn't look there is a need to use partials.
-    partials = _find_partial_match(mode, seq)
-
-    try:
-
-        name = [x for x in partials if x == seq][0]
-
-        return (name, _mappings[mode][name])
-    except IndexError:
-        return (None, None)
+    return _mappings[mode].find_full(seq)
 
 
 def mappings_add(mode, new, target):
@@ -122,23 +237,7 @@ def mappings_remove(mode, new):
 def mappings_clear():
     # type: () -> None
     for mode in _mappings:
-        _mappings[mode] = {}
-
-
-# XXX: Provisional. Get rid of this as soon as possible.
-def _can_be_long_user_mapping(mode, key):
-    # Args:
-    #   mode (str):
-    #   seq (str):
-    #
-    # Returns:
-    #   2-tuple (True, str) or (False, True) if not _can_be_long_user_mapping.
-    full_match = _find_full_match(mode, key)
-    partial_matches = _find_partial_match(mode, key)
-    if partial_matches:
-        return (True, full_match[0])
-
-    return (False, True)
+        _mappings[mode].clear()
 
 
 def _expand_first(mode, seq):
@@ -148,33 +247,24 @@ def _expand_first(mode, seq):
     #
     # Returns:
     #   Mapping or None if no mapping for mode and seq found.
-    head = ''
-
     keys, mapped_to = _find_full_match(mode, seq)
     if keys:
         return Mapping(seq, mapped_to['name'], seq[len(keys):], _STATUS_COMPLETE)
 
-    for key in KeySequenceTokenizer(seq).iter_tokenize():
-        head += key
-        keys, mapped_to = _find_full_match(mode, head)
-        if keys:
-            return Mapping(head, mapped_to['name'], seq[len(head):], _STATUS_COMPLETE)
-        else:
-            break
+    # Only the first key of the sequence is expanded, a longer mapped prefix
+    # of the sequence isn't, e.g. with "a" and "ab" mapped "abx" expands "a".
+    end, mapped_to = _mappings[mode].find_first(seq)
+    if mapped_to:
+        return Mapping(seq[:end], mapped_to['name'], seq[end:], _STATUS_COMPLETE)
 
-    if _find_partial_match(mode, seq):
+    if _mappings[mode].is_prefix(seq):
         return Mapping(seq, '', '', _STATUS_INCOMPLETE)
 
 
-# XXX: Provisional. Get rid of this as soon as possible.
 # e.g. we may have typed 'aa' and there's an 'aaa' mapping, so we need to keep collecting input.
 def mappings_is_incomplete(mode, partial_sequence):
     # type: (str, str) -> bool
-    (maybe_mapping, complete) = _can_be_long_user_mapping(mode, partial_sequence)
-    if maybe_mapping and not complete:
-        return True
-
-    return False
+    return _mappings[mode].is_incomplete(partial_sequence)
 
 
 def mappings_resolve(state, sequence=None, mode=None, check_user_mappings=True):
@@ -60,5 +60,11 @@ def register(seq, modes, *args, **kwargs):
         for mode in modes:
                 mappings[mode][seq] = cls(*args, **kwargs)
                 classes[cls.__name__] = cls
+
+        # The plugin commands are merged into the dispatch tables of the keys
+        # when they are built again.
+        from NeoVintageous.nv.vi import keys
+        keys.clear_dispatch_tables()
+
         return cls
     return inner
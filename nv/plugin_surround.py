@@ -34,8 +34,10 @@ from NeoVintageous.nv.plugin import register
 from NeoVintageous.nv.plugin import ViOperatorDef
 from NeoVintageous.nv.plugin import VISUAL
 from NeoVintageous.nv.plugin import VISUAL_BLOCK
+from NeoVintageous.nv.vi.brackets import find_enclosing_brackets
 from NeoVintageous.nv.vi.core import ViTextCommandBase
 from NeoVintageous.nv.vi.search import reverse_search
+from NeoVintageous.nv.vi.tags import find_containing_element
 from NeoVintageous.nv.vi.utils import translate_char
 
 
@@ -338,12 +340,7 @@ def _do_surround_cs(view, edit, target, replacement, mode=None):
                 new_close = '</' + new_close[1:]
 
             if open_ == 't':
-                open_, close_ = ('<[^>\\/]+>', '<\\/[^>]+>')
-                next_ = view.find(close_, s.b)
-                if next_:
-                    prev_ = reverse_search(view, open_, end=next_.begin(), start=0)
-                else:
-                    prev_ = None
+                prev_, next_, _ = find_containing_element(view, s.b)
             else:
                 next_ = view.find(close_, s.b, flags=LITERAL)
                 if next_:
@@ -424,23 +421,33 @@ def _do_surround_ds(view, edit, target, mode=None):
 
             # A t is a pair of HTML or XML tags.
             if target == 't':
-                # TODO test dst works when cursor position is inside tag begin <a|bc>x</abc> -> dst -> |x
-                # TODO test dst works when cursor position is inside tag end   <abc>x</a|bc> -> dst -> |x
-                t_region_end = view.find('<\\/.*?>', s.b)
-                t_region_begin = reverse_search(view, '<.*?>', start=0, end=s.b)
+                t_region_begin, t_region_end, _ = find_containing_element(view, s.b)
+                if not t_region_begin:
+                    return s
             else:
                 current = view.substr(s.begin())
                 # TODO test ds{char} works when cursor position is on target begin |"x" -> ds" -> |x
                 # TODO test ds{char} works when cursor position is on target end   "x|" -> ds" -> |x
 
-                if current == t_char_begin:
-                    t_region_begin = Region(s.begin(), s.begin() + 1)
+                if not search_current_line_only:
+                    # Punctuation marks are nested, so the innermost pair
+                    # that encloses the cursor is looked up in the bracket
+                    # index rather than searching for the nearest marks.
+                    pair = find_enclosing_brackets(view, s.begin(), (t_char_begin, t_char_end))
+                    if not pair:
+                        return s
+
+                    t_region_begin = Region(pair[0], pair[0] + 1)
+                    t_region_end = Region(pair[1], pair[1] + 1)
                 else:
-                    t_region_begin = _rfind(view, t_char_begin, start=0, end=s.begin(), flags=LITERAL)
+                    if current == t_char_begin:
+                        t_region_begin = Region(s.begin(), s.begin() + 1)
+                    else:
+                        t_region_begin = _rfind(view, t_char_begin, start=0, end=s.begin(), flags=LITERAL)
 
-                t_region_begin_rowcol = view.rowcol(t_region_begin.begin())
+                    t_region_end = _find(view, t_char_end, start=t_region_begin.end(), flags=LITERAL)
 
-                t_region_end = _find(view, t_char_end, start=t_region_begin.end(), flags=LITERAL)
+                t_region_begin_rowcol = view.rowcol(t_region_begin.begin())
                 t_region_end_rowcol = view.rowcol(t_region_end.end())
 
                 if search_current_line_only:
@@ -0,0 +1,156 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import defaultdict
+from collections import deque
+from contextlib import contextmanager
+import time
+
+
+# The maximum number of recent samples kept in the ring buffer.
+_MAX_SAMPLES = 10000
+
+# Histogram bucket upper bounds in seconds (the last bucket is unbounded).
+# Buckets double from 50us to ~3.3s, which is enough to separate cheap motions
+# from ones that scan the whole buffer.
+_BUCKETS = tuple(0.00005 * (2 ** i) for i in range(17))
+
+PHASE_KEY = 'key'
+PHASE_MAPPING = 'mapping'
+PHASE_EVAL = 'eval'
+PHASE_MOTION = 'motion'
+PHASE_ACTION = 'action'
+PHASE_MODE = 'mode'
+
+# Recent samples of (name, phase, seconds).
+_samples = deque(maxlen=_MAX_SAMPLES)
+
+# Histograms indexed by (name, phase) of counts per bucket.
+_histograms = defaultdict(lambda: [0] * (len(_BUCKETS) + 1))
+
+# Slowest recorded timing indexed by (name, phase).
+_max = defaultdict(float)
+
+
+def _bucket(seconds):
+    # type: (float) -> int
+    for i, bound in enumerate(_BUCKETS):
+        if seconds <= bound:
+            return i
+
+    return len(_BUCKETS)
+
+
+def profiler_record(name, phase, seconds):
+    # type: (str, str, float) -> None
+    _samples.append((name, phase, seconds))
+    _histograms[(name, phase)][_bucket(seconds)] += 1
+    if seconds > _max[(name, phase)]:
+        _max[(name, phase)] = seconds
+
+
+@contextmanager
+def profiler_timer(name, phase):
+    # Record the time it takes to run the body of the with statement.
+    #
+    # >>> with profiler_timer('_vi_w', PHASE_MOTION):
+    # ...     view.run_command('_vi_w', args)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler_record(name, phase, time.perf_counter() - start)
+
+
+def profiler_clear():
+    # type: () -> None
+    _samples.clear()
+    _histograms.clear()
+    _max.clear()
+
+
+def profiler_samples():
+    # type: () -> list
+    # Returns:
+    #   list: The recent samples of (name, phase, seconds), oldest first.
+    return list(_samples)
+
+
+def _percentile(histogram, percent):
+    # type: (list, int) -> float
+    # Returns:
+    #   float: The upper bound of the bucket the percentile falls in.
+    total = sum(histogram)
+    rank = total * percent / 100.0
+    count = 0
+    for i, bucket_count in enumerate(histogram):
+        count += bucket_count
+        if count >= rank and bucket_count:
+            return _BUCKETS[i] if i < len(_BUCKETS) else float('inf')
+
+    return 0.0
+
+
+def profiler_stats():
+    # type: () -> list
+    # Returns:
+    #   list: A list of tuples (name, phase, count, p50, p95, p99, max)
+    #       sorted by p95 in descending order. Percentiles are the upper
+    #       bound of the histogram bucket they fall in (capped at the max).
+    stats = []
+    for (name, phase), histogram in _histograms.items():
+        max_ = _max[(name, phase)]
+        stats.append((
+            name,
+            phase,
+            sum(histogram),
+            min(_percentile(histogram, 50), max_),
+            min(_percentile(histogram, 95), max_),
+            min(_percentile(histogram, 99), max_),
+            max_
+        ))
+
+    return sorted(stats, key=lambda x: (x[4], x[6]), reverse=True)
+
+
+def _format_seconds(seconds):
+    # type: (float) -> str
+    return '{:.2f}ms'.format(seconds * 1000)
+
+
+def profiler_report():
+    # type: () -> str
+    # Returns:
+    #   str: A plain text table of the profiler stats.
+    stats = profiler_stats()
+    if not stats:
+        return 'No timings recorded.\n'
+
+    header = ('command', 'phase', 'count', 'p50', 'p95', 'p99', 'max')
+    rows = [header]
+    for name, phase, count, p50, p95, p99, max_ in stats:
+        rows.append((name, phase, str(count)) + tuple(_format_seconds(x) for x in (p50, p95, p99, max_)))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+
+    lines = []
+    for row in rows:
+        lines.append('  '.join(
+            value.ljust(width) if i < 2 else value.rjust(width) for i, (value, width) in enumerate(zip(row, widths))
+        ).rstrip())
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,169 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# The registers, macros, and file marks that outlast a session, kept in a
+# state file much like the Vim viminfo file, or the Neovim ShaDa file. The
+# history is kept in a file of its own, see history.py.
+
+import json
+import logging
+import os
+
+import sublime
+
+
+_log = logging.getLogger(__name__)
+
+
+# Registers and macros larger than this many characters are not saved, so that
+# big yanks don't bloat the state file, like the Vim 's' viminfo item.
+_MAX_ITEM_SIZE = 10240
+
+# The state file is saved this many milliseconds after a change, so that many
+# changes are saved at once.
+_SAVE_DELAY = 5000
+
+_VERSION = 1
+
+
+# The state file is neither loaded nor saved while this is false, e.g. while
+# the tests run, so that they don't use the state file of the user.
+_enabled = True
+
+# The state file name, the state loaded from it on first use, and whether a
+# save is pending.
+_file_name = None  # type: str
+_data = None  # type: dict
+_save_pending = False
+
+
+def _get_file_name():
+    # type: () -> str
+    global _file_name
+
+    # The file name is kept because the API isn't available when saving on
+    # exit.
+    if _file_name is None:
+        _file_name = os.path.join(sublime.cache_path(), 'NeoVintageous', 'shada.json')
+
+    return _file_name
+
+
+def _load():
+    # type: () -> dict
+    try:
+        with open(_get_file_name(), encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get('version') == _VERSION:
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _log.exception('failed to load %s', _get_file_name())
+
+    return {}
+
+
+def shada_get(name):
+    # type: (str) -> dict
+    # Get a section of the state file, e.g. "registers", "macros", or "marks".
+    # The state file is loaded on first use, rather than at startup.
+    global _data
+
+    if not _enabled:
+        return {}
+
+    if _data is None:
+        _data = _load()
+
+    section = _data.get(name)
+    if not isinstance(section, dict):
+        return {}
+
+    return section
+
+
+def _is_small(value):
+    # type: (object) -> bool
+    return len(json.dumps(value)) <= _MAX_ITEM_SIZE
+
+
+def _collect():
+    # type: () -> dict
+    from NeoVintageous.nv.state import State
+    from NeoVintageous.nv.vi import marks
+    from NeoVintageous.nv.vi import registers
+
+    data = {'version': _VERSION}
+
+    data['registers'] = {
+        name: value for name, value in registers.get_register_data().items() if value and _is_small(value)
+    }
+
+    data['macros'] = {
+        name: steps for name, steps in State.macro_registers.items() if _is_small(steps)
+    }
+
+    data['marks'] = marks.get_file_marks()
+
+    return data
+
+
+def _write(data):
+    # type: (dict) -> None
+    file_name = _get_file_name()
+
+    try:
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        # The state file is replaced in one step so that it is never left half
+        # written.
+        with open(file_name + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(file_name + '.tmp', file_name)
+    except Exception:
+        _log.exception('failed to save %s', file_name)
+
+
+def _save():
+    # type: () -> None
+    global _save_pending
+
+    if _save_pending:
+        _save_pending = False
+        data = _collect()
+        sublime.set_timeout_async(lambda: _write(data), 0)
+
+
+def shada_save():
+    # type: () -> None
+    # Save the state file, soon. The state is collected on the main thread,
+    # and written from the async thread.
+    global _save_pending
+
+    if _enabled and not _save_pending:
+        _save_pending = True
+        sublime.set_timeout(_save, _SAVE_DELAY)
+
+
+def shada_flush():
+    # type: () -> None
+    # Save the state file now, if a save is pending e.g. on exit.
+    global _save_pending
+
+    if _save_pending:
+        _save_pending = False
+        _write(_collect())
@@ -16,6 +16,7 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 from collections import Counter
+import copy
 import logging
 import os
 
@@ -24,6 +25,9 @@ from sublime import Region
 
 from NeoVintageous.nv import plugin
 from NeoVintageous.nv import rc
+from NeoVintageous.nv.profiler import PHASE_ACTION
+from NeoVintageous.nv.profiler import PHASE_MOTION
+from NeoVintageous.nv.profiler import profiler_timer
 from NeoVintageous.nv.vi import cmd_defs
 from NeoVintageous.nv.vi import settings
 from NeoVintageous.nv.vi import utils
@@ -56,6 +60,25 @@ from NeoVintageous.nv.vim import VISUAL_LINE
 
 _log = logging.getLogger(__name__)
 
+# Motions of which a run in a macro is recorded as one step, with the count of
+# the step being the sum of the counts of the run e.g. "jjjj" is recorded "4j".
+_MACRO_COUNT_MOTIONS = frozenset((
+    '_vi_b',
+    '_vi_big_b',
+    '_vi_big_e',
+    '_vi_big_w',
+    '_vi_e',
+    '_vi_g_big_e',
+    '_vi_ge',
+    '_vi_h',
+    '_vi_j',
+    '_vi_k',
+    '_vi_l',
+    '_vi_left_brace',
+    '_vi_right_brace',
+    '_vi_w',
+))
+
 
 class State(object):
     """
@@ -77,6 +100,13 @@ class State(object):
     marks = Marks()
     macro_steps = []
 
+    # The commands run while a command is repeated with '.', collected so that
+    # the next repeat can run them again without processing the keys of the
+    # command, see _vi_dot. None when commands aren't being collected, and
+    # False when the commands can't be run again without processing the keys
+    # e.g. the keys collected input interactively.
+    repeat_steps = None
+
     def __init__(self, view):
         self.view = view
         # We use several types of settings:
@@ -747,7 +777,16 @@ class State(object):
                 return
 
             if self.runnable and not self.glue_until_normal_mode:
-                State.macro_steps.append((cmd_name, args))
+                State.macro_steps.append(_compact_macro_step(cmd_name, args))
+                _coalesce_macro_steps(State.macro_steps)
+
+    def add_repeat_step(self, cmd_name, args):
+        if isinstance(State.repeat_steps, list):
+            State.repeat_steps.append((cmd_name, copy.deepcopy(args)))
+
+    def cancel_repeat_steps(self):
+        if State.repeat_steps is not None:
+            State.repeat_steps = False
 
     def runnable(self):
         # type: () -> bool
@@ -787,6 +826,8 @@ class State(object):
         if self.action and self.motion:
             action_cmd = self.action.translate(self)
             motion_cmd = self.motion.translate(self)
+            if self.motion.uses_last_search:
+                self.cancel_repeat_steps()
 
             _log.debug('changing to INTERNAL_NORMAL...')
             self.mode = INTERNAL_NORMAL
@@ -813,9 +854,11 @@ class State(object):
                 active_window().run_command('mark_undo_groups_for_gluing')
 
             self.add_macro_step(action_cmd['action'], args)
+            self.add_repeat_step(action_cmd['action'], args)
 
             _log.info('window.run_command() %s %s', action_cmd['action'], args)
-            active_window().run_command(action_cmd['action'], args)
+            with profiler_timer(action_cmd['action'], PHASE_ACTION):
+                active_window().run_command(action_cmd['action'], args)
 
             if not self.non_interactive:
                 if self.action.repeatable:
@@ -828,13 +871,17 @@ class State(object):
 
         if self.motion:
             motion_cmd = self.motion.translate(self)
+            if self.motion.uses_last_search:
+                self.cancel_repeat_steps()
 
             self.add_macro_step(motion_cmd['motion'], motion_cmd['motion_args'])
+            self.add_repeat_step(motion_cmd['motion'], motion_cmd['motion_args'])
 
             # All motions are subclasses of ViTextCommandBase, so it's safe to
             # run the command via the current view.
             _log.info('view.run_command() %s', motion_cmd)
-            self.view.run_command(motion_cmd['motion'], motion_cmd['motion_args'])
+            with profiler_timer(motion_cmd['motion'], PHASE_MOTION):
+                self.view.run_command(motion_cmd['motion'], motion_cmd['motion_args'])
 
         if self.action:
             action_cmd = self.action.translate(self)
@@ -869,9 +916,11 @@ class State(object):
             action = self.action
 
             self.add_macro_step(action_cmd['action'], action_cmd['action_args'])
+            self.add_repeat_step(action_cmd['action'], action_cmd['action_args'])
 
             _log.info('window.run_command() %s', action_cmd)
-            active_window().run_command(action_cmd['action'], action_cmd['action_args'])
+            with profiler_timer(action_cmd['action'], PHASE_ACTION):
+                active_window().run_command(action_cmd['action'], action_cmd['action_args'])
 
             if not (self.processing_notation and self.glue_until_normal_mode):
                 if action.repeatable:
@@ -885,6 +934,75 @@ class State(object):
         self.reset_command_data()
 
 
+def _compact_macro_step(cmd_name, args):
+    # type: (str, dict) -> tuple
+    # The inserts of a glued sequence of commands, e.g. the text typed in
+    # insert mode, are recorded as one insert per run of inserts.
+    if cmd_name == 'sequence' and args and args.get('commands'):
+        commands = []
+        for command in args['commands']:
+            if commands and _is_insert_command(commands[-1]) and _is_insert_command(command):
+                commands[-1] = ['insert', {'characters': commands[-1][1]['characters'] + command[1]['characters']}]
+            else:
+                commands.append(command)
+
+        if len(commands) == 1:
+            return tuple(commands[0])
+
+        return (cmd_name, dict(args, commands=commands))
+
+    return (cmd_name, args)
+
+
+def _coalesce_macro_steps(steps):
+    # type: (list) -> None
+    # Merges the last step of a macro into the step before it: consecutive
+    # inserts into one insert, and consecutive runs of the same motion into
+    # one motion with the sum of their counts.
+    if len(steps) < 2:
+        return
+
+    prev_cmd, prev_args = steps[-2]
+    cmd, args = steps[-1]
+    if prev_cmd != cmd:
+        return
+
+    if _is_insert(cmd, args) and _is_insert(prev_cmd, prev_args):
+        steps[-2:] = [(cmd, {'characters': prev_args['characters'] + args['characters']})]
+    elif cmd in _MACRO_COUNT_MOTIONS and _is_count_motion_run(prev_args, args):
+        steps[-2:] = [(cmd, dict(prev_args, count=prev_args['count'] + args['count']))]
+
+
+def _is_insert(cmd_name, args):
+    # type: (str, dict) -> bool
+    # Newlines and tabs are left as inserts of their own, they can be changed
+    # by the auto indentation of the view when they are inserted.
+    if cmd_name != 'insert' or not args or list(args) != ['characters']:
+        return False
+
+    characters = args['characters']
+
+    return isinstance(characters, str) and '\n' not in characters and '\t' not in characters
+
+
+def _is_insert_command(command):
+    # type: (list) -> bool
+    return len(command) == 2 and _is_insert(*command)
+
+
+def _is_count_motion_run(prev_args, args):
+    # type: (dict, dict) -> bool
+    # The xpos of a motion is updated when a macro is run, so it doesn't need
+    # to match.
+    if not isinstance(prev_args.get('count'), int) or not isinstance(args.get('count'), int):
+        return False
+
+    ignored = ('count', 'xpos')
+
+    return {k: v for k, v in prev_args.items() if k not in ignored} == \
+        {k: v for k, v in args.items() if k not in ignored}
+
+
 def init_state(view, new_session=False):
     # type: (...) -> None
     # Initialise view state.
@@ -905,6 +1023,7 @@ def init_state(view, new_session=False):
                 view.settings().set('inverse_caret_state', False)
 
             view.settings().erase('vintage')
+            settings.destroy(view)
         except Exception:
             # TODO [review] Exception handling
             _log.debug('error initialising irregular view i.e. console, widget, panel, etc.')
@@ -0,0 +1,187 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left
+from bisect import bisect_right
+import re
+
+from sublime import Region
+
+
+# Per-view bracket indexes, keyed by view id.
+#
+# Each entry is a (change_count, indexes) tuple. The indexes are built lazily,
+# one per bracket pair, and are all thrown away as soon as the buffer changes.
+_cache = {}  # type: dict
+
+
+def destroy(view):
+    # type: (...) -> None
+    _cache.pop(view.id(), None)
+
+
+def _build(text, opening, closing, escape):
+    # type: (str, str, str, bool) -> tuple
+    # Build the index of a bracket pair in one linear pass over the text.
+    #
+    # Returns a tuple (opens, closes, parents, lone_closes, partners):
+    #
+    #   opens (list[int]): The offsets of the opening brackets, in order.
+    #   closes (list[int|None]): The offset of the partner of each opening
+    #       bracket in opens, or None if the opening bracket is unbalanced.
+    #   parents (list[int]): The index in opens of the bracket that encloses
+    #       each opening bracket in opens, or -1 if it's at the top level.
+    #   lone_closes (list[int]): The offsets of unbalanced closing brackets.
+    #   partners (dict[int, int]): Maps the offset of every balanced bracket
+    #       to the offset of its partner.
+    #
+    # If escape is true then brackets preceded by a backslash are ignored.
+    pattern = re.escape(opening) + '|' + re.escape(closing)
+    if escape:
+        pattern = r'(?<!\\)(?:' + pattern + ')'
+
+    opens = []
+    closes = []
+    parents = []
+    lone_closes = []
+    partners = {}
+    stack = []
+
+    for match in re.finditer(pattern, text):
+        pt = match.start()
+        if match.group() == opening:
+            parents.append(stack[-1] if stack else -1)
+            stack.append(len(opens))
+            opens.append(pt)
+            closes.append(None)
+        elif stack:
+            i = stack.pop()
+            closes[i] = pt
+            partners[opens[i]] = pt
+            partners[pt] = opens[i]
+        else:
+            lone_closes.append(pt)
+
+    return (opens, closes, parents, lone_closes, partners)
+
+
+def _get_index(view, opening, closing, escape):
+    # type: (...) -> tuple
+    change_count = view.change_count()
+
+    try:
+        cached_change_count, indexes = _cache[view.id()]
+    except KeyError:
+        cached_change_count, indexes = None, None
+
+    if cached_change_count != change_count:
+        indexes = {}
+        _cache[view.id()] = (change_count, indexes)
+
+    key = (opening, closing, escape)
+    try:
+        return indexes[key]
+    except KeyError:
+        index = indexes[key] = _build(view.substr(Region(0, view.size())), opening, closing, escape)
+
+        return index
+
+
+def find_bracket_partner(view, pt, brackets, escape=True):
+    # type: (...) -> int
+    # Returns:
+    #   int|None: The offset of the bracket that balances the bracket at pt,
+    #       or None if there is no bracket at pt or it's unbalanced.
+    return _get_index(view, brackets[0], brackets[1], escape)[4].get(pt)
+
+
+def _enclosing(index, pt, balanced):
+    # type: (tuple, int, bool) -> int
+    # Returns the index in opens of the innermost opening bracket that encloses
+    # pt, or -1. A bracket at pt encloses pt. Unbalanced opening brackets are
+    # skipped unless balanced is false.
+    opens, closes, parents = index[0], index[1], index[2]
+    i = bisect_right(opens, pt) - 1
+    while i >= 0:
+        close = closes[i]
+        if close is None:
+            if not balanced:
+                return i
+        elif close >= pt:
+            return i
+
+        i = parents[i]
+
+    return -1
+
+
+def find_enclosing_brackets(view, pt, brackets, count=1, escape=True):
+    # type: (...) -> tuple
+    # Args:
+    #   brackets (tuple[str, str]): The opening and closing bracket, e.g. ('(', ')').
+    #   count (int): Find the count'th enclosing pair, counting outwards.
+    #
+    # Returns:
+    #   tuple[int, int]|None: The offsets of the opening and closing brackets
+    #       of the innermost balanced pair that encloses pt. A pair encloses
+    #       the points of its own brackets.
+    index = _get_index(view, brackets[0], brackets[1], escape)
+    opens, closes, parents = index[0], index[1], index[2]
+    i = _enclosing(index, pt, balanced=True)
+    for x in range(count - 1):
+        if i < 0:
+            break
+
+        i = parents[i]
+        while i >= 0 and closes[i] is None:
+            i = parents[i]
+
+    if i < 0:
+        return None
+
+    return (opens[i], closes[i])
+
+
+def find_lone_opening_bracket(view, pt, brackets, escape=True):
+    # type: (...) -> int
+    # Returns:
+    #   int|None: The offset of the innermost opening bracket at or before pt
+    #       that is not closed before pt. It may be unbalanced.
+    index = _get_index(view, brackets[0], brackets[1], escape)
+    i = _enclosing(index, pt, balanced=False)
+    if i < 0:
+        return None
+
+    return index[0][i]
+
+
+def find_lone_closing_bracket(view, pt, brackets, escape=True):
+    # type: (...) -> int
+    # Returns:
+    #   int|None: The offset of the innermost closing bracket at or after pt
+    #       that is not opened after pt. It may be unbalanced.
+    index = _get_index(view, brackets[0], brackets[1], escape)
+    i = _enclosing(index, pt, balanced=True)
+    if i >= 0:
+        return index[1][i]
+
+    lone_closes = index[3]
+    j = bisect_left(lone_closes, pt)
+    if j < len(lone_closes):
+        return lone_closes[j]
+
+    return None
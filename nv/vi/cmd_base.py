@@ -105,6 +105,9 @@ class ViMotionDef(ViCommandDefBase):
         super().__init__(*args, **kwargs)
         self.updates_xpos = False
         self.scroll_into_view = False
+        # The motion reads or sets the last character or buffer search when it
+        # is translated, so its repeats can't run the translated commands.
+        self.uses_last_search = False
         self.type = CMD_TYPE_MOTION
 
 
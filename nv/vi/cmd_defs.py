@@ -2571,6 +2571,7 @@ class ViMoveByBlockUp(ViMotionDef):
 class ViRepeatCharSearchForward(ViMotionDef):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.updates_xpos = True
         self.scroll_into_view = True
 
@@ -2804,6 +2805,7 @@ class ViGotoLinesPercent(ViMotionDef):
 class ViRepeatCharSearchBackward(ViMotionDef):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.updates_xpos = True
         self.scroll_into_view = True
 
@@ -3215,6 +3217,7 @@ class ViSetMark(ViOperatorDef):
 class ViSearchCharForward(ViMotionDef):
     def __init__(self, inclusive=False, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self._serializable.append('inclusive')
         self.scroll_into_view = True
         self.updates_xpos = True
@@ -3332,6 +3335,7 @@ class ViITextObject(ViMotionDef):
 class ViSearchCharBackward(ViMotionDef):
     def __init__(self, inclusive=False, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self._serializable.append('inclusive')
         self.scroll_into_view = True
         self.updates_xpos = True
@@ -3376,6 +3380,7 @@ class ViSearchCharBackward(ViMotionDef):
 class ViSearchForward(ViMotionDef):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.scroll_into_view = True
         self.updates_xpos = True
         self.input_parser = parser_def(command='_vi_slash',
@@ -3411,6 +3416,7 @@ class ViSearchForward(ViMotionDef):
 class ViSearchForwardImpl(ViMotionDef):
     def __init__(self, *args, term='', **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.scroll_into_view = True
         self._inp = term
         self.updates_xpos = True
@@ -3435,6 +3441,7 @@ class ViSearchForwardImpl(ViMotionDef):
 class ViSearchBackward(ViMotionDef):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.scroll_into_view = True
         self.updates_xpos = True
         self.input_parser = parser_def(command='_vi_question_mark',
@@ -3470,6 +3477,7 @@ class ViSearchBackward(ViMotionDef):
 class ViSearchBackwardImpl(ViMotionDef):
     def __init__(self, *args, term='', **kwargs):
         super().__init__(*args, **kwargs)
+        self.uses_last_search = True
         self.scroll_into_view = True
         self.updates_xpos = True
         self._inp = term
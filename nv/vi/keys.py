@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from functools import lru_cache
 import re
 
 from NeoVintageous.nv import plugin
@@ -297,6 +298,16 @@ class seqs:
     ZZ = 'zz'
 
 
+# The command definitions of each mode, built on the first lookup in the mode
+# after all commands are registered, and the sequences that are the start of a
+# command sequence of the mode.
+_dispatch_tables = {}
+_command_prefixes = {}
+
+# The command definition of sequences not mapped to a command.
+_MISSING_COMMAND = cmd_base.ViMissingCommandDef()
+
+
 def seq_to_command(state, seq, mode=None):
     # Return the command definition mapped to seq.
     #
@@ -307,24 +318,71 @@ def seq_to_command(state, seq, mode=None):
     # Returns:
     #   Mapping:
     #   ViMissingCommandDef: If not found.
-    mode = mode or state.mode
+    command = _get_dispatch_table(mode or state.mode).get(seq, _MISSING_COMMAND)
+
+    if isinstance(command, tuple):
+        # The plugin command might only be enabled under certain conditions,
+        # otherwise the command it overrides is used.
+        command, fallback = command
+        if not command.is_enabled(state):
+            return fallback
+
+    return command
+
+
+def is_command_prefix(mode, seq):
+    # type: (str, str) -> bool
+    # Returns True if seq is the start of, but not, a command sequence.
+    try:
+        return seq in _command_prefixes[mode]
+    except KeyError:
+        pass
 
-    command = None
+    prefixes = set()
+    for command_seq in _get_dispatch_table(mode):
+        try:
+            command_keys = list(KeySequenceTokenizer(command_seq).iter_tokenize())
+        except ValueError:
+            continue
 
-    if mode in plugin.mappings:
-        command = plugin.mappings[mode].get(seq, None)
+        prefix = ''
+        for key in command_keys[:-1]:
+            prefix += key
+            prefixes.add(prefix)
 
-        # The plugin command might only be enabled under certain conditions
-        if command and hasattr(command, 'is_enabled') and (not command.is_enabled(state)):
-            command = None
+    prefixes = _command_prefixes[mode] = frozenset(prefixes)
 
-    if not command and mode in mappings:
-        command = mappings[mode].get(seq, cmd_base.ViMissingCommandDef())
+    return seq in prefixes
 
-    if command:
-        return command
 
-    return cmd_base.ViMissingCommandDef()
+def clear_dispatch_tables():
+    # type: () -> None
+    # The dispatch tables are built again on the next lookup.
+    _dispatch_tables.clear()
+    _command_prefixes.clear()
+
+
+def _get_dispatch_table(mode):
+    # type: (str) -> dict
+    # Returns the command definitions of the mode, the plugin commands merged
+    # over the core commands. Plugin commands that are only enabled under
+    # certain conditions are mapped to a 2-tuple of the plugin command and the
+    # command it overrides.
+    try:
+        return _dispatch_tables[mode]
+    except KeyError:
+        pass
+
+    table = dict(mappings.get(mode, {}))
+    for seq, command in plugin.mappings.get(mode, {}).items():
+        if hasattr(command, 'is_enabled'):
+            command = (command, table.get(seq, _MISSING_COMMAND))
+
+        table[seq] = command
+
+    _dispatch_tables[mode] = table
+
+    return table
 
 
 # Mappings 'key sequence' ==> 'command definition'
@@ -419,6 +477,9 @@ class key_names:
     max_len = len('<space>')
 
 
+_NAMED_KEYS = frozenset(key_names.as_list)
+
+
 # TODO: detect counts, registers, marks...
 class KeySequenceTokenizer(object):
     """Takes in a sequence of key names and tokenizes it."""
@@ -442,7 +503,7 @@ class KeySequenceTokenizer(object):
         return self.source[self.idx + 1]
 
     def is_named_key(self, key):
-        return key.lower() in key_names.as_list
+        return key.lower() in _NAMED_KEYS
 
     def sort_modifiers(self, modifiers):
         """Ensure consistency in the order of modifier letters according to c > m > s."""
@@ -520,6 +581,32 @@ class KeySequenceTokenizer(object):
         return variables.get(c) if variables.is_key_name(c) else c
 
 
+class _UnexpandedKeySequenceTokenizer(KeySequenceTokenizer):
+
+    # Tokenizes the variables of a sequence, e.g. <leader>, as keys, rather
+    # than expanding them to their values. The values of variables can change,
+    # so tokens with variables can't be cached expanded.
+
+    def _expand_vars(self, c):
+        return c
+
+
+_BARE_COMMAND_PREFIX = re.compile(r'^(?:".)?(?:[1-9]+)?')
+
+
+@lru_cache(maxsize=512)
+def _bare_command_name(seq):
+    # type: (str) -> tuple
+    # Returns a 2-tuple (name, keys) of the command sequence with register and
+    # counts stripped, where name is None if any of the keys is a variable.
+    keys = tuple(_UnexpandedKeySequenceTokenizer(_BARE_COMMAND_PREFIX.sub('', seq)).iter_tokenize())
+    if any(variables.is_key_name(k) for k in keys):
+        return None, keys
+
+    # Account for d2d and similar sequences.
+    return ''.join(k for k in keys if not k.isdigit()), keys
+
+
 def to_bare_command_name(seq):
     # type: (str) -> str
     #
@@ -533,11 +620,12 @@ def to_bare_command_name(seq):
     if seq == '0':
         return seq
 
-    new_seq = re.sub(r'^(?:".)?(?:[1-9]+)?', '', seq)
-    # Account for d2d and similar sequences.
-    new_seq = list(KeySequenceTokenizer(new_seq).iter_tokenize())
+    name, keys = _bare_command_name(seq)
+    if name is None:
+        keys = (variables.get(k) if variables.is_key_name(k) else k for k in keys)
+        name = ''.join(k for k in keys if not k.isdigit())
 
-    return ''.join(k for k in new_seq if not k.isdigit())
+    return name
 
 
 def assign(seq, modes, *args, **kwargs):
@@ -556,5 +644,6 @@ def assign(seq, modes, *args, **kwargs):
     def inner(cls):
         for mode in modes:
             mappings[mode][seq] = cls(*args, **kwargs)
+        clear_dispatch_tables()
         return cls
     return inner
@@ -15,23 +15,51 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from NeoVintageous.nv.shada import shada_get
+from NeoVintageous.nv.shada import shada_save
+
+
+def _is_saved_macro(steps):
+    # type: (object) -> bool
+    # A saved macro is a list of [command, args] steps.
+    return isinstance(steps, list) and all(
+        isinstance(step, list) and len(step) == 2 and isinstance(step[0], str) and isinstance(step[1], dict)
+        for step in steps)
+
 
 class MacroRegisters(dict):
     """Crude implementation of macro registers."""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._loaded = False
+
+    def _load(self):
+        # The macros saved in the state file are loaded on first use, rather
+        # than at startup, and don't replace macros that are already recorded.
+        if not self._loaded:
+            self._loaded = True
+            for key, steps in shada_get('macros').items():
+                if _is_saved_macro(steps):
+                    super().setdefault(key, [tuple(step) for step in steps])
 
     def __setitem__(self, key, value):
         if key in ('%', '#'):
             raise ValueError('invalid register key: %s' % key)
         # TODO further restrict valid register names.
         # TODO implement a vs A register.
+        self._load()
         super().__setitem__(key.lower(), value)
+        shada_save()
 
     def __getitem__(self, key):
         if key in ('%', '#'):
             raise ValueError('unsupported key: %s' % key)
         # TODO further restrict valid register names.
         # TODO implement a vs A register.
+        self._load()
         return super().__getitem__(key.lower())
+
+    def items(self):
+        self._load()
+        return super().items()
@@ -15,11 +15,111 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from sublime import HIDDEN
 from sublime import Region
+from sublime import windows
 
-# store: window, view, rowcol
+from NeoVintageous.nv.shada import shada_get
+from NeoVintageous.nv.shada import shada_save
 
-_MARKS = {}
+# The views the marks are in, by name. The positions of the marks are kept in
+# the views, as regions that Sublime Text moves as the views are edited, so
+# that a mark stays on its line when text is inserted or deleted above it.
+_MARKS = {}  # type: dict
+
+# The file marks (A-Z) saved in the state file, loaded on first use, rather
+# than at startup: name -> [file name, row, col].
+_FILE_MARKS = None  # type: dict
+
+
+def _get_saved_file_marks():
+    # type: () -> dict
+    global _FILE_MARKS
+
+    if _FILE_MARKS is None:
+        _FILE_MARKS = {name: mark for name, mark in shada_get('marks').items() if _is_saved_file_mark(name, mark)}
+
+    return _FILE_MARKS
+
+
+def _is_saved_file_mark(name, mark):
+    # type: (str, object) -> bool
+    # A saved file mark is a [file name, row, col] list.
+    if not (name.isupper() and len(name) == 1 and isinstance(mark, list) and len(mark) == 3):
+        return False
+
+    return isinstance(mark[0], str) and isinstance(mark[1], int) and isinstance(mark[2], int)
+
+
+def _region_key(name):
+    # type: (str) -> str
+    return 'vi_mark_' + name
+
+
+def _get_mark(name):
+    # type: (str) -> tuple
+    # Returns:
+    #   tuple: The view the mark is in and its position in the view, or
+    #       (None, None) if the mark isn't set.
+    view = _MARKS.get(name)
+    if view is not None:
+        regions = view.get_regions(_region_key(name))
+        if regions:
+            return view, regions[0].b
+
+    return None, None
+
+
+def get_file_marks():
+    # type: () -> dict
+    # Returns:
+    #   dict: The file marks to save in the state file.
+    file_marks = dict(_get_saved_file_marks())
+    for name in _MARKS:
+        if name.isupper():
+            view, pt = _get_mark(name)
+            if view and view.file_name():
+                file_marks[name] = [view.file_name()] + list(view.rowcol(pt))
+
+    return file_marks
+
+
+def _get_other_view_of_buffer(view):
+    # type: (...) -> object
+    # Returns:
+    #   View|None: Another view of the buffer of the view, e.g. a clone.
+    for window in windows():
+        for other in window.views():
+            if other.buffer_id() == view.buffer_id() and other.view_id != view.view_id:
+                return other
+
+
+def destroy(view):
+    # type: (...) -> None
+    # The marks in a view move to another view of its buffer when the view is
+    # closed. They go when the last view of the buffer is closed, except for
+    # the file marks, which are kept as saved file marks.
+    names = [name for name, mark_view in _MARKS.items() if mark_view.view_id == view.view_id]
+    if not names:
+        return
+
+    other = _get_other_view_of_buffer(view)
+    saved = False
+    for name in names:
+        _, pt = _get_mark(name)
+        if other is not None and pt is not None:
+            other.add_regions(_region_key(name), [Region(pt)], flags=HIDDEN)
+            _MARKS[name] = other
+            continue
+
+        if name.isupper() and pt is not None and view.file_name():
+            _get_saved_file_marks()[name] = [view.file_name()] + list(view.rowcol(pt))
+            saved = True
+
+        del _MARKS[name]
+
+    if saved:
+        shada_save()
 
 
 class Marks(object):
@@ -31,9 +131,15 @@ class Marks(object):
 
     def add(self, name, view):
         # TODO: support multiple selections
-        # TODO: Use id attribute; references might change.
-        win, view, rowcol = view.window(), view, view.rowcol(view.sel()[0].b)
-        _MARKS[name] = win, view, rowcol
+        old_view = _MARKS.get(name)
+        if old_view is not None and old_view.view_id != view.view_id:
+            old_view.erase_regions(_region_key(name))
+
+        view.add_regions(_region_key(name), [Region(view.sel()[0].b)], flags=HIDDEN)
+        _MARKS[name] = view
+
+        if name.isupper():
+            shada_save()
 
     def get_as_encoded_address(self, name, exact=False):
         """
@@ -49,25 +155,32 @@ class Marks(object):
             # Special case: '' motion
             return '<command _vi_double_single_quote>'
 
-        win, view, rowcol = _MARKS.get(name, (None,) * 3)
-        if win:
-            if exact:
-                rowcol_encoded = ':'.join(str(i) for i in rowcol)
-            else:
-                rowcol_encoded = ':'.join(str(i) for i in (rowcol[0], 0))
-
-            fname = view.file_name()
-
-            # Marks set in the same view as the current one are returned as regions. Marks in other
-            # views are returned as encoded addresses that Sublime Text understands.
-            if view and view.view_id == self.state.view.view_id:
-                if not exact:
-                    rowcol = (rowcol[0], 0)
-
-                return Region(view.text_point(*rowcol))
-            else:
-                # FIXME: Remove buffers when they are closed.
-                if fname:
-                    return "{0}:{1}".format(fname, rowcol_encoded)
-                else:
-                    return "<untitled {0}>:{1}".format(view.buffer_id(), rowcol_encoded)
+        view, pt = _get_mark(name)
+        if view is None:
+            if name in _get_saved_file_marks():
+                fname, row, col = _get_saved_file_marks()[name]
+                if fname == self.state.view.file_name():
+                    return Region(self.state.view.text_point(row, col if exact else 0))
+
+                return "{0}:{1}:{2}".format(fname, row, col if exact else 0)
+
+            return None
+
+        # Marks set in the same view as the current one are returned as regions. Marks in other
+        # views are returned as encoded addresses that Sublime Text understands.
+        if view.view_id == self.state.view.view_id:
+            if not exact:
+                pt = view.line(pt).a
+
+            return Region(pt)
+
+        row, col = view.rowcol(pt)
+        if not exact:
+            col = 0
+
+        # FIXME: Remove buffers when they are closed.
+        fname = view.file_name()
+        if fname:
+            return "{0}:{1}:{2}".format(fname, row, col)
+        else:
+            return "<untitled {0}>:{1}:{2}".format(view.buffer_id(), row, col)
@@ -20,6 +20,9 @@ import itertools
 from sublime import get_clipboard
 from sublime import set_clipboard
 
+from NeoVintageous.nv.shada import shada_get
+from NeoVintageous.nv.shada import shada_save
+
 
 REG_UNNAMED = '"'
 REG_SMALL_DELETE = '-'
@@ -53,6 +56,49 @@ def init_register_data():
 # Stores register data.
 _REGISTER_DATA = init_register_data()
 
+# The registers saved in the state file.
+_REG_SAVED = REG_VALID_NAMES + ('0', '1-9', REG_UNNAMED, REG_SMALL_DELETE)
+
+# Whether the registers saved in the state file have been loaded.
+_loaded = False
+
+
+def _is_text(value):
+    # type: (object) -> bool
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_saved_register(name, value):
+    # type: (str, object) -> bool
+    # The state file may have been edited, or written by another version, so
+    # a saved register that isn't in the shape of the register is ignored.
+    if name == '1-9':
+        return isinstance(value, list) and len(value) >= 9 and all(item is None or _is_text(item) for item in value)
+
+    return name in _REG_SAVED and _is_text(value)
+
+
+def _load_register_data():
+    # type: () -> None
+    global _loaded
+
+    # The saved registers are loaded on first use, rather than at startup, and
+    # don't replace registers that are already set.
+    if not _loaded:
+        _loaded = True
+        for name, value in shada_get('registers').items():
+            if _is_saved_register(name, value) and not any(_REGISTER_DATA.get(name) or ()):
+                _REGISTER_DATA[name] = value
+
+
+def get_register_data():
+    # type: () -> dict
+    # Returns:
+    #   dict: The registers to save in the state file.
+    _load_register_data()
+
+    return {name: _REGISTER_DATA[name] for name in _REG_SAVED if name in _REGISTER_DATA}
+
 
 # TODO Subclass dict properly.
 class Registers(object):
@@ -85,6 +131,7 @@ class Registers(object):
     """
 
     def __get__(self, instance, owner):
+        _load_register_data()
         self.view = instance.view
         self.settings = instance.settings
         return self
@@ -144,6 +191,7 @@ class Registers(object):
         _REGISTER_DATA[name] = values
 
         if name not in (REG_EXPRESSION,):
+            shada_save()
             self._set_default_register(values)
             self._maybe_set_sys_clipboard(name, values)
 
@@ -157,6 +205,7 @@ class Registers(object):
                                            suffixes, fillvalue='')
         new_values = [(prefix + suffix) for (prefix, suffix) in new_values]
         _REGISTER_DATA[name.lower()] = new_values
+        shada_save()
         self._set_default_register(new_values)
         self._maybe_set_sys_clipboard(name, new_values)
 
@@ -15,15 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from bisect import bisect_right
+from functools import lru_cache
 import re
+import time
 
 from sublime import DRAW_NO_FILL
 from sublime import DRAW_NO_OUTLINE
 from sublime import IGNORECASE
 from sublime import LITERAL
 from sublime import Region
+from sublime import set_timeout
+from sublime import set_timeout_async
 import sublime_plugin
 
+from NeoVintageous.nv.vim import status_message
+
 
 def find_in_range(view, term, start, end, flags=0):
     # Returns:
@@ -103,6 +111,92 @@ def find_last_in_range(view, term, start, end, flags=0):
     return last_found
 
 
+# The reverse search engine scans backwards over the buffer in chunks, which
+# are aligned to line starts and grow geometrically, with the pattern compiled
+# once. The text of each chunk is retrieved once, and the first line of the
+# chunk after it is retrieved again as context for matches that span the two.
+_REVERSE_SEARCH_CHUNK_SIZE = 2048
+_REVERSE_SEARCH_MAX_CHUNK_SIZE = 1048576
+
+# Sublime Text patterns that Python can compile, but which mean something
+# different, or that Python can't compile at all, are searched for with the
+# line-based search. For example \h, \Q...\E, atomic groups, possessive
+# quantifiers, and POSIX character classes. Python reads some escapes, e.g.
+# the word boundaries \< and \>, the case escapes \l and \u, \e, and \x{..},
+# as literal characters, so they match silently the wrong thing.
+_RXC_UNPORTABLE_PATTERN = re.compile(r'\\[hHvVkKQEzGXRNpP<>lue]|\\x\{|\(\?(?:>|<[A-Za-z])|[*+?}]\+|\[:')
+
+# Patterns that can match the empty string, e.g. \b\b or a*, are also searched
+# for with the line-based search, because it treats an empty match as no
+# match, and because the engine would otherwise step through the empty
+# matches at every point of the buffer. The patterns are probed with text
+# that has every kind of boundary.
+_EMPTY_MATCH_PROBE = ' \n\nab_1 \t(.)\n'
+
+
+@lru_cache(maxsize=128)
+def _compile_reverse_search_pattern(term, flags):
+    # Returns:
+    #   Pattern|None: None if the term can't be searched with a Python
+    #       regular expression.
+    if flags & LITERAL:
+        term = re.escape(term)
+    elif _RXC_UNPORTABLE_PATTERN.search(term):
+        return None
+
+    try:
+        pattern = re.compile(term, re.M | (re.I if flags & IGNORECASE else 0))
+    except re.error:
+        return None
+
+    for match in pattern.finditer(_EMPTY_MATCH_PROBE):
+        if match.end() == match.start():
+            return None
+
+    return pattern
+
+
+def _reverse_find(view, pattern, start, end):
+    # Returns:
+    #   Region|None: The last non-empty match that begins at or after start
+    #       and ends at or before end. Matches are found in the same way as
+    #       a forward search from the start of the line they begin on.
+    if end <= start:
+        return None
+
+    size = _REVERSE_SEARCH_CHUNK_SIZE
+    chunk_end = end
+    context_end = view.full_line(end).b
+
+    while True:
+        chunk_begin = max(view.line(max(chunk_end - size, start)).a, start)
+
+        # The character before the chunk is retrieved too, so that anchors
+        # and lookbehinds at the start of the chunk see the text before it.
+        offset = 1 if chunk_begin > 0 else 0
+        text_begin = chunk_begin - offset
+        text = view.substr(Region(text_begin, context_end))
+
+        last = None
+        for match in pattern.finditer(text, offset):
+            match_begin, match_end = match.span()
+            if match_begin + text_begin >= chunk_end or match_end + text_begin > end:
+                break
+
+            if match_end > match_begin:
+                last = match
+
+        if last is not None:
+            return Region(text_begin + last.start(), text_begin + last.end())
+
+        if chunk_begin <= start:
+            return None
+
+        chunk_end = chunk_begin
+        context_end = view.full_line(chunk_begin).b
+        size = min(size * 2, _REVERSE_SEARCH_MAX_CHUNK_SIZE)
+
+
 # The @start position is linewise.
 #
 # The @end position is NOT linewise.
@@ -131,6 +225,43 @@ def reverse_search(view, term, start, end, flags=0):
     start = start if (start is not None) else 0
     end = end if (end is not None) else view.size()
 
+    if start < 0 or end > view.size():
+        return None
+
+    pattern = _compile_reverse_search_pattern(term, flags)
+    if pattern is None:
+        return _reverse_search_by_lines(view, term, start, end, flags)
+
+    return _reverse_find(view, pattern, view.full_line(start).a, end)
+
+
+def reverse_search_by_pt(view, term, start, end, flags=0):
+    assert isinstance(start, int) or start is None
+    assert isinstance(end, int) or end is None
+
+    start = start if (start is not None) else 0
+    end = end if (end is not None) else view.size()
+
+    if start < 0 or end > view.size():
+        return None
+
+    pattern = _compile_reverse_search_pattern(term, flags)
+    if pattern is None:
+        return _reverse_search_by_pt_by_lines(view, term, start, end, flags)
+
+    return _reverse_find(view, pattern, start, end)
+
+
+# The line-based reverse searches bisect over the lines of the buffer with
+# view.find(). They are used for patterns that the reverse search engine
+# can't search with a Python regular expression.
+def _reverse_search_by_lines(view, term, start, end, flags=0):
+    assert isinstance(start, int) or start is None
+    assert isinstance(end, int) or end is None
+
+    start = start if (start is not None) else 0
+    end = end if (end is not None) else view.size()
+
     if start < 0 or end > view.size():
         return None
 
@@ -158,7 +289,7 @@ def reverse_search(view, term, start, end, flags=0):
             return find_last_in_range(view, term, hi_line.a, min(hi_line.b, end), flags)
 
 
-def reverse_search_by_pt(view, term, start, end, flags=0):
+def _reverse_search_by_pt_by_lines(view, term, start, end, flags=0):
     assert isinstance(start, int) or start is None
     assert isinstance(end, int) or end is None
 
@@ -192,6 +323,342 @@ def reverse_search_by_pt(view, term, start, end, flags=0):
             return find_last_in_range(view, term, max(hi_line.a, start), min(hi_line.b, end), flags)
 
 
+# Per-view index of the matches of the last pattern searched for, keyed by
+# view id. Each entry is a (term, flags, change_count, regions, starts, ends)
+# tuple, where the matches are the non-empty matches found by view.find_all(),
+# in order. Buffers up to _HILITE_SYNC_SIZE are indexed on demand; larger
+# buffers are indexed by the time slices of hilite(), so until those are done
+# there is no index to use.
+_match_indexes = {}  # type: dict
+
+
+def destroy(view):
+    # type: (...) -> None
+    _match_indexes.pop(view.id(), None)
+    cancel_incsearch(view)
+
+
+def _set_match_index(view, term, flags, change_count, regions):
+    # type: (...) -> tuple
+    regions = [region for region in regions if not region.empty()]
+    index = (term, flags, change_count, regions, [r.a for r in regions], [r.b for r in regions])
+    _match_indexes[view.id()] = index
+
+    return index[3:]
+
+
+def _get_match_index(view, term, flags, build=False):
+    # type: (...) -> tuple
+    # Returns:
+    #   tuple|None: The (regions, starts, ends) of the matches, or None if
+    #       there is no index of them yet. If build is true, buffers up to
+    #       _HILITE_SYNC_SIZE are indexed if they aren't already.
+    change_count = view.change_count()
+    index = _match_indexes.get(view.id())
+    if index is not None and index[:3] == (term, flags, change_count):
+        return index[3:]
+
+    if build and view.size() <= _HILITE_SYNC_SIZE:
+        return _set_match_index(view, term, flags, change_count, view.find_all(term, flags))
+
+
+def find_next_match(view, term, start, flags=0, times=1):
+    # type: (...) -> Region
+    # Returns:
+    #   Region|None: The times'th match that begins at or after start,
+    #       wrapping around the end of the buffer.
+    index = _get_match_index(view, term, flags)
+    if index is not None:
+        regions, starts, ends = index
+        if not regions:
+            return None
+
+        # The index has no overlapping matches, because the matches are found
+        # one after the other, but a match can also begin inside another one,
+        # e.g. /aa in aaa. If start is inside a match, the next match is found
+        # in the buffer, as the index may not have it.
+        i = bisect_left(starts, start)
+        if i == 0 or ends[i - 1] <= start:
+            return regions[(i + times - 1) % len(regions)]
+
+    return find_wrapping(view, term, start, view.size(), flags=flags, times=times)
+
+
+def find_previous_match(view, term, end, flags=0, times=1):
+    # type: (...) -> Region
+    # Returns:
+    #   Region|None: The times'th match that ends at or before end, wrapping
+    #       around the start of the buffer.
+    index = _get_match_index(view, term, flags)
+    if index is None:
+        return reverse_find_wrapping(view, term, 0, end, flags=flags, times=times)
+
+    regions, _, ends = index
+    if not regions:
+        return None
+
+    return regions[(bisect_right(ends, end) - times) % len(regions)]
+
+
+def get_match_count(view, term, pt, flags=0):
+    # type: (...) -> tuple
+    # Returns:
+    #   tuple[int, int]|None: The number of the last match that begins at or
+    #       before pt, counting from 1, or 0 if there is none, and the number
+    #       of matches; or None if the matches of a large buffer are not
+    #       indexed yet.
+    index = _get_match_index(view, term, flags, build=True)
+    if index is None:
+        return None
+
+    regions, starts, _ = index
+
+    return bisect_right(starts, pt), len(regions)
+
+
+# Buffers up to this size are highlighted at once. Larger buffers are
+# highlighted around the visible region and selection first, and then filled
+# in for the rest of the buffer in time slices, so that searching doesn't
+# block the UI.
+_HILITE_SYNC_SIZE = 262144
+_HILITE_SLICE_DURATION = 0.02
+
+# The current highlighting generation of each view, keyed by view id. Time
+# slices of a stale generation are abandoned.
+_hilite_generations = {}  # type: dict
+
+
+def _add_search_regions(view, regions):
+    # type: (...) -> None
+    if not regions:
+        view.erase_regions('vi_search')
+        view.erase_regions('vi_search_current')
+        return
+
+    # TODO: Re-enable hlsearch toggle setting.
+    # if State(self.view).settings.vi['hlsearch'] == False:
+    #     return
+
+    # Matches are sorted and don't overlap, so the match that contains a
+    # selection, if any, is the last one that begins at or before it.
+    starts = [region.begin() for region in regions]
+    current = set()
+    for sel in view.sel():
+        i = bisect_right(starts, sel.begin()) - 1
+        if i >= 0 and regions[i].contains(sel):
+            current.add(i)
+
+    regions_current = [regions[i] for i in sorted(current)]
+
+    # TODO Allow option to configure search highlight style outline or fill
+    use_outline_style = False
+    if use_outline_style:
+        flags_all = DRAW_NO_FILL
+        flags_current = DRAW_NO_OUTLINE
+    else:
+        flags_all = DRAW_NO_OUTLINE
+        flags_current = DRAW_NO_OUTLINE
+
+    # The scopes are prefixed with common color scopes so that color schemes
+    # have sane default colors. Color schemes can progressively enhance
+    # support by using the nv_* scopes.
+    view.add_regions(
+        'vi_search',
+        regions,
+        scope='string nv_search_occurence',
+        flags=flags_all
+    )
+
+    view.add_regions(
+        'vi_search_current',
+        regions_current,
+        scope='support.function nv_search_current',
+        flags=flags_current
+    )
+
+
+def _iter_matches(view, term, flags):
+    # Yields every match in the buffer, in the same way as view.find_all().
+    pattern = _compile_reverse_search_pattern(term, flags)
+    if pattern is not None:
+        for match in pattern.finditer(view.substr(Region(0, view.size()))):
+            yield Region(match.start(), match.end())
+
+        return
+
+    pt = 0
+    size = view.size()
+    while pt <= size:
+        match = view.find(term, pt, flags)
+        if match.a < 0:
+            return
+
+        yield match
+        pt = match.b if match.b > match.a else match.b + 1
+
+
+def _hilite_slice(view, term, flags, generation, change_count, matches, regions):
+    # type: (...) -> None
+    if _hilite_generations.get(view.id()) != generation:
+        return
+
+    if not view.is_valid():
+        del _hilite_generations[view.id()]
+        return
+
+    if view.change_count() != change_count:
+        # The buffer changed, so the matches are stale. The highlighting of
+        # the first pass is left as it is.
+        return
+
+    deadline = time.perf_counter() + _HILITE_SLICE_DURATION
+    for i, region in enumerate(matches, 1):
+        regions.append(region)
+        if i % 256 == 0 and time.perf_counter() > deadline:
+            set_timeout(lambda: _hilite_slice(view, term, flags, generation, change_count, matches, regions), 0)
+            return
+
+    _add_search_regions(view, regions)
+    _set_match_index(view, term, flags, change_count, regions)
+
+
+def hilite(view, term, flags=0):
+    # type: (...) -> None
+    # Highlight the matches of the term in the view.
+    generation = _hilite_generations.get(view.id(), 0) + 1
+    _hilite_generations[view.id()] = generation
+
+    index = _get_match_index(view, term, flags, build=True)
+    if index is not None:
+        _add_search_regions(view, index[0])
+        return
+
+    # First pass: the visible region, and the region of the same size around
+    # the first selection, because the view is usually scrolled to it next.
+    visible = view.visible_region()
+    pt = view.sel()[0].b if len(view.sel()) else visible.a
+    around = Region(max(0, pt - visible.size()), min(view.size(), pt + visible.size()))
+
+    ranges = sorted((visible, around))
+    if ranges[1].a <= ranges[0].b:
+        ranges = [ranges[0].cover(ranges[1])]
+
+    regions = []  # type: list
+    for region in ranges:
+        regions.extend(find_all_in_range(view, term, view.line(region.a).a, region.b, flags))
+
+    _add_search_regions(view, regions)
+
+    # Second pass: the whole buffer, in time slices, which also indexes the
+    # matches.
+    matches = _iter_matches(view, term, flags)
+    change_count = view.change_count()
+    set_timeout(lambda: _hilite_slice(view, term, flags, generation, change_count, matches, []), 0)
+
+
+def clear_hilite(view):
+    # type: (...) -> None
+    # Erase the search highlighting, and abandon any highlighting in progress.
+    _hilite_generations[view.id()] = _hilite_generations.get(view.id(), 0) + 1
+    view.erase_regions('vi_search')
+    view.erase_regions('vi_search_current')
+
+
+# Incremental search.
+#
+# Keystrokes are debounced, and the search for the latest pattern is run on
+# the async thread. Only the result of the latest search is posted back to
+# the UI thread; the results of stale searches are discarded. If the new
+# pattern is a literal extension of the previous pattern, then its match
+# can't be before the previous match (after it, for backward searches), so
+# the previous match is used as the bound of the new search.
+_INCSEARCH_DEBOUNCE = 50
+
+# The incremental search state of each view, keyed by view id. Each entry is
+# a list [generation, last], where last is a tuple (term, flags, forward,
+# count, pt, match) of the last search completed, or None.
+_incsearches = {}  # type: dict
+
+_RXC_REGEX_METACHAR = re.compile(r'[\\.^$*+?{}\[\]|()]')
+
+
+def _is_literal(term, flags):
+    # type: (str, int) -> bool
+    return bool(flags & LITERAL) or not _RXC_REGEX_METACHAR.search(term)
+
+
+def _incsearch_find(view, term, flags, forward, count, pt, last):
+    # type: (...) -> Region
+    # Returns:
+    #   Region|None
+    start, end = (pt, view.size()) if forward else (0, pt)
+
+    if count == 1 and last is not None:
+        last_term, last_flags, last_forward, last_count, last_pt, last_match = last
+        if (last_flags, last_forward, last_count, last_pt) == (flags, forward, count, pt) and \
+                term.startswith(last_term) and _is_literal(term, flags) and _is_literal(last_term, flags):
+            if last_match is None:
+                return None
+
+            # Only matches found without wrapping around the buffer bound the
+            # new search.
+            if forward and last_match.a >= start:
+                start = last_match.a
+            elif not forward and last_match.b <= end:
+                end = min(end, last_match.a + len(term))
+
+    if forward:
+        return find_wrapping(view, term, start, view.size(), flags=flags, times=count)
+
+    return reverse_find_wrapping(view, term, start, end, flags=flags, times=count)
+
+
+def incsearch(view, term, flags, forward, count, on_done):
+    # type: (...) -> None
+    # Search incrementally for the term.
+    #
+    # Args:
+    #   forward (bool): Search forward from after the first selection, or
+    #       backward from it.
+    #   on_done (callable): Called on the UI thread with the match (Region),
+    #       or None, unless the search has gone stale.
+    try:
+        search = _incsearches[view.id()]
+    except KeyError:
+        search = _incsearches[view.id()] = [0, None]
+
+    search[0] += 1
+    generation = search[0]
+    sel = view.sel()[0]
+    pt = sel.b + 1 if forward else sel.b
+
+    def _post(match):
+        if search[0] == generation:
+            on_done(match)
+
+    def _run():
+        if search[0] != generation:
+            return
+
+        match = _incsearch_find(view, term, flags, forward, count, pt, search[1])
+        if search[0] != generation:
+            return
+
+        search[1] = (term, flags, forward, count, pt, match)
+        set_timeout(lambda: _post(match), 0)
+
+    set_timeout_async(_run, _INCSEARCH_DEBOUNCE)
+
+
+def cancel_incsearch(view):
+    # type: (...) -> None
+    # Discard any incremental search in progress, and the state kept between
+    # keystrokes.
+    search = _incsearches.pop(view.id(), None)
+    if search is not None:
+        search[0] += 1
+
+
 # TODO [refactor] Move to commands module
 class BufferSearchBase(sublime_plugin.TextCommand):
     def __init__(self, *args, **kwargs):
@@ -212,52 +679,16 @@ class BufferSearchBase(sublime_plugin.TextCommand):
         return query
 
     def hilite(self, query):
-        regions = self.view.find_all(
-            self.build_pattern(query),
-            self.calculate_flags()
-        )
-
-        if not regions:
-            self.view.erase_regions('vi_search')
-            self.view.erase_regions('vi_search_current')
-            return
-
-        # TODO: Re-enable hlsearch toggle setting.
-        # if State(self.view).settings.vi['hlsearch'] == False:
-        #     return
-
-        sels = self.view.sel()
-        regions_current = []
-        for region in regions:
-            for sel in sels:
-                if region.contains(sel):
-                    regions_current.append(region)
-
-        # TODO Allow option to configure search highlight style outline or fill
-        use_outline_style = False
-        if use_outline_style:
-            flags_all = DRAW_NO_FILL
-            flags_current = DRAW_NO_OUTLINE
-        else:
-            flags_all = DRAW_NO_OUTLINE
-            flags_current = DRAW_NO_OUTLINE
-
-        # The scopes are prefixed with common color scopes so that color schemes
-        # have sane default colors. Color schemes can progressively enhance
-        # support by using the nv_* scopes.
-        self.view.add_regions(
-            'vi_search',
-            regions,
-            scope='string nv_search_occurence',
-            flags=flags_all
-        )
-
-        self.view.add_regions(
-            'vi_search_current',
-            regions_current,
-            scope='support.function nv_search_current',
-            flags=flags_current
-        )
+        hilite(self.view, self.build_pattern(query), self.calculate_flags())
+
+    def show_match_count(self, query):
+        # Like Vim's search count message e.g. "[2/5]", see :help shortmess-S.
+        # The count is skipped while the matches of a large buffer are not
+        # indexed yet.
+        sel = self.view.sel()[0]
+        count = get_match_count(self.view, self.build_pattern(query), sel.b, self.calculate_flags())
+        if count is not None:
+            status_message('[{}/{}]'.format(*count))
 
 
 # TODO [refactor] Move to commands module
@@ -21,6 +21,7 @@ from collections import namedtuple
 
 from sublime import load_settings
 from sublime import save_settings
+from sublime import set_timeout
 
 _vi_user_setting = namedtuple('vi_editor_setting', 'scope values default parser action negatable')
 
@@ -47,6 +48,30 @@ def destroy(view):
     except KeyError:
         pass
 
+    _VintageSettings._cache.pop(view.id(), None)
+    _VintageSettings._dirty.discard(view.id())
+
+
+def flush(view):
+    # type: (...) -> None
+    # Write the in-process state of the view back to the view settings.
+    #
+    # State is kept in memory while commands are being processed and is only
+    # written back to view.settings() at command boundaries. Does nothing if
+    # the state hasn't changed since the last flush.
+    view_id = view.id()
+    if view_id not in _VintageSettings._dirty:
+        return
+
+    _VintageSettings._dirty.discard(view_id)
+
+    try:
+        data = _VintageSettings._cache[view_id]
+    except KeyError:
+        return
+
+    view.settings().set('vintage', dict(data))
+
 
 def _set_generic_view_setting(view, name, value, opt, globally=False):
     if opt.scope == _SCOPE_VI_VIEW:
@@ -221,6 +246,11 @@ class _VintageSettings():
       b) the window.Settings object
       c) _VintageSettings._volatile
 
+    View settings are read and written through an in-process cache
+    (_VintageSettings._cache) and are only written back to the view.Settings
+    object when flush() is called, which is scheduled to run after the current
+    command has finished.
+
     This class knows where to store the settings' data it's passed.
 
     It is meant to be used as a descriptor.
@@ -229,15 +259,33 @@ class _VintageSettings():
     _volatile_settings = []
     # Stores volatile settings indexed by view.id().
     _volatile = defaultdict(dict)
+    # In-process write-back cache of the view "vintage" settings indexed by
+    # view.id(). It is the source of truth while commands are being processed
+    # and is written back to the view settings by flush().
+    _cache = {}
+    # The ids of views whose cached settings need to be flushed.
+    _dirty = set()
+    # The ids of windows whose "vintage" settings have been initialized.
+    _windows = set()
 
     def __init__(self, view=None):
         self.view = view
 
-        if view is not None and not isinstance(self.view.settings().get('vintage'), dict):
-            self.view.settings().set('vintage', dict())
+        if view is None:
+            return
+
+        if view.id() not in _VintageSettings._cache:
+            if not isinstance(self.view.settings().get('vintage'), dict):
+                self.view.settings().set('vintage', dict())
 
-        if view is not None and view.window() is not None and not isinstance(self.view.window().settings().get('vintage'), dict):  # FIXME # noqa: E501
-            self.view.window().settings().set('vintage', dict())
+        # The window settings are initialized apart from the view settings,
+        # a view can be moved to a window that hasn't been initialized.
+        window = view.window()
+        if window is not None and window.id() not in _VintageSettings._windows:
+            if not isinstance(window.settings().get('vintage'), dict):
+                window.settings().set('vintage', dict())
+
+            _VintageSettings._windows.add(window.id())
 
     def __get__(self, instance, owner):
         # This method is called when this class is accessed as a data member.
@@ -259,7 +307,7 @@ class _VintageSettings():
                 try:
                     return self._get_volatile(key)
                 except KeyError:
-                    value = self.view.settings().get('vintage').get(key)
+                    value = self._get_cached().get(key)
             else:
                 value = self.view.window().settings().get('vintage').get(key)
 
@@ -273,12 +321,34 @@ class _VintageSettings():
             if key in _VintageSettings._volatile_settings:
                 self._set_volatile(key, value)
                 return
-            setts, target = self.view.settings().get('vintage'), self.view
-        else:
-            setts, target = self.view.window().settings().get('vintage'), self.view.window()
 
+            self._set_cached(key, value)
+            return
+
+        setts = self.view.window().settings().get('vintage')
         setts[key] = value
-        target.settings().set('vintage', setts)
+        self.view.window().settings().set('vintage', setts)
+
+    def _get_cached(self):
+        view_id = self.view.id()
+        try:
+            return _VintageSettings._cache[view_id]
+        except KeyError:
+            data = self.view.settings().get('vintage')
+            data = dict(data) if isinstance(data, dict) else {}
+            _VintageSettings._cache[view_id] = data
+
+            return data
+
+    def _set_cached(self, key, value):
+        self._get_cached()[key] = value
+
+        view_id = self.view.id()
+        if view_id not in _VintageSettings._dirty:
+            _VintageSettings._dirty.add(view_id)
+            # Write the settings back once the current command has finished.
+            view = self.view
+            set_timeout(lambda: flush(view), 0)
 
     def _get_volatile(self, key):
         try:
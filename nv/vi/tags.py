@@ -0,0 +1,137 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_right
+import re
+
+from sublime import Region
+
+
+# Per-view tag indexes, keyed by view id.
+#
+# Each entry is a (change_count, index) tuple. The index is built lazily and
+# is thrown away as soon as the buffer changes.
+_cache = {}  # type: dict
+
+_RXC_TAG = re.compile(r'<(/?)([0-9A-Za-z-]+).*?>')
+
+
+def destroy(view):
+    # type: (...) -> None
+    _cache.pop(view.id(), None)
+
+
+def _build(text):
+    # type: (str) -> tuple
+    # Build the index of the elements in the text in one pass over its tags.
+    #
+    # Elements are the spans between a start tag and its end tag. End tags
+    # close the innermost open element with the same name (tag names are
+    # case-insensitive), which implicitly closes any unclosed elements opened
+    # since, like void elements e.g. <br> and <img>. End tags with no open
+    # element are ignored, and so are self-closing tags e.g. <br/>.
+    #
+    # Balanced elements are properly nested, so the index is a list of start
+    # tags sorted by offset, together with the index of the enclosing start
+    # tag of each one, which can be searched like an interval tree.
+    #
+    # Returns a tuple (starts, begin_tags, end_tags, names, parents):
+    #
+    #   starts (list[int]): The offsets of the start tags, in order.
+    #   begin_tags (list[tuple[int, int]]): The span of each start tag.
+    #   end_tags (list[tuple[int, int]|None]): The span of the end tag of
+    #       each start tag, or None if the element is never closed.
+    #   names (list[str]): The tag name of each element, as written in
+    #       its end tag.
+    #   parents (list[int]): The index in starts of the start tag that
+    #       encloses each start tag, or -1 if it's at the top level.
+    starts = []
+    begin_tags = []
+    end_tags = []
+    names = []
+    parents = []
+    stack = []  # type: list
+    stack_names = []  # type: list
+
+    for match in _RXC_TAG.finditer(text):
+        is_end_tag, name = match.groups()
+        lower_name = name.lower()
+        if not is_end_tag:
+            if match.group().endswith('/>'):
+                continue
+
+            parents.append(stack[-1] if stack else -1)
+            stack.append(len(starts))
+            stack_names.append(lower_name)
+            starts.append(match.start())
+            begin_tags.append(match.span())
+            end_tags.append(None)
+            names.append(name)
+        elif lower_name in stack_names:
+            while True:
+                i = stack.pop()
+                if stack_names.pop() == lower_name:
+                    break
+
+            end_tags[i] = match.span()
+            names[i] = name
+
+    return (starts, begin_tags, end_tags, names, parents)
+
+
+def _get_index(view):
+    # type: (...) -> tuple
+    change_count = view.change_count()
+
+    try:
+        cached_change_count, index = _cache[view.id()]
+        if cached_change_count == change_count:
+            return index
+    except KeyError:
+        pass
+
+    index = _build(view.substr(Region(0, view.size())))
+    _cache[view.id()] = (change_count, index)
+
+    return index
+
+
+def find_containing_element(view, pt, count=1):
+    # type: (...) -> tuple
+    # Args:
+    #   view (sublime.View)
+    #   pt (int)
+    #   count (int): Find the count'th containing element, counting outwards.
+    #
+    # Returns:
+    #   tuple[Region, Region, str]: The begin tag, end tag, and tag name of
+    #       the innermost element that contains pt. An element contains the
+    #       points of its own tags.
+    #   tuple[None, None, None]
+    starts, begin_tags, end_tags, names, parents = _get_index(view)
+
+    i = bisect_right(starts, pt) - 1
+    while i >= 0:
+        end_tag = end_tags[i]
+        if end_tag is not None and end_tag[1] > pt:
+            count -= 1
+            if count == 0:
+                return Region(*begin_tags[i]), Region(*end_tag), names[i]
+
+        i = parents[i]
+
+    return None, None, None
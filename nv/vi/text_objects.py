@@ -24,18 +24,19 @@ from sublime import CLASS_PUNCTUATION_END
 from sublime import CLASS_PUNCTUATION_START
 from sublime import CLASS_WORD_END
 from sublime import CLASS_WORD_START
-from sublime import IGNORECASE
 from sublime import Region
 
 from NeoVintageous.nv.vi import units
 from NeoVintageous.nv.vi import utils
+from NeoVintageous.nv.vi.brackets import find_enclosing_brackets
+from NeoVintageous.nv.vi.brackets import find_lone_closing_bracket
+from NeoVintageous.nv.vi.brackets import find_lone_opening_bracket
 from NeoVintageous.nv.vi.search import find_in_range
 from NeoVintageous.nv.vi.search import reverse_search_by_pt
+from NeoVintageous.nv.vi.tags import find_containing_element
 from NeoVintageous.nv.vi.utils import resolve_insertion_point_at_b
 
 
-RX_ANY_TAG = r'</?([0-9A-Za-z-]+).*?>'
-RX_ANY_TAG_NAMED_TPL = r'</?({0}) *?.*?>'
 RXC_ANY_TAG = re.compile(r'</?([0-9A-Za-z]+).*?>')
 # According to the HTML 5 editor's draft, only 0-9A-Za-z characters can be
 # used in tag names. TODO: This won't be enough in Dart Polymer projects,
@@ -286,7 +287,7 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
         return s
 
     if type_ == TAG:
-        begin_tag, end_tag, _ = find_containing_tag(view, s.b)
+        begin_tag, end_tag, _ = find_containing_element(view, s.b, count)
 
         if not (begin_tag and end_tag):
             return s
@@ -301,20 +302,20 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
 
     if type_ == BRACKET:
         b = resolve_insertion_point_at_b(s)
-        opening = find_prev_lone_bracket(view, b, delims)
-        closing = find_next_lone_bracket(view, b, delims)
-
-        if not (opening and closing):
+        pair = find_enclosing_brackets(view, b, _bracket_chars(delims), count=count)
+        if not pair:
             return s
 
+        opening, closing = pair
+
         if inclusive:
-            return Region(opening.a, closing.b)
+            return Region(opening, closing + 1)
 
-        a = opening.a + 1
+        a = opening + 1
         if view.substr(a) == '\n':
             a += 1
 
-        return Region(a, closing.b - 1)
+        return Region(a, closing)
 
     if type_ == QUOTE:
         # Vim only operates on the current line.
@@ -389,115 +390,28 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
     return s
 
 
-def find_next_lone_bracket(view, start, items, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-    new_start = start
-    for i in range(unbalanced or 1):
-        next_closing_bracket = find_in_range(
-            view,
-            items[1],
-            start=new_start,
-            end=view.size(),
-            flags=IGNORECASE
-        )
-
-        if next_closing_bracket is None:
-            # Unbalanced items; nothing we can do.
-            return
-
-        while view.substr(next_closing_bracket.begin() - 1) == '\\':
-            next_closing_bracket = find_in_range(view, items[1],
-                                                 start=next_closing_bracket.end(),
-                                                 end=view.size(),
-                                                 flags=IGNORECASE)
-            if next_closing_bracket is None:
-                return
-
-        new_start = next_closing_bracket.end()
-
-    if view.substr(start) == items[0][-1]:
-        start += 1
-
-    nested = 0
-    while True:
-        next_opening_bracket = find_in_range(view, items[0],
-                                             start=start,
-                                             end=next_closing_bracket.b,
-                                             flags=IGNORECASE)
-        if not next_opening_bracket:
-            break
-
-        nested += 1
-        start = next_opening_bracket.end()
-
-    if nested > 0:
-        return find_next_lone_bracket(view, next_closing_bracket.end(),
-                                      items,
-                                      nested)
-    else:
-        return next_closing_bracket
-
-
-def find_prev_lone_bracket(view, start, tags, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-
-    # XXX: refactor this
-    if view.substr(start) == (tags[0][1] if len(tags[0]) > 1 else tags[0]):
-        if not unbalanced and view.substr(start - 1) != '\\':
-            return Region(start, start + 1)
-
-    new_start = start
-    for i in range(unbalanced or 1):
-        prev_opening_bracket = reverse_search_by_pt(view, tags[0],
-                                                    start=0,
-                                                    end=new_start,
-                                                    flags=IGNORECASE)
-
-        if prev_opening_bracket is None:
-            # Check whether the caret is exactly at a bracket.
-            # Tag names may be escaped, so slice them.
-            if (i == 0 and view.substr(start) == tags[0][-1] and
-               view.substr(start - 1) != '\\'):
-                    return Region(start, start + 1)
-            # Unbalanced tags; nothing we can do.
-            return
-
-        while view.substr(prev_opening_bracket.begin() - 1) == '\\':
-            prev_opening_bracket = reverse_search_by_pt(
-                view,
-                tags[0],
-                start=0,
-                end=prev_opening_bracket.begin(),
-                flags=IGNORECASE
-            )
-
-            if prev_opening_bracket is None:
-                return
+def _bracket_chars(items):
+    # type: (tuple) -> tuple
+    # Bracket items may be regex escaped, e.g. ('\\(', '\\)').
+    return (items[0][-1], items[1][-1])
 
-        new_start = prev_opening_bracket.begin()
 
-    nested = 0
-    while True:
-        next_closing_bracket = reverse_search_by_pt(view,
-                                                    tags[1],
-                                                    start=prev_opening_bracket.a,
-                                                    end=start,
-                                                    flags=IGNORECASE)
-        if not next_closing_bracket:
-            break
+def find_next_lone_bracket(view, start, items):
+    # type: (...) -> Region
+    # Returns:
+    #   Region|None
+    pt = find_lone_closing_bracket(view, start, _bracket_chars(items))
+    if pt is not None:
+        return Region(pt, pt + 1)
 
-        nested += 1
-        start = next_closing_bracket.begin()
 
-    if nested > 0:
-        return find_prev_lone_bracket(view,
-                                      prev_opening_bracket.begin(),
-                                      tags,
-                                      nested)
-    else:
-        return prev_opening_bracket
+def find_prev_lone_bracket(view, start, items):
+    # type: (...) -> Region
+    # Returns:
+    #   Region|None
+    pt = find_lone_opening_bracket(view, start, _bracket_chars(items))
+    if pt is not None:
+        return Region(pt, pt + 1)
 
 
 def find_paragraph_text_object(view, s, inclusive=True, count=1):
@@ -711,140 +625,3 @@ def word_end_reverse(view, pt, count=1, big=False):
             break
 
     return max(t - 1, 0)
-
-
-def next_end_tag(view, pattern=RX_ANY_TAG, start=0, end=-1):
-    # Args:
-    #   view (sublime.View)
-    #   pattern (str)
-    #   start (int)
-    #   end (int)
-    #
-    # Returns:
-    #   tuple[Region, str, bool]
-    #   typle[None, None, None]
-    region = view.find(pattern, start, IGNORECASE)
-    if region.a == -1:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-
-    return (region, match.group(1), match.group(0).startswith('</'))
-
-
-def previous_begin_tag(view, pattern, start=0, end=0):
-    assert pattern, 'bad call'
-    region = reverse_search_by_pt(view, pattern, start, end, IGNORECASE)
-    if not region:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-
-    return (region, match.group(1), match.group(0)[1] != '/')
-
-
-def get_region_end(r):
-    return {'start': r.end()}
-
-
-def get_region_begin(r):
-    return {'start': 0, 'end': r.begin()}
-
-
-def get_closest_tag(view, pt):
-    # Args:
-    #   view (sublime.View)
-    #   pt (int)
-    #
-    # Returns:
-    #   tuple[int, Region]
-    #   tuple[None, None]
-    substr = view.substr
-    while pt > 0 and substr(pt) != '<':
-        pt -= 1
-
-    if substr(pt) != '<':
-        return None, None
-
-    next_tag = view.find(RX_ANY_TAG, pt)
-    if next_tag.a != pt:
-        return None, None
-
-    return pt, next_tag
-
-
-def find_containing_tag(view, start):
-    # Args:
-    #   view (sublime.View)
-    #   start (int)
-    #
-    # Returns:
-    #   tuple[Region, Region, str]
-    #   tuple[None, None, None]
-    _, closest_tag = get_closest_tag(view, start)
-
-    if not closest_tag:
-        return None, None, None
-
-    start = closest_tag.a if ((closest_tag.contains(start)) and
-                              (view.substr(closest_tag)[1] == '/')) else start
-
-    end_region, tag_name = next_unbalanced_tag(
-        view,
-        search=next_end_tag,
-        search_args={'pattern': RX_ANY_TAG, 'start': start},
-        restart_at=get_region_end
-    )
-
-    if not end_region:
-        return None, None, None
-
-    begin_region, _ = next_unbalanced_tag(
-        view,
-        search=previous_begin_tag,
-        search_args={
-            'pattern': RX_ANY_TAG_NAMED_TPL.format(tag_name),
-            'start': 0,
-            'end': end_region.a
-        },
-        restart_at=get_region_begin
-    )
-
-    if not end_region:
-        return None, None, None
-
-    return begin_region, end_region, tag_name
-
-
-def next_unbalanced_tag(view, search=None, search_args={}, restart_at=None, tags=[]):
-    # Args:
-    #   view (sublime.View)
-    #   search (callable)
-    #   search_args (dict)
-    #   restart_at (callable)
-    #   tags (list[str])
-    #
-    # Returns:
-    #   tuple[Region, str]
-    #   tuple[None, None]
-    assert search and restart_at, 'wrong call'
-    region, tag, is_end_tag = search(view, **search_args)
-
-    if not region:
-        return None, None
-
-    if not is_end_tag:
-        tags.append(tag)
-        search_args.update(restart_at(region))
-
-        return next_unbalanced_tag(view, search, search_args, restart_at, tags)
-
-    if not tags or (tag not in tags):
-        return region, tag
-
-    while tag != tags.pop():
-        continue
-
-    search_args.update(restart_at(region))
-
-    return next_unbalanced_tag(view, search, search_args, restart_at, tags)
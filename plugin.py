@@ -184,3 +184,10 @@ def plugin_unloaded():
     except Exception:
         import traceback
         traceback.print_exc()
+
+    try:
+        from NeoVintageous.nv.shada import shada_flush
+        shada_flush()
+    except Exception:
+        import traceback
+        traceback.print_exc()
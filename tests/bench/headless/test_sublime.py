@@ -0,0 +1,266 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.bench.headless import sublime as headless
+
+
+class _HeadlessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.view = headless.View()
+
+    def write(self, text):
+        self.view._modify(0, self.view.size(), text)
+
+    def edit(self):
+        return self.view.begin_edit(object(), 'test')
+
+
+class TestRegion(unittest.TestCase):
+
+    def test_begin_end_and_size(self):
+        self.assertEqual(headless.Region(5, 2).begin(), 2)
+        self.assertEqual(headless.Region(5, 2).end(), 5)
+        self.assertEqual(headless.Region(5, 2).size(), 3)
+        self.assertEqual(len(headless.Region(2, 5)), 3)
+        self.assertTrue(headless.Region(3).empty())
+
+    def test_equality_and_ordering(self):
+        self.assertEqual(headless.Region(1, 2), headless.Region(1, 2))
+        self.assertNotEqual(headless.Region(1, 2), headless.Region(2, 1))
+        self.assertTrue(headless.Region(1, 2) < headless.Region(1, 3))
+        self.assertTrue(headless.Region(1, 9) < headless.Region(2, 3))
+
+    def test_cover_keeps_direction(self):
+        self.assertEqual(headless.Region(2, 4).cover(headless.Region(6, 8)), headless.Region(2, 8))
+        self.assertEqual(headless.Region(4, 2).cover(headless.Region(6, 8)), headless.Region(8, 2))
+
+    def test_intersection(self):
+        self.assertEqual(headless.Region(2, 6).intersection(headless.Region(4, 8)), headless.Region(4, 6))
+        self.assertEqual(headless.Region(2, 4).intersection(headless.Region(4, 8)), headless.Region(0))
+        self.assertTrue(headless.Region(2, 6).intersects(headless.Region(4, 8)))
+        self.assertFalse(headless.Region(2, 4).intersects(headless.Region(4, 8)))
+
+    def test_contains(self):
+        self.assertTrue(headless.Region(2, 6).contains(2))
+        self.assertTrue(headless.Region(2, 6).contains(6))
+        self.assertFalse(headless.Region(2, 6).contains(7))
+        self.assertTrue(headless.Region(2, 6).contains(headless.Region(3, 4)))
+
+
+class TestSelection(_HeadlessTestCase):
+
+    def test_regions_are_sorted_and_merged(self):
+        self.write('x' * 20)
+        sel = self.view.sel()
+        sel.clear()
+        sel.add(headless.Region(10, 12))
+        sel.add(headless.Region(1, 3))
+        sel.add(headless.Region(11, 15))
+        sel.add(headless.Region(3))
+        self.assertEqual(list(sel), [headless.Region(1, 3), headless.Region(10, 15)])
+
+    def test_regions_are_clamped_to_the_buffer(self):
+        self.write('abc')
+        self.view.sel().clear()
+        self.view.sel().add(headless.Region(1, 10))
+        self.assertEqual(self.view.sel()[0], headless.Region(1, 3))
+
+    def test_subtract(self):
+        self.write('x' * 20)
+        sel = self.view.sel()
+        sel.clear()
+        sel.add_all([headless.Region(1), headless.Region(5)])
+        sel.subtract(headless.Region(1))
+        self.assertEqual(list(sel), [headless.Region(5)])
+
+    def test_selection_follows_modifications(self):
+        self.write('abc def')
+        self.view.sel().clear()
+        self.view.sel().add(headless.Region(4))
+        edit = self.edit()
+        self.view.insert(edit, 0, 'xx')
+        self.view.insert(edit, 6, 'yy')
+        self.assertEqual(self.view.sel()[0], headless.Region(8))
+        self.view.erase(edit, headless.Region(0, 9))
+        self.view.end_edit(edit)
+        self.assertEqual(self.view.sel()[0], headless.Region(0))
+
+
+class TestSettings(unittest.TestCase):
+
+    def test_values_are_copies(self):
+        settings = headless.Settings()
+        value = {'a': [1]}
+        settings.set('x', value)
+        value['a'].append(2)
+        self.assertEqual(settings.get('x'), {'a': [1]})
+        self.assertEqual(settings.get('y', 'default'), 'default')
+
+    def test_falls_back_to_parent(self):
+        parent = headless.Settings()
+        parent.set('x', 1)
+        settings = headless.Settings(parent)
+        self.assertEqual(settings.get('x'), 1)
+        settings.set('x', 2)
+        self.assertEqual(settings.get('x'), 2)
+        settings.erase('x')
+        self.assertEqual(settings.get('x'), 1)
+
+
+class TestViewText(_HeadlessTestCase):
+
+    def test_substr(self):
+        self.write('abc')
+        self.assertEqual(self.view.substr(1), 'b')
+        self.assertEqual(self.view.substr(3), '\x00')
+        self.assertEqual(self.view.substr(-1), '\x00')
+        self.assertEqual(self.view.substr(headless.Region(2, 0)), 'ab')
+
+    def test_rowcol_and_text_point(self):
+        self.write('ab\ncde\n\nf')
+        self.assertEqual(self.view.rowcol(0), (0, 0))
+        self.assertEqual(self.view.rowcol(2), (0, 2))
+        self.assertEqual(self.view.rowcol(3), (1, 0))
+        self.assertEqual(self.view.rowcol(7), (2, 0))
+        self.assertEqual(self.view.rowcol(9), (3, 1))
+        self.assertEqual(self.view.text_point(1, 2), 5)
+        self.assertEqual(self.view.text_point(3, 0), 8)
+        self.assertEqual(self.view.text_point(10, 0), 9)
+
+    def test_line_and_full_line(self):
+        self.write('ab\ncde\n\nf')
+        self.assertEqual(self.view.line(4), headless.Region(3, 6))
+        self.assertEqual(self.view.full_line(4), headless.Region(3, 7))
+        self.assertEqual(self.view.line(7), headless.Region(7, 7))
+        self.assertEqual(self.view.full_line(9), headless.Region(8, 9))
+        self.assertEqual(self.view.line(headless.Region(1, 4)), headless.Region(0, 6))
+        self.assertEqual(self.view.lines(headless.Region(1, 9)), [
+            headless.Region(0, 2),
+            headless.Region(3, 6),
+            headless.Region(7, 7),
+            headless.Region(8, 9),
+        ])
+        self.assertEqual(self.view.lines(headless.Region(0, 7)), [headless.Region(0, 2), headless.Region(3, 6)])
+
+    def test_line_index_is_updated_after_modifications(self):
+        self.write('a\nb\nc\nd')
+        edit = self.edit()
+        self.view.insert(edit, 4, 'x\ny\n')
+        self.assertEqual(self.view.rowcol(self.view.size()), (5, 1))
+        self.view.erase(edit, headless.Region(0, 2))
+        self.assertEqual(self.view.rowcol(self.view.size()), (4, 1))
+        self.assertEqual(self.view.substr(self.view.line(self.view.text_point(1, 0))), 'x')
+        self.view.end_edit(edit)
+
+    def test_edit_is_invalid_after_end_edit(self):
+        edit = self.edit()
+        self.view.end_edit(edit)
+        with self.assertRaises(ValueError):
+            self.view.insert(edit, 0, 'x')
+
+    def test_change_count(self):
+        count = self.view.change_count()
+        edit = self.edit()
+        self.view.insert(edit, 0, 'x')
+        self.view.end_edit(edit)
+        self.assertEqual(self.view.change_count(), count + 1)
+
+
+class TestViewClassify(_HeadlessTestCase):
+
+    def test_classify(self):
+        self.write('fizz.buzz\n\nfooBar')
+        word_start = headless.CLASS_WORD_START | headless.CLASS_SUB_WORD_START
+        word_end = headless.CLASS_WORD_END | headless.CLASS_SUB_WORD_END
+        self.assertEqual(self.view.classify(0), word_start | headless.CLASS_LINE_START)
+        self.assertEqual(self.view.classify(4), word_end | headless.CLASS_PUNCTUATION_START)
+        self.assertEqual(self.view.classify(5), word_start | headless.CLASS_PUNCTUATION_END)
+        self.assertTrue(self.view.classify(10) & headless.CLASS_EMPTY_LINE)
+        self.assertTrue(self.view.classify(14) & headless.CLASS_SUB_WORD_START)
+        self.assertFalse(self.view.classify(14) & headless.CLASS_WORD_START)
+
+    def test_find_by_class(self):
+        self.write('fizz buzz fizz')
+        self.assertEqual(self.view.find_by_class(0, True, headless.CLASS_WORD_START), 5)
+        self.assertEqual(self.view.find_by_class(10, True, headless.CLASS_WORD_START), 14)
+        self.assertEqual(self.view.find_by_class(10, False, headless.CLASS_WORD_START), 5)
+        self.assertEqual(self.view.find_by_class(3, False, headless.CLASS_WORD_START), 0)
+
+    def test_word(self):
+        self.write('fizz buzz')
+        self.assertEqual(self.view.word(6), headless.Region(5, 9))
+        self.assertEqual(self.view.word(headless.Region(1, 2)), headless.Region(0, 4))
+
+
+class TestViewFind(_HeadlessTestCase):
+
+    def test_find(self):
+        self.write('fizz buzz\nFIZZ')
+        self.assertEqual(self.view.find('fizz', 0), headless.Region(0, 4))
+        self.assertEqual(self.view.find('fizz', 1), headless.Region(-1, -1))
+        self.assertEqual(self.view.find('fizz', 1, headless.IGNORECASE), headless.Region(10, 14))
+        self.assertEqual(self.view.find('^FIZZ$', 0), headless.Region(10, 14))
+        self.assertEqual(self.view.find('z.', 0, headless.LITERAL), headless.Region(-1, -1))
+
+    def test_find_all_with_extractions(self):
+        self.write('a=1\nb=2')
+        extractions = []
+        regions = self.view.find_all('(\\w)=(\\d)', 0, '$2$1', extractions)
+        self.assertEqual(regions, [headless.Region(0, 3), headless.Region(4, 7)])
+        self.assertEqual(extractions, ['1a', '2b'])
+
+
+class TestViewRegions(_HeadlessTestCase):
+
+    def test_regions_follow_modifications(self):
+        self.write('fizz buzz')
+        self.view.add_regions('test', [headless.Region(5, 9)])
+        edit = self.edit()
+        self.view.insert(edit, 0, 'xx')
+        self.view.end_edit(edit)
+        self.assertEqual(self.view.get_regions('test'), [headless.Region(7, 11)])
+        self.view.erase_regions('test')
+        self.assertEqual(self.view.get_regions('test'), [])
+
+
+class TestViewUndo(_HeadlessTestCase):
+
+    def test_undo_and_redo_edit_groups(self):
+        self.write('fizz')
+        edit = self.edit()
+        self.view.insert(edit, 4, ' buzz')
+        self.view.erase(edit, headless.Region(0, 1))
+        self.view.end_edit(edit)
+        self.assertEqual(self.view.substr(headless.Region(0, self.view.size())), 'izz buzz')
+        self.view._undo()
+        self.assertEqual(self.view.substr(headless.Region(0, self.view.size())), 'fizz')
+        self.view._redo()
+        self.assertEqual(self.view.substr(headless.Region(0, self.view.size())), 'izz buzz')
+
+    def test_glue_marked_undo_groups(self):
+        self.write('')
+        self.view._mark_undo_groups_for_gluing()
+        for c in 'abc':
+            edit = self.edit()
+            self.view.insert(edit, self.view.size(), c)
+            self.view.end_edit(edit)
+        self.view._glue_marked_undo_groups()
+        self.view._undo()
+        self.assertEqual(self.view.size(), 0)
@@ -0,0 +1,58 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.bench.buffers import KINDS
+from NeoVintageous.bench.buffers import generate
+from NeoVintageous.bench.buffers import matrix
+
+
+class TestGenerate(unittest.TestCase):
+
+    def test_code_and_prose_have_the_number_of_lines_requested(self):
+        for kind in ('code', 'prose'):
+            self.assertEqual(generate(kind, 100).count('\n'), 100)
+
+    def test_json_is_minified_valid_json(self):
+        text = generate('json', 100)
+        self.assertEqual(text.count('\n'), 1)
+        self.assertIsInstance(json.loads(text), list)
+
+    def test_is_deterministic(self):
+        for kind in KINDS:
+            self.assertEqual(generate(kind, 50), generate(kind, 50))
+
+    def test_code_brackets_are_balanced(self):
+        text = generate('code', 200)
+        for opening, closing in ('()', '[]', '{}'):
+            self.assertEqual(text.count(opening), text.count(closing))
+
+
+class TestMatrix(unittest.TestCase):
+
+    def test_matrix(self):
+        self.assertEqual(matrix(['code'], [10], [1, 100], 1000), [
+            ('code', 10, 1, 1000),
+            ('code', 10, 1, 1),
+            ('code', 10, 100, 1),
+        ])
+
+    def test_matrix_does_not_repeat_cases(self):
+        self.assertEqual(matrix(['code'], [10], [1], 1), [('code', 10, 1, 1)])
@@ -0,0 +1,67 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import json
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.bench.runner import _median
+from NeoVintageous.bench.runner import case
+from NeoVintageous.bench.runner import run_case
+from NeoVintageous.bench.runner import run_cases
+from NeoVintageous.bench.runner import write_results
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_median(self):
+        self.assertEqual(_median([3, 1, 2]), 2)
+        self.assertEqual(_median([4, 1, 2, 3]), 2.5)
+
+    def test_run_case(self):
+        calls = []
+        result = run_case(case('test/case', lambda: calls.append('run'), lambda: calls.append('setup'), x=1), 3)
+        self.assertEqual(calls, ['setup', 'run'] * 3)
+        self.assertEqual(result['name'], 'test/case')
+        self.assertEqual(result['params'], {'x': 1})
+        self.assertEqual(result['repeat'], 3)
+        self.assertEqual(len(result['timings']), 3)
+        self.assertEqual(result['min'], min(result['timings']))
+        self.assertEqual(result['max'], max(result['timings']))
+        self.assertNotIn('error', result)
+
+    def test_run_case_reports_errors(self):
+        def run():
+            raise ValueError('fizz')
+
+        result = run_case(case('test/error', run), 3)
+        self.assertEqual(result['error'], 'ValueError: fizz')
+        self.assertNotIn('timings', result)
+
+    def test_run_cases_reports_progress(self):
+        progress = io.StringIO()
+        results = run_cases([case('test/a', lambda: None), case('test/b', lambda: None)], 1, progress)
+        self.assertEqual([r['name'] for r in results], ['test/a', 'test/b'])
+        self.assertEqual(len(progress.getvalue().splitlines()), 2)
+
+    def test_write_results(self):
+        out = io.StringIO()
+        write_results([run_case(case('test/a', lambda: None), 1)], out)
+        document = json.loads(out.getvalue())
+        self.assertIn('python', document['meta'])
+        self.assertEqual(document['results'][0]['name'], 'test/a')
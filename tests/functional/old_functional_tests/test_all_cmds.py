@@ -22,6 +22,7 @@ import unittest
 
 from sublime import active_window
 
+from NeoVintageous.tests.unittest import isolate_state_file
 from NeoVintageous.tests.unittest import Region
 
 
@@ -227,6 +228,7 @@ class TestAllCommands(CommandTestCase):
 
     def setUp(self):
         self.path_to_test_specs = _path_to_test_specs
+        isolate_state_file(self)
 
     def test_all(self):
         self.reset()
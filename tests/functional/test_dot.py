@@ -0,0 +1,73 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.cmds import _nv_process_notation
+from NeoVintageous.nv.cmds_vi_actions import _vi_dot
+from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+from NeoVintageous.nv.vim import NORMAL
+
+
+@unittest.mock.patch.object(_vi_dot, '_compiled', (None, None))
+class Test_dot(unittest.FunctionalTestCase):
+
+    def feed_keys(self, keys):
+        for key in KeySequenceTokenizer(keys).iter_tokenize():
+            self.view.window().run_command('_nv_feed_key', {'key': key})
+
+    def test_repeats_are_run_without_processing_keys_again(self):
+        self.normal('|one two three four five')
+        self.feed_keys('dw')
+        self.feed_keys('.')
+        self.assertNormal('|three four five')
+        self.assertIsNotNone(_vi_dot._compiled[0])
+        with unittest.mock.patch.object(_nv_process_notation, 'run') as run:
+            self.feed_keys('.')
+            self.feed_keys('.')
+            self.assertEqual(0, run.call_count)
+
+        self.assertNormal('|five')
+
+    def test_repeats_insertions(self):
+        self.normal('|a\nb\nc\n')
+        self.state.repeat_data = ('vi', 'A;<Esc>', NORMAL, None)
+        self.feed_keys('.j.j.')
+        self.assertContent('a;\nb;\nc;\n')
+
+    def test_repeats_with_a_count(self):
+        self.normal('|abcdefgh')
+        self.feed_keys('x2..3.')
+        self.assertNormal('|h')
+
+    def test_repeats_with_leading_motions_process_keys(self):
+        self.normal('|abcdefgh')
+        self.state.repeat_data = ('vi', 'lx', NORMAL, None)
+        self.feed_keys('.')
+        self.assertNormal('a|cdefgh')
+        self.assertIsNone(_vi_dot._compiled[0])
+
+    def test_repeats_of_motions_that_use_the_last_search_are_translated_again(self):
+        self.normal('|1x2x3x4x5y6y7y8y')
+        self.feed_keys('fxd;.0fy0.')
+        self.assertNormal('|6y7y8y')
+        self.assertIsNone(_vi_dot._compiled[0])
+
+    def test_repeats_of_searches_set_the_last_search_again(self):
+        self.normal('|axaxbyaxbx')
+        self.feed_keys('dfx.fy0.;')
+        self.assertNormal('b|x')
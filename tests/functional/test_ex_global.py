@@ -0,0 +1,73 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+
+class Test_ex_global(unittest.FunctionalTestCase):
+
+    def test_delete(self):
+        self.eq('a\n\n|b\n\n\nc\n', ':global/^$/delete', 'a\nb\n|c\n')
+        self.eq('a\n\n|b\n\n\nc\n', ':g/^$/d', 'a\nb\n|c\n')
+        self.eq('|x1\na\nx2\nb\nx3', ':global/x/delete', 'a\nb\n|')
+        self.assertRegister('"', 'x3\n')
+        self.eq('|x\nx\na\nx\nx\nb\nx\n', ':global/x/delete', 'a\nb\n|')
+
+    def test_delete_not_matching(self):
+        self.eq('|x1\na\nx2\nb\nx3\n', ':global!/x/delete', 'x1\nx2\n|x3\n')
+        self.eq('|x1\na\nx2\nb\nx3\n', ':vglobal/x/delete', 'x1\nx2\n|x3\n')
+        self.eq('|x1\na\nx2\nb\nx3\n', ':v/x/d', 'x1\nx2\n|x3\n')
+        self.eq('|x1\na\nx2\nb\nx3\n', ':vg/x/d', 'x1\nx2\n|x3\n')
+
+    def test_range(self):
+        self.eq('|x1\nx2\nx3\nx4\n', ':2,3global/x/delete', 'x1\n|x4\n')
+
+    def test_substitute(self):
+        self.eq('|ab\nxab\nab\nxab\n', ':global/x/substitute/a/b/', 'ab\nxbb\nab\n|xbb\n')
+        self.eq('|ab\nxab\nab\nxab\n', ':vglobal/x/s/b/c/', 'ac\nxab\n|ac\nxab\n')
+
+    def test_command_with_a_range(self):
+        self.eq('|x\n1\nx\n2\n3\n', ':global/x/.,+1delete', '|3\n')
+
+    def test_move(self):
+        self.eq('|1\n2\n3\n', ':global/^/move 0', '|3\n2\n1\n')
+
+    def test_undo_is_a_single_step(self):
+        self.eq('|x\n1\nx\n2\n', ':global/x/.delete', '1\n|2\n')
+        self.view.run_command('undo')
+        self.assertContent('x\n1\nx\n2\n')
+
+    def test_not_found(self):
+        self.eq('|a\nb\n', ':global/x/delete', '|a\nb\n')
+        self.eq('|a\nb\n', ':vglobal/./delete', '|a\nb\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.message')
+    def test_unknown_command(self, message):
+        self.eq('|a\nb\n', ':global/a/nosuchcmd', '|a\nb\n')
+        message.assert_called_once_with('E492: Not an editor command')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.message')
+    def test_normal_is_not_an_editor_command(self, message):
+        self.eq('|a\nb\n', ':global/a/normal x', '|a\nb\n')
+        message.assert_called_once_with('E492: Not an editor command')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.message')
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.mappings_add')
+    def test_command_that_does_not_support_global(self, mappings_add, message):
+        self.eq('|a\nb\n', ':global/a/noremap x y', '|a\nb\n')
+        message.assert_called_once_with('command does not support :global')
+        self.assertEqual(0, mappings_add.call_count)
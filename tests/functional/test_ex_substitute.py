@@ -17,6 +17,8 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.ex_cmds import do_ex_substitute_confirm
+
 
 class Test_ex_substitute(unittest.FunctionalTestCase):
 
@@ -73,3 +75,83 @@ class Test_ex_substitute(unittest.FunctionalTestCase):
         self.eq('aa\nb|b\ncc\n', ':%substitute/$/,/', 'aa,\nbb,\n|cc,\n')
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/g', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._LINES_CHUNK_SIZE', 4)
+    def test_ranges_larger_than_a_chunk(self):
+        self.eq('ax\n|bxxxxxxb\ncx\n\ndx', ':%substitute/x/y/', 'ay\nbyxxxxxb\ncy\n\n|dy')
+        self.eq('ax\n|bxxxxxxb\ncx\n\ndx', ':%substitute/x/y/g', 'ay\nbyyyyyyb\ncy\n\n|dy')
+        self.eq('ax\n|bxxxxxxb\ncx\n\ndx\n', ':%substitute/$/,/', 'ax,\nbxxxxxxb,\ncx,\n,\n|dx,\n')
+
+    def test_replacement_can_add_lines(self):
+        self.eq('axa\n|bxb\ncxc\n', ':1,2substitute/x/\\n/', 'a\na\nb\n|b\ncxc\n')
+
+
+@unittest.mock.patch('sublime.Window.show_input_panel')
+class Test_ex_substitute_confirm(unittest.FunctionalTestCase):
+
+    def confirm(self, keys):
+        for key in keys:
+            do_ex_substitute_confirm(self.view, key)
+
+    def test_yes_and_no(self, show_input_panel):
+        self.normal('|axa\nbxb\ncxc\ndxd\n')
+        self.feed(':%substitute/x/yyy/c')
+        self.assertEqual(1, show_input_panel.call_count)
+        self.assertEqual([self.Region(1, 2)], self.view.get_regions('s_confirm'))
+        self.confirm('yny')
+        self.assertContent('ayyya\nbxb\ncyyyc\ndxd\n')
+        self.assertEqual([self.Region(17, 18)], self.view.get_regions('s_confirm'))
+        self.confirm('n')
+        self.assertContent('ayyya\nbxb\ncyyyc\ndxd\n')
+        self.assertSelection(10)
+        self.assertEqual([], self.view.get_regions('s_confirm'))
+        self.assertEqual([], self.view.get_regions('s_confirm_matches'))
+
+    def test_all(self, show_input_panel):
+        self.normal('|axa\nbxb\ncxc\n')
+        self.feed(':%substitute/x/yyy/c')
+        self.confirm('na')
+        self.assertContent('axa\nbyyyb\ncyyyc\n')
+        self.assertSelection(10)
+
+    def test_last(self, show_input_panel):
+        self.normal('|axa\nbxb\ncxc\n')
+        self.feed(':%substitute/x/yyy/c')
+        self.confirm('nl')
+        self.assertContent('axa\nbyyyb\ncxc\n')
+        self.assertFalse(do_ex_substitute_confirm(self.view, 'y'))
+        self.assertContent('axa\nbyyyb\ncxc\n')
+
+    def test_quit(self, show_input_panel):
+        self.normal('|axa\nbxb\ncxc\n')
+        self.feed(':%substitute/x/yyy/gc')
+        self.confirm('yq')
+        self.assertContent('ayyya\nbxb\ncxc\n')
+        self.assertEqual([], self.view.get_regions('s_confirm'))
+
+    def test_undo_undoes_the_whole_session(self, show_input_panel):
+        self.normal('|axa\nbxb\ncxc\n')
+        self.feed(':%substitute/x/yyy/c')
+        self.confirm('yny')
+        self.assertContent('ayyya\nbxb\ncyyyc\n')
+        self.view.run_command('undo')
+        self.assertContent('axa\nbxb\ncxc\n')
+
+    def test_finishing_enters_normal_mode(self, show_input_panel):
+        for keys in ('yq', 'l', 'a', 'nnn'):
+            self.visual('|axa\nbxb\nc|xc\n')
+            self.feed(':\'<,\'>substitute/x/yyy/c')
+            self.confirm(keys)
+            self.assertNormalMode()
+
+    def test_other_keys_are_ignored(self, show_input_panel):
+        self.normal('|axa\nbxb\n')
+        self.feed(':%substitute/x/y/c')
+        self.assertTrue(do_ex_substitute_confirm(self.view, 'z'))
+        self.confirm('y')
+        self.assertContent('aya\nbxb\n')
+
+    def test_not_found(self, show_input_panel):
+        self.normal('|axa\nbxb\n')
+        self.feed(':%substitute/z/y/c')
+        self.assertFalse(show_input_panel.called)
@@ -0,0 +1,73 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import plugin
+from NeoVintageous.nv.vi import keys
+from NeoVintageous.nv.vim import NORMAL
+
+
+class _PluginBlankUp(plugin.ViOperatorDef):
+    def translate(self, state):
+        return {
+            'action': '_nv_unimpaired',
+            'action_args': {
+                'mode': state.mode,
+                'count': state.count,
+                'action': 'blank_up'
+            }
+        }
+
+
+class Test_feed_key(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Q is not mapped, nor is it a namespace command, so Qx is only known
+        # by the plugin. The dispatch tables are built again without it.
+        for patcher in (unittest.mock.patch.dict(plugin.mappings[NORMAL], {'Qx': _PluginBlankUp()}),
+                        unittest.mock.patch.dict(plugin.classes, {'_PluginBlankUp': _PluginBlankUp})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        keys.clear_dispatch_tables()
+        self.addCleanup(keys.clear_dispatch_tables)
+
+    def feed_keys(self, keys):
+        for key in keys:
+            self.view.window().run_command('_nv_feed_key', {'key': key})
+
+    def test_unmapped_prefix_of_plugin_sequence_keeps_collecting_keys(self):
+        self.normal('f|izz\nbuzz\n')
+        self.feed_keys('Q')
+        self.assertEqual('Q', self.state.partial_sequence)
+        self.feed_keys('x')
+        self.assertNormal('\n|fizz\nbuzz\n')
+
+    def test_operator_pending_prefix_of_plugin_sequence_still_resolves_commands(self):
+        # The surround plugin maps ds and cs in operator pending mode, so d and
+        # c are command prefixes there too.
+        self.normal('a\nb|b\nc\n')
+        self.feed_keys('dd')
+        self.assertNormal('a\n|c\n')
+        self.normal('a\nb|b\nc\n')
+        self.feed_keys('cc')
+        self.assertInsert('a\n|\nc\n')
+        self.normal('a(b|b)c\n')
+        self.feed_keys('ds(')
+        self.assertNormal('a|bbc\n')
@@ -0,0 +1,45 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.cmds import _nv_process_notation
+
+
+class Test_process_notation(unittest.FunctionalTestCase):
+
+    def process_notation(self, keys):
+        self.view.window().run_command('_nv_process_notation', {'keys': keys})
+
+    def test_motions_and_actions(self):
+        self.normal('one |two three four')
+        self.process_notation('wdw')
+        self.assertNormal('one two |four')
+
+    @unittest.mock.patch.object(_nv_process_notation, '_insert', autospec=True, side_effect=_nv_process_notation._insert)  # noqa: E501
+    def test_inserted_characters_are_coalesced(self, _insert):
+        self.normal('fi|zz')
+        self.process_notation('ibar<Esc>')
+        self.assertNormal('fibar|zz')
+        self.assertEqual([unittest.mock.call(unittest.mock.ANY, 'bar')], _insert.call_args_list[:1])
+
+    @unittest.mock.patch.object(_nv_process_notation, '_insert', autospec=True, side_effect=_nv_process_notation._insert)  # noqa: E501
+    def test_newlines_and_tabs_are_inserted_on_their_own(self, _insert):
+        self.normal('fi|zz')
+        self.process_notation('ia<CR>b<Tab>c<Esc>')
+        self.assertNormal('fia\nb\tc|zz')
+        self.assertEqual(['a', '\n', 'b', '\t', 'c'], [c[0][1] for c in _insert.call_args_list if c[0][1]])
@@ -0,0 +1,61 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+
+
+@unittest.mock.patch.object(State, 'macro_registers', {})
+@unittest.mock.patch.object(State, 'macro_steps', [])
+class Test_q(unittest.FunctionalTestCase):
+
+    def feed_keys(self, keys):
+        for key in KeySequenceTokenizer(keys).iter_tokenize():
+            self.view.window().run_command('_nv_feed_key', {'key': key})
+
+    def test_records_runs_of_motions_as_one_step(self):
+        self.normal('|one two three four five six')
+        self.feed_keys('qawwxlllq')
+        self.assertEqual(
+            ['_vi_w', '_vi_x', '_vi_l'],
+            [cmd for cmd, args in State.macro_registers['a']])
+        self.assertEqual(2, State.macro_registers['a'][0][1]['count'])
+        self.assertEqual(3, State.macro_registers['a'][2][1]['count'])
+
+    def test_runs_a_macro_count_times(self):
+        self.normal('|a1\na2\na3\na4\na5\n')
+        self.feed_keys('qaxjq')
+        self.feed_keys('3@a')
+        self.assertNormal('1\n2\n3\n4\n|a5\n')
+
+    def test_running_a_macro_does_not_change_the_macro(self):
+        self.normal('|a\nb\nc\nd\n')
+        self.feed_keys('qajq')
+        steps = repr(State.macro_registers['a'])
+        self.feed_keys('2@a')
+        self.assertEqual(steps, repr(State.macro_registers['a']))
+        self.assertNormal('a\nb\nc\n|d\n')
+
+    def test_runs_of_a_macro_are_undone_together(self):
+        self.normal('|a1\na2\na3\na4\n')
+        self.feed_keys('qaxjq')
+        self.feed_keys('3@a')
+        self.assertContent('1\n2\n3\n4\n')
+        self.feed_keys('u')
+        self.assertContent('1\na2\na3\na4\n')
@@ -38,6 +38,17 @@ class TestParserState(unittest.TestCase):
         self.assertEqual(parser_state.scanner.state.source, "foobar")
 
 
+class TestParseCommandLineCache(unittest.TestCase):
+
+    def test_results_are_cached(self):
+        self.assertIs(parse_command_line('1,2delete'), parse_command_line('1,2delete'))
+        self.assertIsNot(parse_command_line('1,2delete'), parse_command_line('1,3delete'))
+
+    def test_errors_are_not_cached(self):
+        for i in range(2):
+            self.assertRaises(ValueError, parse_command_line, '+10.')
+
+
 class TestParseLineRef(unittest.TestCase):
 
     def test_can_parse_empty(self):
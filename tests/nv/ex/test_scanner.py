@@ -16,6 +16,7 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 import unittest
+import unittest.mock
 
 from NeoVintageous.nv.ex.scanner import _scan_command
 from NeoVintageous.nv.ex.scanner import _ScannerState
@@ -32,6 +33,7 @@ from NeoVintageous.nv.ex.scanner import TokenSearchBackward
 from NeoVintageous.nv.ex.scanner import TokenSearchForward
 from NeoVintageous.nv.ex.scanner import TokenSemicolon
 from NeoVintageous.nv.ex.tokens import TokenCommand
+from NeoVintageous.nv.ex_routes import ex_routes
 
 
 class TestScannerState(unittest.TestCase):
@@ -242,7 +244,7 @@ class TestScanner(unittest.TestCase):
     def test_can_scan_empty_range(self):
         scanner = Scanner("s")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True), TokenEof()], tokens)  # noqa: E501
         self.assertEqual(1, scanner.state.position)
 
     def test_can_scan_dot_offset_search_forward(self):
@@ -278,19 +280,19 @@ class TestScannerCommandName(unittest.TestCase):
     def test_can_instantiate(self):
         scanner = Scanner("substitute")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=None), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=None), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters(self):
         scanner = Scanner("substitute:foo:bar:")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters_with_flags(self):
         scanner = Scanner("substitute:foo:bar:r")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": ['r'], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_scan_can_fail_if_substitute_paramaters_flags_have_wrong_order(self):
         scanner = Scanner("substitute:foo:bar:r&")
@@ -300,13 +302,13 @@ class TestScannerCommandName(unittest.TestCase):
         scanner = Scanner("substitute:foo:bar: 10")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramater_with_range(self):
         scanner = Scanner(r'%substitute:foo:bar: 10')
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)  # noqa: E501
+        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
 
 class TestScannerMarksScanner(unittest.TestCase):
@@ -455,18 +457,22 @@ class Test_scan_command(unittest.TestCase):
         assert_command('close', (None, [TokenCommand('close'), TokenEof()]))  # noqa: E501
         assert_command('copy 3', (None, [TokenCommand('copy', params={'address': '3'}, addressable=True), TokenEof()]))  # noqa: E501
         assert_command('cquit', (None, [TokenCommand('cquit'), TokenEof()]))  # noqa: E501
-        assert_command('delete', (None, [TokenCommand('delete', params={'register': '"', 'count': None}, addressable=True), TokenEof()]))  # noqa: E501
+        assert_command('delete', (None, [TokenCommand('delete', params={'register': '"', 'count': None}, addressable=True, cooperates_with_global=True), TokenEof()]))  # noqa: E501
         assert_command('f', (None, [TokenCommand('file'), TokenEof()]))  # noqa: E501
         assert_command('file', (None, [TokenCommand('file'), TokenEof()]))  # noqa: E501
         assert_command('files', (None, [TokenCommand('buffers'), TokenEof()]))  # noqa: E501
         assert_command('g/foo/print', (None, [TokenCommand('global', params={'pattern': 'foo', 'cmd': 'print'}, addressable=True), TokenEof()]))  # noqa: E501
         assert_command('global/foo/print', (None, [TokenCommand('global', params={'pattern': 'foo', 'cmd': 'print'}, addressable=True), TokenEof()]))  # noqa: E501
+        assert_command('v/foo/print', (None, [TokenCommand('global', params={'pattern': 'foo', 'cmd': 'print'}, addressable=True, forced=True), TokenEof()]))  # noqa: E501
+        assert_command('vg/foo/print', (None, [TokenCommand('global', params={'pattern': 'foo', 'cmd': 'print'}, addressable=True, forced=True), TokenEof()]))  # noqa: E501
+        assert_command('vglobal/foo/print', (None, [TokenCommand('global', params={'pattern': 'foo', 'cmd': 'print'}, addressable=True, forced=True), TokenEof()]))  # noqa: E501
         assert_command('h intro', (None, [TokenCommand('help', params={'subject': 'intro'}), TokenEof()]))  # noqa: E501
         assert_command('help intro', (None, [TokenCommand('help', params={'subject': 'intro'}), TokenEof()]))  # noqa: E501
         assert_command('ls', (None, [TokenCommand('buffers'), TokenEof()]))  # noqa: E501
         assert_command('nn', (None, [TokenCommand('nnoremap', params={'command': None, 'keys': None}), TokenEof()]))  # noqa: E501
         assert_command('nnoremap', (None, [TokenCommand('nnoremap', params={'command': None, 'keys': None}), TokenEof()]))  # noqa: E501
         assert_command('no', (None, [TokenCommand('noremap', params={'command': None, 'keys': None}), TokenEof()]))  # noqa: E501
+        assert_command('nore', (None, [TokenCommand('noremap', params={'command': None, 'keys': None}), TokenEof()]))  # noqa: E501
         assert_command('noremap', (None, [TokenCommand('noremap', params={'command': None, 'keys': None}), TokenEof()]))  # noqa: E501
         assert_command('only', (None, [TokenCommand('only'), TokenEof()]))  # noqa: E501
         assert_command('ou', (None, [TokenCommand('ounmap', params={'keys': None}), TokenEof()]))  # noqa: E501
@@ -475,3 +481,15 @@ class Test_scan_command(unittest.TestCase):
         assert_command('tabc', (None, [TokenCommand('tabclose'), TokenEof()]))  # noqa: E501
         assert_command('tabNext', (None, [TokenCommand('tabprevious'), TokenEof()]))  # noqa: E501
         assert_command('tabN', (None, [TokenCommand('tabprevious'), TokenEof()]))  # noqa: E501
+
+    def test_routes_are_compiled_again_when_routes_are_added(self):
+        with unittest.mock.patch.dict(ex_routes, {'zzfoo': lambda state: (None, [TokenCommand('zzfoo'), TokenEof()])}):
+            self.assertEqual(_scan_command(_ScannerState('zzfoo')), (None, [TokenCommand('zzfoo'), TokenEof()]))
+
+        with self.assertRaisesRegex(Exception, 'E492'):
+            _scan_command(_ScannerState('zzfoo'))
+
+    def test_raises_exception_when_route_matches_start_of_longer_name(self):
+        for source in ('nosuchcmd', 'tabnew', 'normal x', 'norm x'):
+            with self.assertRaisesRegex(Exception, 'E492'):
+                _scan_command(_ScannerState(source))
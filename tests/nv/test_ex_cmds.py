@@ -15,14 +15,21 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
+
 import sublime
 
 from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.ex.nodes import RangeNode
+from NeoVintageous.nv.ex.parser import parse_command_line
 from NeoVintageous.nv.ex.tokens import TokenComma
 from NeoVintageous.nv.ex.tokens import TokenDigits
 from NeoVintageous.nv.ex.tokens import TokenDollar
+from NeoVintageous.nv.ex_cmds import _ex_cmdline_handoffs
+from NeoVintageous.nv.ex_cmds import _ex_cmds
+from NeoVintageous.nv.ex_cmds import _ex_substitute_changes
+from NeoVintageous.nv.ex_cmds import _get_ex_cmd
 from NeoVintageous.nv.ex_cmds import _parse_user_cmdline
 from NeoVintageous.nv.ex_cmds import do_ex_cmdline
 from NeoVintageous.nv.ex_cmds import do_ex_command
@@ -86,6 +93,31 @@ def _mock_ex_with_window_and_view(window, view, *args, **kwargs):
     _mock['kwargs'] = kwargs
 
 
+class Test_get_ex_cmd(unittest.TestCase):
+
+    def test_registry_is_built_at_import(self):
+        self.assertIn('delete', _ex_cmds)
+        self.assertIn('pwd', _ex_cmds)
+        self.assertNotIn('substitute_changes', _ex_cmds)
+
+    def test_get_ex_cmd(self):
+        ex_cmd = _get_ex_cmd('delete')
+        self.assertTrue(ex_cmd.needs_edit)
+        self.assertIs(ex_cmd, _get_ex_cmd('delete'))
+        self.assertFalse(_get_ex_cmd('help').needs_edit)
+
+    def test_replaced_commands_are_registered_again(self):
+        def ex_pwd(window, edit):
+            pass
+
+        with unittest.mock.patch('NeoVintageous.nv.ex_cmds.ex_pwd', ex_pwd):
+            self.assertIs(_get_ex_cmd('pwd').function, ex_pwd)
+            self.assertTrue(_get_ex_cmd('pwd').needs_edit)
+
+        self.assertIsNot(_get_ex_cmd('pwd').function, ex_pwd)
+        self.assertFalse(_get_ex_cmd('pwd').needs_edit)
+
+
 class Test_do_ex_command(unittest.ViewTestCase):
 
     def setUp(self):
@@ -425,6 +457,25 @@ class Test_do_ex_cmdline(unittest.ViewTestCase):
         assert_is_none(':Name bar barCR>')
 
 
+class Test_do_ex_cmdline_handoff(unittest.ViewTestCase):
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.ex_pwd', _mock_ex_with_edit)
+    def test_parsed_command_line_is_handed_off_to_the_edit_wrapper(self):
+        _mock.clear()
+        with unittest.mock.patch('NeoVintageous.nv.ex_cmds.parse_command_line', wraps=parse_command_line) as parse:
+            do_ex_cmdline(self.view.window(), ':pwd')
+            self.assertEqual(1, parse.call_count)
+
+        self.assertIsInstance(_mock['edit'], sublime.Edit)
+        self.assertEqual({}, _ex_cmdline_handoffs)
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.ex_pwd', _mock_ex_with_edit)
+    def test_edit_wrapper_parses_command_lines_that_are_not_handed_off(self):
+        _mock.clear()
+        self.view.run_command('_nv_ex_cmd_edit_wrap', {'_line': ':pwd', '_id': 'x'})
+        self.assertIsInstance(_mock['edit'], sublime.Edit)
+
+
 class Test_do_ex_user_cmdline(unittest.ViewTestCase):
 
     def setUp(self):
@@ -581,6 +632,33 @@ class Test_do_ex_user_cmdline(unittest.ViewTestCase):
         assert_run_command(':N x=4 y=2<CR>', 'n', {'x': 4, 'y': 2})
 
 
+class Test_ex_substitute_changes(unittest.ViewTestCase):
+
+    def changes(self, pattern, replacement, count=0):
+        return list(_ex_substitute_changes(
+            self.view, self.Region(0, self.view.size()), re.compile(pattern, re.M), replacement, count))
+
+    def test_only_changed_spans_are_replaced(self):
+        self.write('fizz\nbuzz\nfizzbuzz\n')
+        self.assertEqual([(self.Region(0, 4), 'x'), (self.Region(10, 14), 'x')], self.changes('fizz', 'x'))
+        self.assertEqual([(self.Region(5, 9), 'x'), (self.Region(14, 18), 'x')], self.changes('buzz', 'x'))
+        self.assertEqual([], self.changes('fizz', 'fizz'))
+        self.assertEqual([], self.changes('y', 'x'))
+
+    def test_count_is_per_line(self):
+        self.write('aa\naa')
+        self.assertEqual([(self.Region(0, 1), 'b'), (self.Region(3, 4), 'b')], self.changes('a', 'b', count=1))
+
+    def test_patterns_are_matched_per_line(self):
+        self.write('a\nb\n')
+        self.assertEqual([], self.changes('a\\nb', 'x'))
+        self.assertEqual([(self.Region(1, 1), ','), (self.Region(3, 3), ',')], self.changes('$', ','))
+
+    def test_groups(self):
+        self.write('ab ab')
+        self.assertEqual([(self.Region(0, 2), 'ba'), (self.Region(3, 5), 'ba')], self.changes('(a)(b)', '\\2\\1'))
+
+
 class Test_parse_user_cmdline(unittest.TestCase):
 
     def assert_parsed(self, line, expected):
@@ -31,6 +31,7 @@ from NeoVintageous.nv.ex_routes import _ex_route_only
 from NeoVintageous.nv.ex_routes import _ex_route_onoremap
 from NeoVintageous.nv.ex_routes import _ex_route_substitute
 from NeoVintageous.nv.ex_routes import _ex_route_tabnext
+from NeoVintageous.nv.ex_routes import _ex_route_vglobal
 from NeoVintageous.nv.ex_routes import ex_routes
 from NeoVintageous.nv.ex_routes import TokenCommand
 from NeoVintageous.nv.ex_routes import TokenEof
@@ -175,6 +176,13 @@ class Test_ex_route_global(unittest.TestCase):
         self.assertEqual(actual, (None, [TokenCommand('global', addressable=True, forced=True, params={'pattern': '111', 'cmd': 'delete'}), TokenEof()]))  # noqa: E501
 
 
+class Test_ex_route_vglobal(unittest.TestCase):
+
+    def test_can_scan(self):
+        actual = _ex_route_vglobal(_ScannerState('/111/delete'))
+        self.assertEqual(actual, (None, [TokenCommand('global', addressable=True, forced=True, params={'pattern': '111', 'cmd': 'delete'}), TokenEof()]))  # noqa: E501
+
+
 class Test_ex_route_noremap(unittest.TestCase):
 
     def test_ex_route_noremap(self):
@@ -219,7 +227,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
     def test_none(self):
         actual = _ex_route_substitute(_ScannerState(''))
-        self.assertEqual(actual, (None, [TokenCommand('substitute', addressable=True), TokenEof()]))
+        self.assertEqual(actual, (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True), TokenEof()]))  # noqa: E501
 
     def test_raises_exception(self):
         with self.assertRaisesRegex(ValueError, 'bad command'):
@@ -231,7 +239,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def _test_ex_route_substitute(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -242,7 +250,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('///')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': '',
                 'replacement': '',
                 'count': 1,
@@ -253,7 +261,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_flags(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/g')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -263,7 +271,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/i')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -273,7 +281,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/gi')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -284,7 +292,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_closing_delimiter_is_not_required(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -15,6 +15,10 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import json
+import os
+import tempfile
+
 from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.history import _char2type
@@ -34,14 +38,21 @@ from NeoVintageous.nv.history import history_get_type
 from NeoVintageous.nv.history import history_len
 from NeoVintageous.nv.history import history_nr
 
+from NeoVintageous.nv.history import _flush
+from NeoVintageous.nv.history import _load
+from NeoVintageous.nv.history import _new_storage
+
+
 # We need to patch the entries storage dictionary so that out tests don't mess
-# up our userland entries, which would obviously be bad.
-from NeoVintageous.nv.history import _storage as _storage_struct_
+# up our userland entries, which would obviously be bad. Reusable mappings test
+# patcher (also passes a clean storage structure to tests).
+def _patch_storage(f):
+    return unittest.mock.patch('NeoVintageous.nv.history._save', lambda entry: None)(
+        unittest.mock.patch('NeoVintageous.nv.history._storage', new_callable=_new_storage)(f))
 
 
-# Reusable mappings test patcher (also passes a clean storage structure to tests).
-_patch_storage = unittest.mock.patch('NeoVintageous.nv.history._storage',
-                                     new_callable=lambda: {k: {'num': 0, 'items': {}} for k in _storage_struct_})
+def _as_dict(storage):
+    return {k: {'num': v.num, 'items': dict(v.items)} for k, v in storage.items()}
 
 
 _patch_max_items = lambda n: unittest.mock.patch('NeoVintageous.nv.history._MAX_ITEMS', n)  # noqa: E731
@@ -168,8 +179,8 @@ class TestHistory(unittest.TestCase):
 
     @_patch_storage
     def test_history_del(self, _storage):
-        _storage[_HIST_SEARCH]['num'] = 9
-        _storage[_HIST_SEARCH]['items'] = {1: 'a', 2: 'b', 3: 'c', 7: 'g', 9: 'i'}
+        for num, item in ((1, 'a'), (2, 'b'), (3, 'c'), (7, 'g'), (9, 'i')):
+            _storage[_HIST_SEARCH].add(item, num)
 
         self.assertEqual(9, history_nr('/'))
         self.assertTrue(history_del('/', 2))
@@ -218,13 +229,13 @@ class TestHistory(unittest.TestCase):
 
     @_patch_storage
     def test_history_clear(self, _storage):
-        _storage[_HIST_CMD]['items'][1] = 'a'
-        _storage[_HIST_CMD]['items'][2] = 'b'
-        _storage[_HIST_CMD]['num'] = 7
+        _storage[_HIST_CMD].add('a', 1)
+        _storage[_HIST_CMD].add('b', 2)
+        _storage[_HIST_CMD].num = 7
 
         history_clear()
 
-        self.assertEqual(_storage, {
+        self.assertEqual(_as_dict(_storage), {
             _HIST_CMD: {'num': 0, 'items': {}},
             _HIST_SEARCH: {'num': 0, 'items': {}},
             _HIST_EXPR: {'num': 0, 'items': {}},
@@ -234,16 +245,16 @@ class TestHistory(unittest.TestCase):
 
     @_patch_storage
     def test_history_len(self, _storage):
-        _storage[_HIST_CMD]['items'][1] = 'a'
-        _storage[_HIST_CMD]['items'][2] = 'b'
-        _storage[_HIST_CMD]['items'][3] = 'c'
-        _storage[_HIST_CMD]['num'] = 7
+        _storage[_HIST_CMD].add('a', 1)
+        _storage[_HIST_CMD].add('b', 2)
+        _storage[_HIST_CMD].add('c', 3)
+        _storage[_HIST_CMD].num = 7
 
         self.assertEqual(history_len(':'), 3)
 
-        _storage[_HIST_CMD]['items'][4] = 'd'
-        _storage[_HIST_CMD]['items'][5] = 'd'
-        _storage[_HIST_CMD]['num'] = 10
+        _storage[_HIST_CMD].add('d', 4)
+        _storage[_HIST_CMD].add('e', 5)
+        _storage[_HIST_CMD].num = 10
 
         self.assertEqual(history_len(':'), 5)
 
@@ -304,7 +315,7 @@ class TestHistory(unittest.TestCase):
     @_patch_storage
     def test_history_option_size_0(self, _storage):
         self.assertFalse(history_add(':', 'c1'))
-        self.assertEqual(_storage, {
+        self.assertEqual(_as_dict(_storage), {
             _HIST_CMD: {'num': 0, 'items': {}},
             _HIST_SEARCH: {'num': 0, 'items': {}},
             _HIST_EXPR: {'num': 0, 'items': {}},
@@ -322,7 +333,7 @@ class TestHistory(unittest.TestCase):
         self.assertTrue(history_add('/', 's1'))
         self.assertTrue(history_add('/', 's2'))
         self.assertTrue(history_add('/', 's3'))
-        self.assertEqual(_storage, {
+        self.assertEqual(_as_dict(_storage), {
             _HIST_CMD: {'num': 4, 'items': {4: 'c4'}},
             _HIST_SEARCH: {'num': 3, 'items': {3: 's3'}},
             _HIST_EXPR: {'num': 0, 'items': {}},
@@ -340,7 +351,7 @@ class TestHistory(unittest.TestCase):
         self.assertTrue(history_add('?', 's1'))
         self.assertTrue(history_add('?', 's2'))
         self.assertTrue(history_add('?', 's3'))
-        self.assertEqual(_storage, {
+        self.assertEqual(_as_dict(_storage), {
             _HIST_CMD: {'num': 4, 'items': {3: 'c3', 4: 'c4'}},
             _HIST_SEARCH: {'num': 3, 'items': {2: 's2', 3: 's3'}},
             _HIST_EXPR: {'num': 0, 'items': {}},
@@ -405,3 +416,81 @@ class TestHistory(unittest.TestCase):
             ">    3  i3\n"
             "     #  debug history"
         ), _history('all'))
+
+
+class TestHistoryFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp.name, 'NeoVintageous', 'history')
+        for patcher in (
+            unittest.mock.patch('NeoVintageous.nv.history._file_name', lambda: self.file_name),
+            unittest.mock.patch('NeoVintageous.nv.history.sublime.set_timeout_async'),
+            unittest.mock.patch('NeoVintageous.nv.history._storage', None),
+            unittest.mock.patch('NeoVintageous.nv.history._pending', []),
+            unittest.mock.patch('NeoVintageous.nv.history._file_entries', 0),
+            unittest.mock.patch('NeoVintageous.nv.history._file_rewrite', False)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, *entries):
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, 'w') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+    def read(self):
+        with open(self.file_name) as f:
+            return [json.loads(line) for line in f]
+
+    def test_is_loaded_on_first_use(self):
+        self.write([_HIST_CMD, 1, 'a'], [_HIST_CMD, 2, 'b'], [_HIST_SEARCH, 3, 's'], [_HIST_CMD, 1], [_HIST_CMD, 4, 'c'])  # noqa: E501
+        from NeoVintageous.nv import history
+        self.assertIsNone(history._storage)
+        self.assertEqual('c', history_get(':'))
+        self.assertEqual('b', history_get(':', -2))
+        self.assertEqual('', history_get(':', 1))
+        self.assertEqual(4, history_nr(':'))
+        self.assertEqual(3, history_nr('/'))
+        self.assertEqual(2, history_len(':'))
+
+    def test_a_missing_file_is_an_empty_history(self):
+        self.assertEqual(-1, history_nr(':'))
+        self.assertEqual('', history_get(':'))
+
+    def test_invalid_entries_are_ignored(self):
+        self.write([_HIST_CMD, 1, 'a'], [_HIST_CMD, 7], [_HIST_CMD, 2, 'b'])
+        with open(self.file_name, 'a') as f:
+            f.write('[1, 3, "trunc')
+
+        self.assertEqual({1: 'a', 2: 'b'}, dict(_load()[_HIST_CMD].items))
+
+    def test_entries_are_appended(self):
+        self.write([_HIST_CMD, 1, 'a'])
+        self.assertTrue(history_add(':', 'b'))
+        self.assertTrue(history_add(':', 'a'))
+        self.assertTrue(history_del(':', -2))
+        self.assertTrue(history_del('/'))
+        _flush()
+
+        self.assertEqual(self.read(), [
+            [_HIST_CMD, 1, 'a'],
+            [_HIST_CMD, 2, 'b'],
+            [_HIST_CMD, 3, 'a'],
+            [_HIST_CMD, 2],
+            [_HIST_SEARCH]
+        ])
+        self.assertEqual({3: 'a'}, dict(_load()[_HIST_CMD].items))
+
+    def test_file_is_compacted(self):
+        for i in range(150):
+            self.assertTrue(history_add(':', 'a'))
+        self.assertTrue(history_add('/', 's'))
+        _flush()
+
+        self.assertLess(len(self.read()), 50)
+        storage = _load()
+        self.assertEqual({150: 'a'}, dict(storage[_HIST_CMD].items))
+        self.assertEqual({1: 's'}, dict(storage[_HIST_SEARCH].items))
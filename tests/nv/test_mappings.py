@@ -21,6 +21,7 @@ from NeoVintageous.nv.mappings import _expand_first
 from NeoVintageous.nv.mappings import _find_full_match
 from NeoVintageous.nv.mappings import _find_partial_match
 from NeoVintageous.nv.mappings import _get_seqs
+from NeoVintageous.nv.mappings import _MappingsTrie
 from NeoVintageous.nv.mappings import _STATUS_COMPLETE
 from NeoVintageous.nv.mappings import _STATUS_INCOMPLETE
 from NeoVintageous.nv.mappings import CMD_TYPE_USER
@@ -45,7 +46,7 @@ from NeoVintageous.nv.mappings import _mappings as _mappings_struct_
 
 # Reusable mappings test patcher (also passes a clean mappings structure to tests).
 _patch_mappings = unittest.mock.patch('NeoVintageous.nv.mappings._mappings',
-                                      new_callable=lambda: {k: {} for k in _mappings_struct_})
+                                      new_callable=lambda: {k: _MappingsTrie() for k in _mappings_struct_})
 
 
 class TestMapping(unittest.TestCase):
@@ -275,6 +276,20 @@ class TestMappings(unittest.TestCase):
         self.assertEqual(mapping.sequence, 'xx')
         self.assertEqual(mapping.status, _STATUS_INCOMPLETE)
 
+    @_patch_mappings
+    def test_expand_first_only_expands_the_first_key(self, _mappings):
+        mappings_add(unittest.NORMAL, 'a', 'x')
+        mappings_add(unittest.NORMAL, 'ab', 'y')
+        mapping = _expand_first(unittest.NORMAL, 'abc')
+
+        self.assertEqual(mapping.head, 'a')
+        self.assertEqual(mapping.mapping, 'x')
+        self.assertEqual(mapping.tail, 'bc')
+        self.assertEqual(mapping.status, _STATUS_COMPLETE)
+
+        mappings_add(unittest.NORMAL, 'cd', 'z')
+        self.assertIsNone(_expand_first(unittest.NORMAL, 'cde'))
+
     @_patch_mappings
     def test_expand_first_returns_none_when_not_found(self, _mappings):
         self.assertIsNone(_expand_first(unittest.NORMAL, ''))
@@ -377,3 +392,68 @@ class TestMappings(unittest.TestCase):
         mappings_add(unittest.NORMAL, 'd', 'y')
         mappings_add(unittest.NORMAL, 'ddd', 'y')
         self.assertEquals(mappings_is_incomplete(unittest.NORMAL, 'dd'), True)
+
+
+class TestMappingsTrie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = _MappingsTrie()
+
+    def test_is_a_dict_of_mappings(self):
+        self.trie['ab'] = {'name': 'x'}
+        self.trie['<C-m>'] = {'name': 'y'}
+        self.assertEqual(self.trie, {'ab': {'name': 'x'}, '<C-m>': {'name': 'y'}})
+
+    def test_find_full(self):
+        self.assertEqual(self.trie.find_full('ab'), (None, None))
+        self.trie['ab'] = {'name': 'x'}
+        self.assertEqual(self.trie.find_full('ab'), ('ab', {'name': 'x'}))
+        self.assertEqual(self.trie.find_full('a'), (None, None))
+        self.assertEqual(self.trie.find_full('abc'), (None, None))
+        self.assertEqual(self.trie.find_full(''), (None, None))
+
+    def test_find_first(self):
+        self.trie['a'] = {'name': 'x'}
+        self.trie['abc'] = {'name': 'y'}
+        self.trie['<C-m>'] = {'name': 'z'}
+        self.assertEqual(self.trie.find_first('a'), (1, {'name': 'x'}))
+        self.assertEqual(self.trie.find_first('ab'), (1, {'name': 'x'}))
+        self.assertEqual(self.trie.find_first('abcd'), (1, {'name': 'x'}))
+        self.assertEqual(self.trie.find_first('<C-m>x'), (5, {'name': 'z'}))
+        self.assertEqual(self.trie.find_first('b'), (None, None))
+        self.assertEqual(self.trie.find_first('ba'), (None, None))
+        self.assertEqual(self.trie.find_first(''), (None, None))
+
+    def test_is_prefix_and_is_incomplete(self):
+        self.trie['abc'] = {'name': 'x'}
+        self.trie['<C-w>x'] = {'name': 'y'}
+        self.assertTrue(self.trie.is_prefix('a'))
+        self.assertTrue(self.trie.is_prefix('abc'))
+        self.assertFalse(self.trie.is_prefix('abcd'))
+        self.assertTrue(self.trie.is_incomplete('ab'))
+        self.assertFalse(self.trie.is_incomplete('abc'))
+        self.assertTrue(self.trie.is_incomplete('<C-w>'))
+        self.assertFalse(self.trie.is_incomplete('<C-'))
+
+    def test_remove_prunes_index(self):
+        self.trie['abc'] = {'name': 'x'}
+        self.trie['a'] = {'name': 'y'}
+        del self.trie['abc']
+        self.assertFalse(self.trie.is_prefix('ab'))
+        self.assertEqual(self.trie.find_full('a'), ('a', {'name': 'y'}))
+        del self.trie['a']
+        self.assertFalse(self.trie.is_prefix(''))
+
+    def test_clear(self):
+        self.trie['abc'] = {'name': 'x'}
+        self.trie.clear()
+        self.assertEqual(self.trie, {})
+        self.assertFalse(self.trie.is_prefix('a'))
+
+    def test_iter_prefixed(self):
+        self.trie['yb'] = {'name': 'x'}
+        self.trie['ya'] = {'name': 'x'}
+        self.trie['x'] = {'name': 'x'}
+        self.assertEqual(sorted(self.trie.iter_prefixed('y')), ['ya', 'yb'])
+        self.assertEqual(sorted(self.trie.iter_prefixed('')), ['x', 'ya', 'yb'])
+        self.assertEqual(list(self.trie.iter_prefixed('z')), [])
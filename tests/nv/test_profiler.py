@@ -0,0 +1,88 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.profiler import _BUCKETS
+from NeoVintageous.nv.profiler import PHASE_KEY
+from NeoVintageous.nv.profiler import PHASE_MOTION
+from NeoVintageous.nv.profiler import profiler_clear
+from NeoVintageous.nv.profiler import profiler_record
+from NeoVintageous.nv.profiler import profiler_report
+from NeoVintageous.nv.profiler import profiler_samples
+from NeoVintageous.nv.profiler import profiler_stats
+from NeoVintageous.nv.profiler import profiler_timer
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        profiler_clear()
+
+    def tearDown(self):
+        profiler_clear()
+
+    def test_record(self):
+        profiler_record('_vi_w', PHASE_MOTION, 0.001)
+        profiler_record('_vi_w', PHASE_MOTION, 0.002)
+        self.assertEqual(profiler_samples(), [('_vi_w', PHASE_MOTION, 0.001), ('_vi_w', PHASE_MOTION, 0.002)])
+
+    def test_timer(self):
+        with profiler_timer('_nv_feed_key', PHASE_KEY):
+            pass
+
+        samples = profiler_samples()
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(samples[0][:2], ('_nv_feed_key', PHASE_KEY))
+
+    def test_timer_records_on_exception(self):
+        with self.assertRaises(ValueError):
+            with profiler_timer('_nv_feed_key', PHASE_KEY):
+                raise ValueError('fizz')
+
+        self.assertEqual(len(profiler_samples()), 1)
+
+    def test_stats(self):
+        for i in range(99):
+            profiler_record('_vi_w', PHASE_MOTION, _BUCKETS[0])
+        profiler_record('_vi_w', PHASE_MOTION, _BUCKETS[3])
+
+        name, phase, count, p50, p95, p99, max_ = profiler_stats()[0]
+        self.assertEqual((name, phase, count), ('_vi_w', PHASE_MOTION, 100))
+        self.assertEqual(p50, _BUCKETS[0])
+        self.assertEqual(p95, _BUCKETS[0])
+        self.assertEqual(p99, _BUCKETS[0])
+        self.assertEqual(max_, _BUCKETS[3])
+
+    def test_stats_are_sorted_by_slowest_first(self):
+        profiler_record('_vi_j', PHASE_MOTION, 0.001)
+        profiler_record('_vi_w', PHASE_MOTION, 0.1)
+        self.assertEqual([x[0] for x in profiler_stats()], ['_vi_w', '_vi_j'])
+
+    def test_report(self):
+        self.assertEqual(profiler_report(), 'No timings recorded.\n')
+        profiler_record('_vi_w', PHASE_MOTION, 0.001)
+        report = profiler_report()
+        self.assertIn('_vi_w', report)
+        self.assertIn('p95', report)
+        self.assertIn('1.00ms', report)
+
+    def test_clear(self):
+        profiler_record('_vi_w', PHASE_MOTION, 0.001)
+        profiler_clear()
+        self.assertEqual(profiler_samples(), [])
+        self.assertEqual(profiler_stats(), [])
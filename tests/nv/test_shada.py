@@ -0,0 +1,154 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import shada
+from NeoVintageous.nv.shada import shada_flush
+from NeoVintageous.nv.shada import shada_get
+from NeoVintageous.nv.shada import shada_save
+from NeoVintageous.nv.state import State
+from NeoVintageous.nv.vi import marks
+from NeoVintageous.nv.vi import registers
+from NeoVintageous.nv.vi.macros import MacroRegisters
+
+
+class TestShada(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_name = os.path.join(self.tmp.name, 'NeoVintageous', 'shada.json')
+        for patcher in (
+            unittest.mock.patch('NeoVintageous.nv.shada._enabled', True),
+            unittest.mock.patch('NeoVintageous.nv.shada._file_name', self.file_name),
+            unittest.mock.patch('NeoVintageous.nv.shada._data', None),
+            unittest.mock.patch('NeoVintageous.nv.shada._save_pending', False),
+            unittest.mock.patch('NeoVintageous.nv.shada.sublime.set_timeout'),
+            unittest.mock.patch('NeoVintageous.nv.vi.registers._REGISTER_DATA', registers.init_register_data()),
+            unittest.mock.patch('NeoVintageous.nv.vi.registers._loaded', False),
+            unittest.mock.patch('NeoVintageous.nv.vi.marks._MARKS', {}),
+            unittest.mock.patch('NeoVintageous.nv.vi.marks._FILE_MARKS', None),
+            unittest.mock.patch('NeoVintageous.nv.state.State.macro_registers', MacroRegisters())
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def write_shada(self, data):
+        data.setdefault('version', 1)
+        os.makedirs(os.path.dirname(self.file_name))
+        with open(self.file_name, 'w') as f:
+            json.dump(data, f)
+
+    def read_shada(self):
+        with open(self.file_name) as f:
+            return json.load(f)
+
+    def test_a_missing_file_is_empty(self):
+        self.assertEqual({}, shada_get('registers'))
+
+    def test_a_file_of_another_version_is_ignored(self):
+        self.write_shada({'version': 0, 'registers': {'a': ['x']}})
+        self.assertEqual({}, shada_get('registers'))
+
+    def test_is_loaded_on_first_use(self):
+        self.write_shada({'registers': {'a': ['x']}})
+        self.assertIsNone(shada._data)
+        self.assertEqual({'a': ['x']}, shada_get('registers'))
+        self.assertIsNotNone(shada._data)
+
+    def test_registers_are_loaded(self):
+        self.write_shada({'registers': {'a': ['fizz'], '1-9': [['a']] + [None] * 8, '%': ['x']}})
+        self.assertEqual(['fizz'], State(self.view).registers['a'])
+        self.assertEqual(['a'], State(self.view).registers['1'])
+        self.assertNotIn('%', registers._REGISTER_DATA)
+
+    def test_registers_of_another_shape_are_ignored(self):
+        self.write_shada({'registers': {'a': 'fizz', 'b': [1], '1-9': [['a'], None]}})
+        self.assertEqual({'0': None, '1-9': [None] * 9}, registers.get_register_data())
+
+    def test_a_section_of_another_shape_is_ignored(self):
+        self.write_shada({'registers': ['fizz'], 'macros': 'q'})
+        self.assertEqual({}, shada_get('registers'))
+        self.assertEqual({}, shada_get('macros'))
+
+    def test_registers_that_are_set_are_not_replaced(self):
+        self.write_shada({'registers': {'a': ['fizz']}})
+        registers._REGISTER_DATA['a'] = ['buzz']
+        self.assertEqual(['buzz'], State(self.view).registers['a'])
+
+    def test_macros_are_loaded(self):
+        self.write_shada({'macros': {'q': [['_vi_j', {'mode': 'mode_normal'}]]}})
+        self.assertEqual([('_vi_j', {'mode': 'mode_normal'})], State.macro_registers['q'])
+
+    def test_macros_of_another_shape_are_ignored(self):
+        self.write_shada({'macros': {'q': [['_vi_j']], 'w': '_vi_j', 'e': [['_vi_j', {}]]}})
+        self.assertEqual({'e': [('_vi_j', {})]}, dict(State.macro_registers.items()))
+
+    def test_file_marks_are_loaded(self):
+        self.write_shada({'marks': {'A': ['/tmp/nv_shada_test.txt', 3, 2]}})
+        self.assertEqual('/tmp/nv_shada_test.txt:3:0', State(self.view).marks.get_as_encoded_address('A'))
+        self.assertEqual('/tmp/nv_shada_test.txt:3:2', State(self.view).marks.get_as_encoded_address('A', exact=True))
+
+    def test_file_marks_of_another_shape_are_ignored(self):
+        self.write_shada({'marks': {'A': ['/tmp/a.txt', 3], 'B': '/tmp/b.txt', 'c': ['/tmp/c.txt', 1, 2]}})
+        self.assertEqual({}, marks.get_file_marks())
+
+    def test_tests_do_not_use_the_state_file_of_the_user(self):
+        with unittest.mock.patch('NeoVintageous.nv.shada._enabled', False):
+            self.write_shada({'registers': {'a': ['fizz']}})
+            self.assertEqual({}, shada_get('registers'))
+            shada_save()
+            self.assertFalse(shada.sublime.set_timeout.called)
+
+    def test_save(self):
+        State(self.view).registers['a'] = ['fizz']
+        State(self.view).registers['b'] = ['x' * (shada._MAX_ITEM_SIZE + 1)]
+        State.macro_registers['q'] = [('_vi_j', {'mode': 'mode_normal'})]
+        shada_flush()
+
+        data = self.read_shada()
+        self.assertEqual(1, data['version'])
+        self.assertEqual(['fizz'], data['registers']['a'])
+        self.assertNotIn('b', data['registers'])
+        self.assertEqual({'q': [['_vi_j', {'mode': 'mode_normal'}]]}, data['macros'])
+        self.assertEqual({}, data['marks'])
+
+    def test_save_keeps_what_was_not_loaded(self):
+        self.write_shada({'macros': {'q': [['_vi_j', {}]]}, 'marks': {'A': ['/tmp/a.txt', 1, 2]}})
+        State(self.view).registers['a'] = ['fizz']
+        shada_flush()
+
+        data = self.read_shada()
+        self.assertEqual(['fizz'], data['registers']['a'])
+        self.assertEqual({'q': [['_vi_j', {}]]}, data['macros'])
+        self.assertEqual({'A': ['/tmp/a.txt', 1, 2]}, data['marks'])
+
+    def test_save_is_deferred(self):
+        shada_save()
+        shada_save()
+        self.assertEqual(1, shada.sublime.set_timeout.call_count)
+        self.assertFalse(os.path.exists(self.file_name))
+
+    def test_flush_does_nothing_if_nothing_changed(self):
+        shada_flush()
+        self.assertFalse(os.path.exists(self.file_name))
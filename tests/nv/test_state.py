@@ -302,3 +302,56 @@ class TestStateSetCommand(unittest.ViewTestCase):
         self.state.set_command(operator)
 
         self.assertEqual(self.state.mode, unittest.OPERATOR_PENDING)
+
+
+class TestStateMacroSteps(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = unittest.mock.patch.object(State, 'macro_steps', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.state.start_recording()
+
+    def tearDown(self):
+        self.state.stop_recording()
+        super().tearDown()
+
+    def test_coalesces_inserts(self):
+        self.state.add_macro_step('insert', {'characters': 'a'})
+        self.state.add_macro_step('insert', {'characters': 'bc'})
+        self.state.add_macro_step('insert', {'characters': '\n'})
+        self.state.add_macro_step('insert', {'characters': 'd'})
+        self.assertEqual([
+            ('insert', {'characters': 'abc'}),
+            ('insert', {'characters': '\n'}),
+            ('insert', {'characters': 'd'}),
+        ], State.macro_steps)
+
+    def test_coalesces_the_inserts_of_sequences(self):
+        self.state.add_macro_step('sequence', {'commands': [
+            ['insert', {'characters': 'a'}],
+            ['insert', {'characters': 'b'}],
+        ]})
+        self.state.add_macro_step('sequence', {'commands': [
+            ['insert', {'characters': 'c'}],
+            ['left_delete', None],
+            ['insert', {'characters': 'd'}],
+        ]})
+        self.assertEqual([
+            ('insert', {'characters': 'ab'}),
+            ('sequence', {'commands': [['insert', {'characters': 'c'}], ['left_delete', None], ['insert', {'characters': 'd'}]]}),  # noqa: E501
+        ], State.macro_steps)
+
+    def test_coalesces_runs_of_motions(self):
+        self.state.add_macro_step('_vi_j', {'mode': unittest.NORMAL, 'count': 1, 'xpos': 2})
+        self.state.add_macro_step('_vi_j', {'mode': unittest.NORMAL, 'count': 3, 'xpos': 4})
+        self.state.add_macro_step('_vi_j', {'mode': unittest.VISUAL, 'count': 1, 'xpos': 4})
+        self.state.add_macro_step('_vi_x', {'mode': unittest.INTERNAL_NORMAL, 'count': 1, 'register': '"'})
+        self.state.add_macro_step('_vi_x', {'mode': unittest.INTERNAL_NORMAL, 'count': 1, 'register': '"'})
+        self.assertEqual([
+            ('_vi_j', {'mode': unittest.NORMAL, 'count': 4, 'xpos': 2}),
+            ('_vi_j', {'mode': unittest.VISUAL, 'count': 1, 'xpos': 4}),
+            ('_vi_x', {'mode': unittest.INTERNAL_NORMAL, 'count': 1, 'register': '"'}),
+            ('_vi_x', {'mode': unittest.INTERNAL_NORMAL, 'count': 1, 'register': '"'}),
+        ], State.macro_steps)
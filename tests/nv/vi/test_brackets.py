@@ -0,0 +1,103 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.brackets import _build
+from NeoVintageous.nv.vi.brackets import _cache
+from NeoVintageous.nv.vi.brackets import destroy
+from NeoVintageous.nv.vi.brackets import find_bracket_partner
+from NeoVintageous.nv.vi.brackets import find_enclosing_brackets
+from NeoVintageous.nv.vi.brackets import find_lone_closing_bracket
+from NeoVintageous.nv.vi.brackets import find_lone_opening_bracket
+
+
+class TestBuild(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertEqual(_build('', '(', ')', True), ([], [], [], [], {}))
+
+    def test_pairs(self):
+        opens, closes, parents, lone_closes, partners = _build('(a(b)(c))', '(', ')', True)
+        self.assertEqual(opens, [0, 2, 5])
+        self.assertEqual(closes, [8, 4, 7])
+        self.assertEqual(parents, [-1, 0, 0])
+        self.assertEqual(lone_closes, [])
+        self.assertEqual(partners, {0: 8, 8: 0, 2: 4, 4: 2, 5: 7, 7: 5})
+
+    def test_unbalanced(self):
+        opens, closes, parents, lone_closes, partners = _build(')(a()', '(', ')', True)
+        self.assertEqual(opens, [1, 3])
+        self.assertEqual(closes, [None, 4])
+        self.assertEqual(parents, [-1, 0])
+        self.assertEqual(lone_closes, [0])
+        self.assertEqual(partners, {3: 4, 4: 3})
+
+    def test_escaped(self):
+        self.assertEqual(_build('\\(()\\)', '(', ')', True)[4], {2: 3, 3: 2})
+        self.assertEqual(_build('\\(()\\)', '(', ')', False)[4], {1: 5, 5: 1, 2: 3, 3: 2})
+
+
+class TestBracketIndex(unittest.ViewTestCase):
+
+    def test_find_bracket_partner(self):
+        self.write('x{a{b}c}x')
+        self.assertEqual(find_bracket_partner(self.view, 1, ('{', '}')), 7)
+        self.assertEqual(find_bracket_partner(self.view, 7, ('{', '}')), 1)
+        self.assertEqual(find_bracket_partner(self.view, 3, ('{', '}')), 5)
+        self.assertIsNone(find_bracket_partner(self.view, 0, ('{', '}')))
+        self.assertIsNone(find_bracket_partner(self.view, 1, ('(', ')')))
+
+    def test_find_enclosing_brackets(self):
+        self.write('x(a(b)c(d)e)x')
+        self.assertEqual(find_enclosing_brackets(self.view, 4, ('(', ')')), (3, 5))
+        self.assertEqual(find_enclosing_brackets(self.view, 3, ('(', ')')), (3, 5))
+        self.assertEqual(find_enclosing_brackets(self.view, 5, ('(', ')')), (3, 5))
+        self.assertEqual(find_enclosing_brackets(self.view, 6, ('(', ')')), (1, 11))
+        self.assertEqual(find_enclosing_brackets(self.view, 4, ('(', ')'), count=2), (1, 11))
+        self.assertIsNone(find_enclosing_brackets(self.view, 4, ('(', ')'), count=3))
+        self.assertIsNone(find_enclosing_brackets(self.view, 0, ('(', ')')))
+        self.assertIsNone(find_enclosing_brackets(self.view, 12, ('(', ')')))
+
+    def test_find_enclosing_brackets_skips_unbalanced(self):
+        self.write('(a(b)')
+        self.assertIsNone(find_enclosing_brackets(self.view, 1, ('(', ')')))
+        self.assertEqual(find_enclosing_brackets(self.view, 3, ('(', ')')), (2, 4))
+
+    def test_find_lone_brackets(self):
+        self.write('a) (b (c) d')
+        self.assertEqual(find_lone_closing_bracket(self.view, 0, ('(', ')')), 1)
+        self.assertIsNone(find_lone_closing_bracket(self.view, 2, ('(', ')')))
+        self.assertEqual(find_lone_closing_bracket(self.view, 7, ('(', ')')), 8)
+        self.assertIsNone(find_lone_opening_bracket(self.view, 1, ('(', ')')))
+        self.assertEqual(find_lone_opening_bracket(self.view, 4, ('(', ')')), 3)
+        self.assertEqual(find_lone_opening_bracket(self.view, 10, ('(', ')')), 3)
+        self.assertEqual(find_lone_opening_bracket(self.view, 7, ('(', ')')), 6)
+
+    def test_index_is_invalidated_by_buffer_changes(self):
+        self.write('(a)')
+        self.assertEqual(find_bracket_partner(self.view, 0, ('(', ')')), 2)
+        self.write('((a)')
+        self.assertIsNone(find_bracket_partner(self.view, 0, ('(', ')')))
+        self.assertEqual(find_bracket_partner(self.view, 1, ('(', ')')), 3)
+
+    def test_destroy(self):
+        self.write('(a)')
+        find_bracket_partner(self.view, 0, ('(', ')'))
+        self.assertIn(self.view.id(), _cache)
+        destroy(self.view)
+        self.assertNotIn(self.view.id(), _cache)
@@ -18,10 +18,17 @@
 from unittest import mock
 import unittest
 
+from NeoVintageous.nv import plugin
+from NeoVintageous.nv.vi import keys
+from NeoVintageous.nv.vi.cmd_base import ViMissingCommandDef
+from NeoVintageous.nv.vi.cmd_base import ViMotionDef
+from NeoVintageous.nv.vi.keys import is_command_prefix
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+from NeoVintageous.nv.vi.keys import seq_to_command
 from NeoVintageous.nv.vi.keys import seqs
 from NeoVintageous.nv.vi.keys import to_bare_command_name
 from NeoVintageous.nv.vi.utils import translate_char
+from NeoVintageous.nv.vim import NORMAL
 
 
 class TestKeySequenceTokenizer(unittest.TestCase):
@@ -93,6 +100,12 @@ class TestFunctions(unittest.TestCase):
         self.assertEquals('0', to_bare_command_name('0'))
         self.assertEquals('dd', to_bare_command_name('d2d'))
 
+    def test_to_bare_command_name_expands_the_current_values_of_variables(self):
+        with mock.patch.dict('NeoVintageous.nv.variables._variables', {}, clear=True):
+            self.assertEquals('\\d', to_bare_command_name('2<leader>d'))
+        with mock.patch.dict('NeoVintageous.nv.variables._variables', {'mapleader': ','}, clear=True):
+            self.assertEquals(',d', to_bare_command_name('2<leader>d'))
+
     def test_translate_char(self):
         self.assertEqual(translate_char('<enter>'), '\n')
         self.assertEqual(translate_char('<cr>'), '\n')
@@ -363,6 +376,69 @@ _known_seqs_dataset = (
 )
 
 
+class _PluginMotion(ViMotionDef):
+
+    def __init__(self, enabled=True):
+        super().__init__()
+        self.enabled = enabled
+
+    def is_enabled(self, state):
+        return self.enabled
+
+
+class TestSeqToCommand(unittest.TestCase):
+
+    def setUp(self):
+        for mappings in (keys.mappings, plugin.mappings):
+            patcher = mock.patch.dict(mappings, {NORMAL: {}})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.dict(plugin.classes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        keys.clear_dispatch_tables()
+        self.addCleanup(keys.clear_dispatch_tables)
+        self.state = mock.Mock(mode=NORMAL)
+
+    def register(self, seq, cls, *args):
+        keys.assign(seq, (NORMAL,), *args)(cls)
+
+    def test_returns_the_command_mapped_to_the_sequence(self):
+        self.register('x', ViMotionDef)
+        self.assertIs(keys.mappings[NORMAL]['x'], seq_to_command(self.state, 'x'))
+
+    def test_returns_the_same_missing_command_for_sequences_not_mapped(self):
+        command = seq_to_command(self.state, 'x')
+        self.assertIsInstance(command, ViMissingCommandDef)
+        self.assertIs(command, seq_to_command(self.state, 'y'))
+        self.assertIsInstance(seq_to_command(self.state, 'x', mode='unknown'), ViMissingCommandDef)
+
+    def test_plugin_commands_override_core_commands(self):
+        self.register('x', ViMotionDef)
+        seq_to_command(self.state, 'x')
+        plugin.register('x', (NORMAL,))(ViMotionDef)
+        self.assertIs(plugin.mappings[NORMAL]['x'], seq_to_command(self.state, 'x'))
+
+    def test_disabled_plugin_commands_fall_back_to_core_commands(self):
+        self.register('x', ViMotionDef)
+        plugin.register('x', (NORMAL,), False)(_PluginMotion)
+        plugin.register('y', (NORMAL,), False)(_PluginMotion)
+        self.assertIs(keys.mappings[NORMAL]['x'], seq_to_command(self.state, 'x'))
+        self.assertIsInstance(seq_to_command(self.state, 'y'), ViMissingCommandDef)
+        plugin.mappings[NORMAL]['x'].enabled = True
+        self.assertIs(plugin.mappings[NORMAL]['x'], seq_to_command(self.state, 'x'))
+
+    def test_is_command_prefix(self):
+        self.register('g<C-w>x', ViMotionDef)
+        self.assertTrue(is_command_prefix(NORMAL, 'g'))
+        self.assertTrue(is_command_prefix(NORMAL, 'g<C-w>'))
+        self.assertFalse(is_command_prefix(NORMAL, 'g<C-w>x'))
+        self.assertFalse(is_command_prefix(NORMAL, 'x'))
+        plugin.register('yx', (NORMAL,))(ViMotionDef)
+        self.assertTrue(is_command_prefix(NORMAL, 'y'))
+
+
 class TestKeySequenceNames(unittest.TestCase):
 
     def test_seqs(self):
@@ -21,39 +21,25 @@ from NeoVintageous.nv.state import State
 from NeoVintageous.nv.vi import marks
 
 
-# XXX: Use the mock module instead?
-class View():
-    def __init__(self, id_, fname, buffer_id=0):
-        self.view_id = id_
-        self.fname = fname
-        self._buffer_id = buffer_id
-
-    def file_name(self):
-        return self.fname
-
-    def buffer_id(self):
-        return self._buffer_id
-
-
-class Window():
-    pass
-
-
 class MarksTests(unittest.ViewTestCase):
 
     def setUp(self):
         super().setUp()
         marks._MARKS = {}
+        marks._FILE_MARKS = {}
         self.view.sel().clear()
         self.view.sel().add(self.Region(0, 0))
         self.marks = State(self.view).marks
 
+    def tearDown(self):
+        super().tearDown()
+        marks._MARKS = {}
+        marks._FILE_MARKS = None
+
     def test_can_set_mark(self):
         self.marks.add('a', self.view)
-        expected_win, expected_view, expected_region = (self.view.window(), self.view, (0, 0))
-        actual_win, actual_view, actual_region = marks._MARKS['a']
-        self.assertEqual((actual_win.id(), actual_view.view_id, actual_region),
-                         (expected_win.id(), expected_view.view_id, expected_region))
+        self.assertEqual(marks._MARKS['a'].view_id, self.view.view_id)
+        self.assertEqual(self.view.get_regions('vi_mark_a'), [self.Region(0, 0)])
 
     def test_can_retrieve_mark_in_the_current_buffer_as_tuple(self):
         self.marks.add('a', self.view)
@@ -66,21 +52,98 @@ class MarksTests(unittest.ViewTestCase):
         self.view.sel().add(self.Region(30, 30))
         self.marks.add('a', self.view)
         self.assertEqual(self.marks.get_as_encoded_address('a'), self.Region(24, 24))
+        self.assertEqual(self.marks.get_as_encoded_address('a', exact=True), self.Region(30, 30))
 
-    def test_can_retrieve_mark_in_a_different_buffer_as_encoded_mark(self):
-        view = View(id_=self.view.view_id + 1, fname=r'C:\foo.txt')
+    def test_marks_move_with_edits(self):
+        self.write(''.join(('foo bar\n') * 10))
+        self.view.sel().clear()
+        self.view.sel().add(self.Region(30, 30))
+        self.marks.add('a', self.view)
+        self.view.sel().clear()
+        self.view.sel().add(self.Region(0, 0))
+        self.view.run_command('insert', {'characters': 'x\ny\n'})
+        self.assertEqual(self.marks.get_as_encoded_address('a'), self.Region(28, 28))
+        self.assertEqual(self.marks.get_as_encoded_address('a', exact=True), self.Region(34, 34))
 
-        marks._MARKS['a'] = (Window(), view, (0, 0))
-        expected = "{0}:{1}".format(r'C:\foo.txt', "0:0")
-        self.assertEqual(self.marks.get_as_encoded_address('a'), expected)
+    def test_unset_mark(self):
+        self.assertIsNone(self.marks.get_as_encoded_address('a'))
+
+    def test_can_retrieve_mark_in_a_different_buffer_as_encoded_mark(self):
+        view = self.view.window().new_file()
+        self.addCleanup(view.close)
+        view.run_command('insert', {'characters': 'foo\nbar\n'})
+        view.sel().clear()
+        view.sel().add(self.Region(5))
+        unittest.mock.patch.object(view, 'file_name', return_value=r'C:\foo.txt').start()
+        self.addCleanup(unittest.mock.patch.stopall)
+
+        self.marks.add('a', view)
+        self.assertEqual(self.marks.get_as_encoded_address('a'), r'C:\foo.txt:1:0')
+        self.assertEqual(self.marks.get_as_encoded_address('a', exact=True), r'C:\foo.txt:1:1')
 
     def test_can_retrieve_mark_in_an_untitled_buffer_as_encoded_mark(self):
-        view = View(id_=self.view.view_id + 1, fname='', buffer_id=999)
+        view = self.view.window().new_file()
+        self.addCleanup(view.close)
 
-        marks._MARKS['a'] = (Window(), view, (0, 0))
-        expected = "<untitled {0}>:{1}".format(999, "0:0")
+        self.marks.add('a', view)
+        expected = "<untitled {0}>:{1}".format(view.buffer_id(), "0:0")
         self.assertEqual(self.marks.get_as_encoded_address('a'), expected)
 
+    def test_setting_a_mark_in_another_view_moves_it(self):
+        view = self.view.window().new_file()
+        self.addCleanup(view.close)
+
+        self.marks.add('a', view)
+        self.marks.add('a', self.view)
+        self.assertEqual(view.get_regions('vi_mark_a'), [])
+        self.assertEqual(self.marks.get_as_encoded_address('a'), self.Region(0, 0))
+
+    def test_destroy_keeps_file_marks(self):
+        self.write('foo\nbar\n')
+        self.view.sel().clear()
+        self.view.sel().add(self.Region(5))
+        self.marks.add('a', self.view)
+        self.marks.add('A', self.view)
+        with unittest.mock.patch.object(self.view, 'file_name', return_value='/tmp/foo.txt'):
+            marks.destroy(self.view)
+
+        self.assertEqual(marks._MARKS, {})
+        self.assertEqual(marks._FILE_MARKS, {'A': ['/tmp/foo.txt', 1, 1]})
+        self.assertIsNone(self.marks.get_as_encoded_address('a'))
+        self.assertEqual(self.marks.get_as_encoded_address('A'), '/tmp/foo.txt:1:0')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.marks.shada_save')
+    def test_destroy_saves_file_marks(self, shada_save):
+        self.marks.add('a', self.view)
+        shada_save.reset_mock()
+        with unittest.mock.patch.object(self.view, 'file_name', return_value='/tmp/foo.txt'):
+            marks.destroy(self.view)
+
+        self.assertFalse(shada_save.called)
+        self.marks.add('A', self.view)
+        shada_save.reset_mock()
+        with unittest.mock.patch.object(self.view, 'file_name', return_value='/tmp/foo.txt'):
+            marks.destroy(self.view)
+
+        shada_save.assert_called_once_with()
+
+    def test_destroy_moves_marks_to_another_view_of_the_buffer(self):
+        self.write('foo\nbar\n')
+        self.view.sel().clear()
+        self.view.sel().add(self.Region(5))
+        self.marks.add('a', self.view)
+        self.marks.add('A', self.view)
+        clone = self.view.window().new_file()
+        self.addCleanup(clone.close)
+        clone.set_scratch(True)
+        with unittest.mock.patch.object(clone, 'buffer_id', return_value=self.view.buffer_id()):
+            marks.destroy(self.view)
+
+        self.assertIs(marks._MARKS['a'], clone)
+        self.assertIs(marks._MARKS['A'], clone)
+        self.assertEqual(clone.get_regions('vi_mark_a'), [self.Region(5)])
+        self.assertEqual(marks._FILE_MARKS, {})
+
     def test_can_retrieve_single_quote_mark(self):
         location = self.marks.get_as_encoded_address("'")
         self.assertEqual(location, '<command _vi_double_single_quote>')
@@ -15,11 +15,24 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from sublime import IGNORECASE
 from sublime import LITERAL
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi.search import _incsearches
+from NeoVintageous.nv.vi.search import _match_indexes
+from NeoVintageous.nv.vi.search import _reverse_search_by_lines
+from NeoVintageous.nv.vi.search import _reverse_search_by_pt_by_lines
+from NeoVintageous.nv.vi.search import cancel_incsearch
+from NeoVintageous.nv.vi.search import clear_hilite
+from NeoVintageous.nv.vi.search import destroy
+from NeoVintageous.nv.vi.search import find_next_match
+from NeoVintageous.nv.vi.search import find_previous_match
 from NeoVintageous.nv.vi.search import find_wrapping
+from NeoVintageous.nv.vi.search import get_match_count
+from NeoVintageous.nv.vi.search import hilite
+from NeoVintageous.nv.vi.search import incsearch
 from NeoVintageous.nv.vi.search import reverse_search
 from NeoVintageous.nv.vi.search import reverse_search_by_pt
 
@@ -168,3 +181,324 @@ class TestReverseSearch(unittest.ViewTestCase):
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=2, flags=LITERAL))
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=1, flags=LITERAL))
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=0, flags=LITERAL))
+
+
+class TestReverseSearchEngine(unittest.ViewTestCase):
+
+    def assertSameAsLineBasedSearch(self, term, flags=0):
+        size = self.view.size()
+        for start in (0, 1, 7, size // 2):
+            for end in range(start, size + 1):
+                self.assertEqual(
+                    _reverse_search_by_pt_by_lines(self.view, term, start, end, flags),
+                    reverse_search_by_pt(self.view, term, start, end, flags),
+                    'term={} start={} end={}'.format(term, start, end))
+
+                self.assertEqual(
+                    _reverse_search_by_lines(self.view, term, start, end, flags),
+                    reverse_search(self.view, term, start, end, flags),
+                    'term={} start={} end={}'.format(term, start, end))
+
+    def test_same_as_line_based_search(self):
+        self.write('fizz buzz\nFizzBuzz\n\nfoo(buzz) fizz\nbuzz')
+        self.assertSameAsLineBasedSearch('buzz', LITERAL)
+        self.assertSameAsLineBasedSearch('fizz', IGNORECASE)
+        self.assertSameAsLineBasedSearch('(', LITERAL)
+        self.assertSameAsLineBasedSearch('\\bbuzz\\b')
+        self.assertSameAsLineBasedSearch('^\\w+')
+        self.assertSameAsLineBasedSearch('z+$')
+        self.assertSameAsLineBasedSearch('x')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._REVERSE_SEARCH_CHUNK_SIZE', 8)
+    def test_searches_across_chunks(self):
+        self.write('fizz\n' + 'x\n' * 100 + 'buzz fizz\n' + 'y\n' * 100)
+        self.assertEqual(self.Region(210, 214), reverse_search_by_pt(self.view, 'fizz', 0, self.view.size()))
+        self.assertEqual(self.Region(0, 4), reverse_search_by_pt(self.view, 'fizz', 0, 210))
+        self.assertEqual(self.Region(210, 214), reverse_search_by_pt(self.view, 'fizz', 0, 214))
+        self.assertEqual(self.Region(205, 214), reverse_search_by_pt(self.view, 'buzz fizz', 0, self.view.size()))
+        self.assertEqual(self.Region(203, 209), reverse_search_by_pt(self.view, 'x\nbuzz', 0, self.view.size()))
+        self.assertIsNone(reverse_search_by_pt(self.view, 'fizz', 1, 213))
+        self.assertIsNone(reverse_search_by_pt(self.view, 'z', 215, self.view.size()))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._reverse_search_by_pt_by_lines')
+    def test_falls_back_to_line_based_search_for_unportable_patterns(self, by_lines):
+        self.write('fizz buzz')
+        terms = ('\\h', '\\Qa.b\\E', '(?>a)', 'a*+', '[[:alpha:]]', '(?<name>a)', '(', '\\b\\b', 'x*', '^', '$',
+                 '\\<fizz\\>', '\\lfizz', '\\ufizz', '\\e', '\\x{66}izz')
+        for term in terms:
+            by_lines.reset_mock()
+            reverse_search_by_pt(self.view, term, 0, self.view.size())
+            by_lines.assert_called_once_with(self.view, term, 0, self.view.size(), 0)
+
+        for term in ('(?<!a)b', '\\x66izz', '\\bfizz\\b'):
+            by_lines.reset_mock()
+            reverse_search_by_pt(self.view, term, 0, self.view.size())
+            self.assertFalse(by_lines.called)
+
+
+class TestHilite(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.callbacks = []
+        patcher = unittest.mock.patch('NeoVintageous.nv.vi.search.set_timeout',
+                                      side_effect=lambda f, timeout: self.callbacks.append(f))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_callbacks(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+    def test_hilite(self):
+        self.normal('fizz |buzz fizz buzz')
+        hilite(self.view, 'buzz')
+        self.assertEqual([self.Region(5, 9), self.Region(15, 19)], self.view.get_regions('vi_search'))
+        self.assertEqual([self.Region(5, 9)], self.view.get_regions('vi_search_current'))
+        self.assertEqual([], self.callbacks)
+
+    def test_hilite_current_with_multiple_selections(self):
+        self.normal('fi|zz buzz f|izz b|uzz')
+        hilite(self.view, 'fizz')
+        self.assertEqual([self.Region(0, 4), self.Region(10, 14)], self.view.get_regions('vi_search_current'))
+
+    def test_hilite_not_found_erases_highlighting(self):
+        self.normal('fizz |buzz')
+        hilite(self.view, 'buzz')
+        hilite(self.view, 'x')
+        self.assertEqual([], self.view.get_regions('vi_search'))
+        self.assertEqual([], self.view.get_regions('vi_search_current'))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SYNC_SIZE', 0)
+    def test_hilite_large_buffer_highlights_visible_region_first(self):
+        self.normal('|fizz\n' + 'buzz\n' * 1000 + 'fizz\n')
+        hilite(self.view, 'fizz')
+        self.assertEqual([self.Region(0, 4)], self.view.get_regions('vi_search'))
+        self.assertEqual([self.Region(0, 4)], self.view.get_regions('vi_search_current'))
+        self.run_callbacks()
+        self.assertEqual([self.Region(0, 4), self.Region(5005, 5009)], self.view.get_regions('vi_search'))
+        self.assertEqual([self.Region(0, 4)], self.view.get_regions('vi_search_current'))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SYNC_SIZE', 0)
+    def test_hilite_large_buffer_indexes_matches_and_reuses_the_index(self):
+        self.normal('|fizz\n' + 'buzz\n' * 1000 + 'fizz\n')
+        hilite(self.view, 'fizz')
+        self.assertIsNone(get_match_count(self.view, 'fizz', 0))
+        self.run_callbacks()
+        self.assertEqual((1, 2), get_match_count(self.view, 'fizz', 0))
+        self.assertEqual(self.Region(5005, 5009), find_next_match(self.view, 'fizz', 1))
+        self.view.erase_regions('vi_search')
+        hilite(self.view, 'fizz')
+        self.assertEqual([], self.callbacks)
+        self.assertEqual([self.Region(0, 4), self.Region(5005, 5009)], self.view.get_regions('vi_search'))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SYNC_SIZE', 0)
+    def test_hilite_large_buffer_is_abandoned_when_cleared(self):
+        self.normal('|fizz\n' + 'buzz\n' * 1000 + 'fizz\n')
+        hilite(self.view, 'fizz')
+        clear_hilite(self.view)
+        self.run_callbacks()
+        self.assertEqual([], self.view.get_regions('vi_search'))
+        self.assertEqual([], self.view.get_regions('vi_search_current'))
+
+
+class TestMatchIndex(unittest.ViewTestCase):
+
+    def write_indexed(self, text, term, flags=0):
+        self.write(text)
+        get_match_count(self.view, term, 0, flags)
+
+    def test_find_next_match(self):
+        self.write_indexed('ab xab xab', 'ab')
+        self.assertEqual(self.Region(0, 2), find_next_match(self.view, 'ab', 0))
+        self.assertEqual(self.Region(4, 6), find_next_match(self.view, 'ab', 1))
+        self.assertEqual(self.Region(8, 10), find_next_match(self.view, 'ab', 1, times=2))
+        self.assertEqual(self.Region(0, 2), find_next_match(self.view, 'ab', 9), 'should wrap')
+        self.assertEqual(self.Region(4, 6), find_next_match(self.view, 'ab', 5, times=3), 'should wrap')
+        self.write_indexed('ab xab xab', 'XAB', IGNORECASE)
+        self.assertEqual(self.Region(3, 6), find_next_match(self.view, 'XAB', 0, flags=IGNORECASE))
+        self.write_indexed('ab xab xab', 'y')
+        self.assertIsNone(find_next_match(self.view, 'y', 0))
+
+    def test_find_next_match_finds_overlapping_matches(self):
+        self.write_indexed('xaaaaaa', 'aa')
+        self.select(1)
+        self.assertEqual(self.Region(2, 4), find_next_match(self.view, 'aa', 2))
+        self.assertEqual(self.Region(3, 5), find_next_match(self.view, 'aa', 3))
+        self.assertEqual(self.Region(5, 7), find_next_match(self.view, 'aa', 3, times=2))
+        self.assertEqual(self.Region(1, 3), find_next_match(self.view, 'aa', 1))
+        self.assertIn(self.view.id(), _match_indexes)
+
+    def test_find_match_is_the_same_with_and_without_an_index(self):
+        for pt in range(12):
+            self.write('xaaaaaa\naaa')
+            self.select(pt)
+            expected = (find_next_match(self.view, 'aa', pt + 1), find_previous_match(self.view, 'aa', pt))
+            get_match_count(self.view, 'aa', 0)
+            actual = (find_next_match(self.view, 'aa', pt + 1), find_previous_match(self.view, 'aa', pt))
+            self.assertEqual(expected, actual, 'pt = %d' % pt)
+
+    def test_find_previous_match(self):
+        self.write_indexed('ab xab xab', 'ab')
+        self.assertEqual(self.Region(8, 10), find_previous_match(self.view, 'ab', 10))
+        self.assertEqual(self.Region(4, 6), find_previous_match(self.view, 'ab', 9))
+        self.assertEqual(self.Region(0, 2), find_previous_match(self.view, 'ab', 9, times=2))
+        self.assertEqual(self.Region(8, 10), find_previous_match(self.view, 'ab', 1), 'should wrap')
+        self.assertEqual(self.Region(4, 6), find_previous_match(self.view, 'ab', 4, times=3), 'should wrap')
+        self.write_indexed('ab xab xab', 'y')
+        self.assertIsNone(find_previous_match(self.view, 'y', 10))
+
+    def test_find_match_searches_from_cursor_without_an_index(self):
+        self.normal('ab x|ab xab')
+        self.assertEqual(self.Region(8, 10), find_next_match(self.view, 'ab', 5))
+        self.assertEqual(self.Region(0, 2), find_previous_match(self.view, 'ab', 3))
+        self.assertIsNone(find_next_match(self.view, 'y', 0))
+        self.assertNotIn(self.view.id(), _match_indexes)
+
+    def test_get_match_count(self):
+        self.write('ab xab xab')
+        self.assertEqual((1, 3), get_match_count(self.view, 'ab', 0))
+        self.assertEqual((1, 3), get_match_count(self.view, 'ab', 3))
+        self.assertEqual((2, 3), get_match_count(self.view, 'ab', 4))
+        self.assertEqual((3, 3), get_match_count(self.view, 'ab', 10))
+        self.assertEqual((0, 2), get_match_count(self.view, 'xab', 2))
+        self.assertEqual((0, 0), get_match_count(self.view, 'y', 2))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SYNC_SIZE', 0)
+    def test_get_match_count_is_none_until_large_buffer_is_indexed(self):
+        self.write('ab xab xab')
+        self.assertIsNone(get_match_count(self.view, 'ab', 0))
+        self.assertNotIn(self.view.id(), _match_indexes)
+
+    def test_index_is_invalidated_by_buffer_changes(self):
+        self.write('ab ab')
+        self.assertEqual((2, 2), get_match_count(self.view, 'ab', 5))
+        self.write('ab ab ab')
+        self.assertEqual((3, 3), get_match_count(self.view, 'ab', 8))
+
+    def test_destroy(self):
+        self.write('ab ab')
+        get_match_count(self.view, 'ab', 5)
+        self.assertIn(self.view.id(), _match_indexes)
+        destroy(self.view)
+        self.assertNotIn(self.view.id(), _match_indexes)
+
+
+class TestIncsearch(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.callbacks = []
+        self.matches = []
+        for name in ('set_timeout', 'set_timeout_async'):
+            patcher = unittest.mock.patch('NeoVintageous.nv.vi.search.' + name,
+                                          side_effect=lambda f, timeout: self.callbacks.append(f))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.addCleanup(cancel_incsearch, self.view)
+
+    def run_callbacks(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+    def incsearch(self, term, forward=True, flags=LITERAL, count=1):
+        incsearch(self.view, term, flags, forward, count, self.matches.append)
+
+    def test_forward(self):
+        self.normal('ab |xab xab')
+        self.incsearch('ab')
+        self.assertEqual([], self.matches)
+        self.run_callbacks()
+        self.assertEqual([self.Region(4, 6)], self.matches)
+
+    def test_forward_count_and_wrap(self):
+        self.normal('ab |xab xab')
+        self.incsearch('ab', count=3)
+        self.run_callbacks()
+        self.assertEqual([self.Region(0, 2)], self.matches)
+
+    def test_backward(self):
+        self.normal('ab xab x|ab')
+        self.incsearch('ab', forward=False)
+        self.run_callbacks()
+        self.assertEqual([self.Region(4, 6)], self.matches)
+
+    def test_not_found(self):
+        self.normal('ab |xab xab')
+        self.incsearch('y')
+        self.run_callbacks()
+        self.assertEqual([None], self.matches)
+
+    def test_only_the_latest_search_is_reported(self):
+        self.normal('|ab ac ad')
+        self.incsearch('a')
+        self.incsearch('ac')
+        self.incsearch('ad')
+        self.run_callbacks()
+        self.assertEqual([self.Region(6, 8)], self.matches)
+
+    def test_cancel_discards_pending_search(self):
+        self.normal('ab |xab xab')
+        self.incsearch('ab')
+        cancel_incsearch(self.view)
+        self.run_callbacks()
+        self.assertEqual([], self.matches)
+        self.assertNotIn(self.view.id(), _incsearches)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.find_wrapping')
+    def test_forward_extending_literal_searches_from_previous_match(self, find_wrapping):
+        find_wrapping.return_value = self.Region(7, 9)
+        self.normal('a|b xy xyz')
+        self.incsearch('xy')
+        self.run_callbacks()
+        find_wrapping.assert_called_once_with(self.view, 'xy', 2, 9, flags=LITERAL, times=1)
+        self.incsearch('xyz')
+        self.run_callbacks()
+        find_wrapping.assert_called_with(self.view, 'xyz', 7, 9, flags=LITERAL, times=1)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.find_wrapping')
+    def test_forward_extending_regex_searches_from_cursor(self, find_wrapping):
+        find_wrapping.return_value = self.Region(7, 9)
+        self.normal('a|b xy xyz')
+        self.incsearch('x.', flags=0)
+        self.run_callbacks()
+        self.incsearch('x.z', flags=0)
+        self.run_callbacks()
+        find_wrapping.assert_called_with(self.view, 'x.z', 2, 9, flags=0, times=1)
+
+    def test_extending_literal_not_found_is_not_found(self):
+        self.normal('ab |xab xab')
+        self.incsearch('y')
+        self.run_callbacks()
+        with unittest.mock.patch('NeoVintageous.nv.vi.search.find_wrapping') as find_wrapping:
+            self.incsearch('yz')
+            self.run_callbacks()
+            self.assertFalse(find_wrapping.called)
+
+        self.assertEqual([None, None], self.matches)
+
+    def test_backward_extending_literal(self):
+        self.normal('xy xyz xy|')
+        self.incsearch('xy', forward=False)
+        self.run_callbacks()
+        self.incsearch('xyz', forward=False)
+        self.run_callbacks()
+        self.incsearch('xyzw', forward=False)
+        self.run_callbacks()
+        self.assertEqual([self.Region(7, 9), self.Region(3, 6), None], self.matches)
+
+    def test_extending_after_wrap_searches_from_cursor(self):
+        self.normal('xyz xy |ab')
+        self.incsearch('xy')
+        self.run_callbacks()
+        self.incsearch('xyz')
+        self.run_callbacks()
+        self.assertEqual([self.Region(0, 2), self.Region(0, 3)], self.matches)
+
+    def test_destroy(self):
+        self.normal('ab |xab xab')
+        self.incsearch('ab')
+        self.assertIn(self.view.id(), _incsearches)
+        destroy(self.view)
+        self.assertNotIn(self.view.id(), _incsearches)
@@ -31,6 +31,8 @@ from NeoVintageous.nv.vi.settings import _SublimeSettings
 from NeoVintageous.nv.vi.settings import _VI_OPTIONS
 from NeoVintageous.nv.vi.settings import _vi_user_setting
 from NeoVintageous.nv.vi.settings import _VintageSettings
+from NeoVintageous.nv.vi.settings import destroy
+from NeoVintageous.nv.vi.settings import flush
 from NeoVintageous.nv.vi.settings import SettingsManager
 
 
@@ -63,6 +65,7 @@ class TestVintageSettings(unittest.ViewTestCase):
 
     def setUp(self):
         super().setUp()
+        destroy(self.view)
         self.view.settings().erase('vintage')
         self.setts = _VintageSettings(view=self.view)
 
@@ -74,6 +77,7 @@ class TestVintageSettings(unittest.ViewTestCase):
         self.assertEqual(self.setts['foo'], None)
 
         self.setts['foo'] = 100
+        flush(self.view)
         self.assertEqual(self.view.settings().get('vintage')['foo'], 100)
 
     def test_can_get_setting(self):
@@ -83,6 +87,33 @@ class TestVintageSettings(unittest.ViewTestCase):
     def test_can_get_nonexisting_key(self):
         self.assertEqual(self.setts['foo'], None)
 
+    def test_set_setting_is_written_back_on_flush(self):
+        self.setts['foo'] = 100
+        self.assertEqual(self.view.settings().get('vintage'), {})
+        flush(self.view)
+        self.assertEqual(self.view.settings().get('vintage')['foo'], 100)
+
+    def test_cache_is_shared_between_instances(self):
+        self.setts['foo'] = 100
+        self.assertEqual(_VintageSettings(view=self.view)['foo'], 100)
+
+    def test_destroy_drops_cache(self):
+        self.setts['foo'] = 100
+        destroy(self.view)
+        self.assertEqual(_VintageSettings(view=self.view)['foo'], None)
+
+    @unittest.mock.patch.object(_VintageSettings, '_windows', set())
+    def test_initializes_window_settings_of_cached_view_moved_to_new_window(self):
+        self.setts['foo'] = 100
+        window = unittest.mock.Mock()
+        window.id.return_value = -1
+        window.settings.return_value.get.return_value = None
+        with unittest.mock.patch.object(self.view, 'window', return_value=window):
+            _VintageSettings(view=self.view)
+            _VintageSettings(view=self.view)
+
+        window.settings.return_value.set.assert_called_once_with('vintage', {})
+
 
 class TestSettingsManager(unittest.ViewTestCase):
 
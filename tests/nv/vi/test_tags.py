@@ -0,0 +1,80 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.tags import _build
+from NeoVintageous.nv.vi.tags import _cache
+from NeoVintageous.nv.vi.tags import destroy
+from NeoVintageous.nv.vi.tags import find_containing_element
+
+
+class TestBuild(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertEqual(_build(''), ([], [], [], [], []))
+        self.assertEqual(_build('a < b > c'), ([], [], [], [], []))
+
+    def test_elements(self):
+        starts, begin_tags, end_tags, names, parents = _build('<a><b>x</b><c/></a>')
+        self.assertEqual(starts, [0, 3])
+        self.assertEqual(begin_tags, [(0, 3), (3, 6)])
+        self.assertEqual(end_tags, [(15, 19), (7, 11)])
+        self.assertEqual(names, ['a', 'b'])
+        self.assertEqual(parents, [-1, 0])
+
+    def test_end_tags_implicitly_close_unclosed_elements(self):
+        starts, begin_tags, end_tags, names, parents = _build('<p><br><img>x</p></i>')
+        self.assertEqual(starts, [0, 3, 7])
+        self.assertEqual(end_tags, [(13, 17), None, None])
+        self.assertEqual(parents, [-1, 0, 1])
+
+    def test_tag_names_are_case_insensitive(self):
+        self.assertEqual(_build('<DIV>x</div>')[2], [(6, 12)])
+        self.assertEqual(_build('<DIV>x</div>')[3], ['div'])
+
+
+class TestFindContainingElement(unittest.ViewTestCase):
+
+    def test_find_containing_element(self):
+        self.write('<div>a<p>b</p>c<br>d</div>')
+        div = (self.Region(0, 5), self.Region(20, 26), 'div')
+        p = (self.Region(6, 9), self.Region(10, 14), 'p')
+        self.assertEqual(find_containing_element(self.view, 0), div)
+        self.assertEqual(find_containing_element(self.view, 5), div)
+        self.assertEqual(find_containing_element(self.view, 6), p)
+        self.assertEqual(find_containing_element(self.view, 9), p)
+        self.assertEqual(find_containing_element(self.view, 13), p)
+        self.assertEqual(find_containing_element(self.view, 14), div)
+        self.assertEqual(find_containing_element(self.view, 17), div)
+        self.assertEqual(find_containing_element(self.view, 25), div)
+        self.assertEqual(find_containing_element(self.view, 26), (None, None, None))
+        self.assertEqual(find_containing_element(self.view, 9, count=2), div)
+        self.assertEqual(find_containing_element(self.view, 9, count=3), (None, None, None))
+
+    def test_index_is_invalidated_by_buffer_changes(self):
+        self.write('<a>x</a>')
+        self.assertEqual(find_containing_element(self.view, 3)[2], 'a')
+        self.write('<b>x</b>')
+        self.assertEqual(find_containing_element(self.view, 3)[2], 'b')
+
+    def test_destroy(self):
+        self.write('<a>x</a>')
+        find_containing_element(self.view, 3)
+        self.assertIn(self.view.id(), _cache)
+        destroy(self.view)
+        self.assertNotIn(self.view.id(), _cache)
@@ -65,10 +65,25 @@ def _make_region(view, a, b=None):
         return Region(a)
 
 
+def isolate_state_file(test):
+    # The registers, macros, and file marks saved in the state file of the
+    # user are neither loaded nor replaced by the test.
+    #
+    # Args:
+    #   test (unittest.TestCase):
+    for patcher in (mock.patch('NeoVintageous.nv.shada._enabled', False),
+                    mock.patch('NeoVintageous.nv.vi.registers._loaded', True),
+                    mock.patch('NeoVintageous.nv.vi.marks._FILE_MARKS', {}),
+                    mock.patch.object(_State.macro_registers, '_loaded', True)):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
 class ViewTestCase(unittest.TestCase):
 
     def setUp(self):
         self.view = _active_window().new_file()
+        isolate_state_file(self)
 
     def tearDown(self):
         if self.view: